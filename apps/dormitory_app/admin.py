@@ -1,16 +1,25 @@
 from django.contrib import admin
+from django.contrib.admin import helpers
 from django.utils.html import format_html
 from django.utils import timezone
 from django.db.models import Count, Q, Sum
 from django.contrib import messages
+from django.core.exceptions import PermissionDenied
 from django.urls import path, reverse
 from django.shortcuts import render, redirect
-from django.http import HttpResponse
-import csv
+from django.http import FileResponse, Http404, StreamingHttpResponse
 from .models import (
-    Fakultet, Kurs, Viloyat, YotoqxonaBino, 
-    Xona, YotoqxonaAriza, ArizaIzohi
+    Fakultet, Kurs, Viloyat, YotoqxonaBino, BinoXulosasi, QavatSozlamasi,
+    UstuvorlikMezoni, Xona, YotoqxonaAriza, ArizaIzohi, EksportVazifasi, NavbatYozuvi, NavbatTarixi, ArxivAriza
 )
+from .allocation import xonalarni_taqsimlash
+from .bosh_joylar import bosh_joylar_xulosasi
+from .dashboard import dashboard_malumotlari
+from .exports import EKSPORT_TARTIBI, csv_oqimi
+from .facets import ChoicesFacetFilter, DateFacetFilter, RelatedFacetFilter
+from .pagination import KursorChangeList, TaxminiyPaginator
+from .search import arizalarni_qidirish, arxivni_qidirish
+from .statistika import statistika_hisoblash
 
 
 # Admin panel sarlavhalari
@@ -27,8 +36,11 @@ class FakultetAdmin(admin.ModelAdmin):
     list_filter = ['yaratilgan_sana']
     ordering = ['nomi']
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(arizalar_soni=Count('arizalar'))
+    
     def arizalar_soni_display(self, obj):
-        count = obj.arizalar.count()
+        count = obj.arizalar_soni
         if count > 0:
             return format_html(
                 '<span style="background: #3498db; color: white; padding: 3px 10px; border-radius: 15px;">{}</span>',
@@ -36,6 +48,7 @@ class FakultetAdmin(admin.ModelAdmin):
             )
         return format_html('<span style="color: gray;">0</span>')
     arizalar_soni_display.short_description = "Arizalar soni"
+    arizalar_soni_display.admin_order_field = 'arizalar_soni'
 
 
 # ================== KURS ==================
@@ -44,13 +57,16 @@ class KursAdmin(admin.ModelAdmin):
     list_display = ['raqam', 'talabalar_soni']
     ordering = ['raqam']
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(arizalar_soni=Count('yotoqxonaariza'))
+    
     def talabalar_soni(self, obj):
-        count = YotoqxonaAriza.objects.filter(kurs=obj).count()
         return format_html(
             '<span style="font-weight: bold; color: #27ae60;">{}</span>',
-            count
+            obj.arizalar_soni
         )
     talabalar_soni.short_description = "Arizalar"
+    talabalar_soni.admin_order_field = 'arizalar_soni'
 
 
 # ================== VILOYAT ==================
@@ -60,10 +76,20 @@ class ViloyatAdmin(admin.ModelAdmin):
     search_fields = ['nomi']
     ordering = ['nomi']
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(arizalar_soni=Count('yotoqxonaariza'))
+    
     def talabalar_soni(self, obj):
-        count = YotoqxonaAriza.objects.filter(viloyat=obj).count()
-        return count
+        return obj.arizalar_soni
     talabalar_soni.short_description = "Talabalar"
+    talabalar_soni.admin_order_field = 'arizalar_soni'
+
+
+# ================== QAVAT SOZLAMASI (Inline) ==================
+class QavatSozlamasiInline(admin.TabularInline):
+    model = QavatSozlamasi
+    extra = 0
+    fields = ['qavat', 'sig_imi', 'narxi']
 
 
 # ================== YOTOQXONA BINO ==================
@@ -76,6 +102,7 @@ class YotoqxonaBinoAdmin(admin.ModelAdmin):
     list_filter = ['turi', 'faol', 'wifi', 'oshxona', 'kir_yuvish', 'issiq_suv']
     search_fields = ['nomi', 'manzil']
     ordering = ['raqam']
+    list_select_related = ['xulosa']
     
     fieldsets = (
         ('Asosiy ma\'lumotlar', {
@@ -84,11 +111,23 @@ class YotoqxonaBinoAdmin(admin.ModelAdmin):
         ('Manzil va tuzilma', {
             'fields': ('manzil', 'qavatlar_soni', 'har_qavatda_xonalar')
         }),
+        ('Xonalarni yaratish', {
+            'fields': ('xona_raqam_shabloni', 'standart_sig_imi', 'standart_narxi'),
+            'description': "Qavatlar bo'yicha farqli sig'im va narx pastdagi jadvalda",
+            'classes': ('collapse',)
+        }),
         ('Qulayliklar', {
             'fields': ('wifi', 'oshxona', 'kir_yuvish', 'issiq_suv'),
             'classes': ('collapse',)
         }),
     )
+    inlines = [QavatSozlamasiInline]
+    actions = ['xonalarni_yaratish']
+    
+    def changelist_view(self, request, extra_context=None):
+        # Bo'sh joylar vidjeti keshdan o'qiladi
+        extra_context = {'bosh_joylar': bosh_joylar_xulosasi(), **(extra_context or {})}
+        return super().changelist_view(request, extra_context)
     
     def turi_rangli(self, obj):
         if obj.turi == 'erkak':
@@ -101,17 +140,20 @@ class YotoqxonaBinoAdmin(admin.ModelAdmin):
     turi_rangli.short_description = "Turi"
     
     def xonalar_holati(self, obj):
+        # Xulosa jadvalidan o'qiladi - har bir bino uchun alohida COUNT yo'q
+        xulosa = getattr(obj, 'xulosa', None) or BinoXulosasi(bino=obj)
         total = obj.umumiy_xonalar
-        band = obj.band_xonalar
-        bosh = obj.bosh_xonalar
+        if total != obj.rejadagi_xonalar:
+            total = f"{total} (reja: {obj.rejadagi_xonalar})"
         
         return format_html(
             '<div style="display: flex; gap: 10px;">'
             '<span style="background: #27ae60; color: white; padding: 3px 8px; border-radius: 3px;">Bo\'sh: {}</span>'
             '<span style="background: #f39c12; color: white; padding: 3px 8px; border-radius: 3px;">Band: {}</span>'
             '<span style="background: #95a5a6; color: white; padding: 3px 8px; border-radius: 3px;">Jami: {}</span>'
+            '<span style="background: #3498db; color: white; padding: 3px 8px; border-radius: 3px;">Bo\'sh o\'rin: {}</span>'
             '</div>',
-            bosh, band, total
+            xulosa.bosh_xonalar, xulosa.band_xonalar, total, xulosa.bosh_orinlar
         )
     xonalar_holati.short_description = "Xonalar"
     
@@ -133,6 +175,11 @@ class YotoqxonaBinoAdmin(admin.ModelAdmin):
             return format_html('<span style="color: green; font-size: 20px;">✅</span>')
         return format_html('<span style="color: red; font-size: 20px;">❌</span>')
     faol_holat.short_description = "Faol"
+    
+    def xonalarni_yaratish(self, request, queryset):
+        yaratildi = sum(bino.xonalarni_yaratish() for bino in queryset.prefetch_related('qavat_sozlamalari'))
+        self.message_user(request, f"{yaratildi} ta xona yaratildi.", messages.SUCCESS)
+    xonalarni_yaratish.short_description = "Tuzilma bo'yicha yetishmayotgan xonalarni yaratish"
 
 
 # ================== XONA ==================
@@ -146,6 +193,7 @@ class XonaAdmin(admin.ModelAdmin):
     search_fields = ['raqam', 'bino__nomi']
     ordering = ['bino', 'qavat', 'raqam']
     list_per_page = 50
+    list_select_related = ['bino']
     
     fieldsets = (
         ('Asosiy', {
@@ -218,12 +266,28 @@ class XonaAdmin(admin.ModelAdmin):
         return '-'
     narxi_display.short_description = "Narx"
     
-    actions = ['xonalarni_tozalash']
+    actions = ['xonalarni_tozalash', 'bandlikni_moslashtirish']
     
     def xonalarni_tozalash(self, request, queryset):
-        queryset.update(band_orinlar=0)
-        self.message_user(request, f"{queryset.count()} ta xona tozalandi.", messages.SUCCESS)
+        chiqarildi, joylashtirildi = Xona.xonalarni_bosatish(queryset)
+        self.message_user(
+            request,
+            f"{queryset.count()} ta xona tozalandi: {chiqarildi} ta yashovchi chiqarildi, "
+            f"{len(joylashtirildi)} ta ariza navbatdan joylashtirildi.",
+            messages.SUCCESS,
+        )
     xonalarni_tozalash.short_description = "Tanlangan xonalarni bo'shatish"
+    
+    def bandlikni_moslashtirish(self, request, queryset):
+        farqlar = Xona.bandlikni_moslashtirish(queryset)
+        if not farqlar:
+            self.message_user(request, "Band o'rinlar arizalar bilan mos.", messages.SUCCESS)
+            return
+        namunalar = ', '.join(f"{xona.bino.raqam}/{xona.raqam}: {edi}->{haqiqiy}" for xona, edi, haqiqiy in farqlar[:10])
+        self.message_user(
+            request, f"{len(farqlar)} ta xonada band o'rinlar tuzatildi ({namunalar}).", messages.WARNING
+        )
+    bandlikni_moslashtirish.short_description = "Band o'rinlarni tasdiqlangan arizalar bo'yicha tekshirish"
 
 
 # ================== ARIZA IZOHI (Inline) ==================
@@ -235,28 +299,46 @@ class ArizaIzohiInline(admin.TabularInline):
     can_delete = False
 
 
+# ================== USTUVORLIK MEZONI ==================
+@admin.register(UstuvorlikMezoni)
+class UstuvorlikMezoniAdmin(admin.ModelAdmin):
+    list_display = ['mezon', 'qiymat', 'ball']
+    list_filter = ['mezon']
+    ordering = ['mezon', '-ball']
+
+
 # ================== YOTOQXONA ARIZA ==================
 @admin.register(YotoqxonaAriza)
 class YotoqxonaArizaAdmin(admin.ModelAdmin):
     list_display = [
         'ariza_raqami_display', 'fish_display', 'fakultet', 'kurs',
         'jinsi_display', 'viloyat', 'telefon_display', 
-        'imtiyoz_display', 'holat_display', 'ariza_sanasi_display'
+        'imtiyoz_display', 'hujjat_preview', 'ustuvorlik_display', 'holat_display', 'ariza_sanasi_display'
     ]
     
+    # Har bir tanlov yonida arizalar soni (facets.py - bitta so'rov, qisqa kesh)
     list_filter = [
-        'holat', 'jinsi', 'fakultet', 'kurs', 'viloyat', 
-        'imtiyoz_turi', 'ariza_sanasi', 'xona_turi_afzallik'
+        ('holat', ChoicesFacetFilter), ('jinsi', ChoicesFacetFilter),
+        ('fakultet', RelatedFacetFilter), ('kurs', RelatedFacetFilter), ('viloyat', RelatedFacetFilter),
+        ('imtiyoz_turi', ChoicesFacetFilter), ('ariza_sanasi', DateFacetFilter),
+        ('xona_turi_afzallik', ChoicesFacetFilter),
     ]
+    show_facets = admin.ShowFacets.ALWAYS
     
+    # Qidiruv get_search_results() da (search.py) - ro'yxat faqat qidiruv maydonini ko'rsatish uchun
     search_fields = ['ariza_raqami', 'fish', 'telefon', 'pasport']
+    search_help_text = "F.I.SH (lotin yoki kirill), telefon, pasport yoki ariza raqami boshi"
     ordering = ['-ariza_sanasi']
     date_hierarchy = 'ariza_sanasi'
     list_per_page = 25
+    # Katta jadvalda: taxminiy son, kursorli sahifalar, filtrsiz jami son hisoblanmaydi
+    paginator = TaxminiyPaginator
+    show_full_result_count = False
+    list_select_related = ['fakultet', 'kurs', 'viloyat']
     
     readonly_fields = [
         'ariza_raqami', 'ariza_sanasi', 'oquv_yili', 
-        'tasdiqlangan_sana', 'yoshi'
+        'tasdiqlangan_sana', 'yoshi', 'hujjat_preview', 'ustuvorlik_bali'
     ]
     
     fieldsets = (
@@ -279,7 +361,7 @@ class YotoqxonaArizaAdmin(admin.ModelAdmin):
             'fields': ('oila_azolari',)
         }),
         ('🎖️ Imtiyozlar', {
-            'fields': ('imtiyoz_turi', 'imtiyoz_hujjat')
+            'fields': ('imtiyoz_turi', 'imtiyoz_hujjat', 'hujjat_preview', 'ustuvorlik_bali')
         }),
         ('🏠 Xona afzalligi', {
             'fields': ('xona_turi_afzallik',)
@@ -353,11 +435,36 @@ class YotoqxonaArizaAdmin(admin.ModelAdmin):
         )
     imtiyoz_display.short_description = "Imtiyoz"
     
+    def ustuvorlik_display(self, obj):
+        return format_html('<strong>{}</strong>', obj.ustuvorlik_bali)
+    ustuvorlik_display.short_description = "Ball"
+    # ariza_ustuvorlik_idx indeksi bo'yicha, birinchi bosishda kamayish tartibida
+    ustuvorlik_display.admin_order_field = '-ustuvorlik_bali'
+    
+    def hujjat_preview(self, obj):
+        # To'liq hujjat o'rniga kichik WebP miniatyura - sahifa og'irligi kamayadi
+        if not obj.imtiyoz_hujjat:
+            return format_html('<span style="color: gray;">-</span>')
+        # Hujjatlar maxfiy storage'da - faqat ruxsat tekshiriladigan admin ko'rinishi orqali
+        hujjat_url = reverse('admin:dormitory_ariza_hujjati', args=[obj.pk, 'imtiyoz_hujjat'])
+        if obj.imtiyoz_miniatyura:
+            return format_html(
+                '<a href="{}" target="_blank"><img src="{}" loading="lazy" '
+                'style="max-width: 60px; max-height: 60px; border-radius: 3px;"></a>',
+                hujjat_url, reverse('admin:dormitory_ariza_hujjati', args=[obj.pk, 'imtiyoz_miniatyura'])
+            )
+        belgi = '📄 PDF' if obj.imtiyoz_hujjat.name.lower().endswith('.pdf') else '📎'
+        if obj.hujjat_holati == 'kutilmoqda':
+            belgi = '⏳'
+        return format_html('<a href="{}" target="_blank">{}</a>', hujjat_url, belgi)
+    hujjat_preview.short_description = "Hujjat"
+    
     def holat_display(self, obj):
         colors = {
             'yangi': '#3498db',
             'korilmoqda': '#f39c12',
             'imtixon': '#9b59b6',
+            'navbatda': '#e67e22',
             'tasdiqlandi': '#27ae60',
             'rad_etildi': '#e74c3c',
             'bekor': '#95a5a6',
@@ -367,6 +474,7 @@ class YotoqxonaArizaAdmin(admin.ModelAdmin):
             'yangi': '📝',
             'korilmoqda': '👀',
             'imtixon': '📋',
+            'navbatda': '⏳',
             'tasdiqlandi': '✅',
             'rad_etildi': '❌',
             'bekor': '🚫',
@@ -390,13 +498,16 @@ class YotoqxonaArizaAdmin(admin.ModelAdmin):
     actions = [
         'korib_chiqishga_olish',
         'tasdiqlash',
+        'navbatga_qoyish',
         'rad_etish',
         'export_csv',
+        'eksport_vazifasi_csv',
+        'eksport_vazifasi_xlsx',
         'statistika_korish'
     ]
     
     def korib_chiqishga_olish(self, request, queryset):
-        updated = queryset.filter(holat='yangi').update(holat='korilmoqda')
+        updated = queryset.filter(holat='yangi').holatni_ozgartirish('korilmoqda')
         self.message_user(
             request, 
             f"{updated} ta ariza ko'rib chiqishga olindi.",
@@ -405,99 +516,267 @@ class YotoqxonaArizaAdmin(admin.ModelAdmin):
     korib_chiqishga_olish.short_description = "🔍 Ko'rib chiqishga olish"
     
     def tasdiqlash(self, request, queryset):
-        for ariza in queryset.filter(holat__in=['korilmoqda', 'imtixon']):
-            # Xona topish kerak
-            if not ariza.tayinlangan_xona:
-                self.message_user(
-                    request,
-                    f"❗ {ariza.fish} uchun xona tanlanmagan!",
-                    messages.WARNING
-                )
-                continue
-            
-            ariza.holat = 'tasdiqlandi'
-            ariza.tasdiqlangan_sana = timezone.now()
-            ariza.save()
-        
-        self.message_user(request, "✅ Arizalar tasdiqlandi!", messages.SUCCESS)
-    tasdiqlash.short_description = "✅ Tasdiqlash"
+        # Xonalar avtomatik taqsimlanadi (qo'lda tanlangan xona sig'sa saqlanadi)
+        natija = xonalarni_taqsimlash(queryset)
+
+        if natija.joy_topilmadi:
+            ismlar = ', '.join(ariza.fish for ariza in natija.joy_topilmadi[:10])
+            if len(natija.joy_topilmadi) > 10:
+                ismlar += ', ...'
+            self.message_user(
+                request,
+                f"⏳ {len(natija.joy_topilmadi)} ta ariza uchun bo'sh xona topilmadi, navbatga qo'yildi: {ismlar}",
+                messages.WARNING
+            )
+
+        self.message_user(
+            request,
+            f"✅ {len(natija)} ta ariza tasdiqlandi va xonalarga joylashtirildi!",
+            messages.SUCCESS
+        )
+    tasdiqlash.short_description = "✅ Tasdiqlash (xonalarga taqsimlash)"
+    
+    def navbatga_qoyish(self, request, queryset):
+        updated = queryset.exclude(holat='tasdiqlandi').holatni_ozgartirish('navbatda')
+        self.message_user(request, f"⏳ {updated} ta ariza navbatga qo'yildi.", messages.SUCCESS)
+    navbatga_qoyish.short_description = "⏳ Navbatga qo'yish"
     
     def rad_etish(self, request, queryset):
-        queryset.update(holat='rad_etildi')
+        queryset.holatni_ozgartirish('rad_etildi')
         self.message_user(request, "❌ Arizalar rad etildi!", messages.WARNING)
     rad_etish.short_description = "❌ Rad etish"
     
     def export_csv(self, request, queryset):
-        """CSV export"""
-        response = HttpResponse(content_type='text/csv')
+        """CSV export - bo'laklab oqim sifatida yuboriladi"""
+        response = StreamingHttpResponse(csv_oqimi(queryset.order_by(*EKSPORT_TARTIBI)), content_type='text/csv; charset=utf-8')
         response['Content-Disposition'] = 'attachment; filename="arizalar.csv"'
-        response.write('\ufeff'.encode('utf8'))  # UTF-8 BOM
-        
-        writer = csv.writer(response)
-        writer.writerow([
-            'Ariza №', 'F.I.SH', 'Jinsi', 'Yoshi', 'Telefon',
-            'Viloyat', 'Fakultet', 'Kurs', 'Imtiyoz', 'Holat', 'Sana'
-        ])
-        
-        for ariza in queryset:
-            writer.writerow([
-                ariza.ariza_raqami,
-                ariza.fish,
-                ariza.get_jinsi_display(),
-                ariza.yoshi,
-                ariza.telefon,
-                ariza.viloyat.nomi,
-                ariza.fakultet.nomi,
-                ariza.kurs.raqam,
-                ariza.get_imtiyoz_turi_display(),
-                ariza.get_holat_display(),
-                ariza.ariza_sanasi.strftime("%d.%m.%Y")
-            ])
-        
         return response
     export_csv.short_description = "📥 CSV yuklash"
     
-    def statistika_korish(self, request, queryset):
-        """Statistika sahifasi"""
-        stats = {
-            'jami': queryset.count(),
-            'erkak': queryset.filter(jinsi='erkak').count(),
-            'ayol': queryset.filter(jinsi='ayol').count(),
-            'imtiyozli': queryset.exclude(imtiyoz_turi='yoq').count(),
-            'fakultetlar': {},
-            'holatlar': {}
-        }
-        
-        for fak in Fakultet.objects.all():
-            stats['fakultetlar'][fak.nomi] = queryset.filter(fakultet=fak).count()
-        
-        for holat, label in YotoqxonaAriza.HOLAT_TANLOV:
-            stats['holatlar'][label] = queryset.filter(holat=holat).count()
+    def _eksport_vazifasi(self, request, queryset, format):
+        vazifa = EksportVazifasi(format=format, yaratuvchi=request.user)
+        if request.POST.get(helpers.ACTION_CHECKBOX_NAME) and request.POST.get('select_across') != '1':
+            vazifa.tanlangan = list(queryset.values_list('pk', flat=True))
+        else:
+            # "Hammasini tanlash" - changelist filtrlari saqlanadi, worker ularni qayta qo'llaydi
+            vazifa.filtrlar = request.GET.urlencode()
+        vazifa.save()
         
         self.message_user(
             request,
-            f"📊 Statistika: Jami {stats['jami']} ta ariza | "
-            f"Erkak: {stats['erkak']} | Ayol: {stats['ayol']} | "
-            f"Imtiyozli: {stats['imtiyozli']}",
-            messages.INFO
+            format_html(
+                "🗂 Eksport #{} navbatga qo'yildi. Tayyor bo'lgach <a href=\"{}\">Eksport vazifalari</a> "
+                "sahifasidan yuklab olishingiz mumkin.",
+                vazifa.pk, reverse('admin:dormitory_app_eksportvazifasi_changelist')
+            ),
+            messages.SUCCESS
         )
+    
+    def eksport_vazifasi_csv(self, request, queryset):
+        self._eksport_vazifasi(request, queryset, 'csv')
+    eksport_vazifasi_csv.short_description = "🗂 Fon rejimida eksport (CSV)"
+    
+    def eksport_vazifasi_xlsx(self, request, queryset):
+        self._eksport_vazifasi(request, queryset, 'xlsx')
+    eksport_vazifasi_xlsx.short_description = "🗂 Fon rejimida eksport (Excel)"
+    
+    def statistika_korish(self, request, queryset):
+        """Statistika sahifasi - tanlangan arizalar bo'yicha"""
+        return self._statistika_sahifasi(request, queryset)
     statistika_korish.short_description = "📊 Statistika"
     
+    def get_changelist(self, request, **kwargs):
+        return KursorChangeList
+    
+    def get_search_results(self, request, queryset, search_term):
+        """icontains o'rniga indekslangan qidiruv (natijada takrorlar bo'lmaydi)"""
+        return arizalarni_qidirish(queryset, search_term), False
+    
     # Custom admin views
     def get_urls(self):
         urls = super().get_urls()
         custom_urls = [
             path('dashboard/', self.admin_site.admin_view(self.dashboard_view), name='dormitory_dashboard'),
+            path('statistika/', self.admin_site.admin_view(self.statistika_view), name='dormitory_statistika'),
+            path(
+                '<int:pk>/hujjat/<str:maydon>/', self.admin_site.admin_view(self.hujjat_view),
+                name='dormitory_ariza_hujjati'
+            ),
         ]
         return custom_urls + urls
     
+    def hujjat_view(self, request, pk, maydon):
+        """Imtiyoz hujjati yoki miniatyurasi - faqat arizani ko'rish huquqi borlarga"""
+        if maydon not in ('imtiyoz_hujjat', 'imtiyoz_miniatyura'):
+            raise Http404("Fayl topilmadi")
+        ariza = YotoqxonaAriza.objects.filter(pk=pk).only(maydon).first()
+        if not ariza or not self.has_view_permission(request, ariza):
+            raise Http404("Fayl topilmadi")
+        fayl = getattr(ariza, maydon)
+        if not fayl or not fayl.storage.exists(fayl.name):
+            raise Http404("Fayl topilmadi")
+        response = FileResponse(fayl.open('rb'))
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+    
     def dashboard_view(self, request):
-        """Dashboard sahifasi"""
+        """Dashboard sahifasi - hisoblagichlar keshidan o'qiladi"""
         context = {
+            **self.admin_site.each_context(request),
             'title': 'Yotoqxona Dashboard',
-            'jami_arizalar': YotoqxonaAriza.objects.count(),
-            'yangi': YotoqxonaAriza.objects.filter(holat='yangi').count(),
-            'tasdiqlangan': YotoqxonaAriza.objects.filter(holat='tasdiqlandi').count(),
-            'rad_etilgan': YotoqxonaAriza.objects.filter(holat='rad_etildi').count(),
+            'opts': self.model._meta,
+            **dashboard_malumotlari(),
         }
         return render(request, 'admin/dormitory/dashboard.html', context)
+    
+    def statistika_view(self, request):
+        """Statistika sahifasi - changelist filtrlari (query string) bilan"""
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        queryset = self.get_changelist_instance(request).queryset
+        return self._statistika_sahifasi(request, queryset)
+    
+    def _statistika_sahifasi(self, request, queryset):
+        context = {
+            **self.admin_site.each_context(request),
+            'title': 'Arizalar statistikasi',
+            'opts': self.model._meta,
+            'stats': statistika_hisoblash(queryset),
+            'filtrlar': request.GET.urlencode(),
+        }
+        return render(request, 'admin/dormitory/statistika.html', context)
+
+
+# ================== KUTISH NAVBATI ==================
+@admin.register(NavbatYozuvi)
+class NavbatYozuviAdmin(admin.ModelAdmin):
+    """Navbat faqat ariza holati orqali boshqariladi"""
+    list_display = ['ariza', 'bino_turi', 'sig_imi', 'ustuvorlik_bali', 'ariza_sanasi', 'qoshilgan_sana']
+    list_filter = ['bino_turi', 'sig_imi']
+    search_fields = ['ariza__ariza_raqami']
+    list_select_related = ['ariza']
+    readonly_fields = list_display
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(NavbatTarixi)
+class NavbatTarixiAdmin(admin.ModelAdmin):
+    list_display = ['ariza_raqami', 'xona', 'ustuvorlik_bali', 'sabab', 'navbatga_qoshilgan', 'sana']
+    list_filter = ['sabab', 'sana']
+    search_fields = ['ariza_raqami']
+    list_select_related = ['xona__bino']
+    date_hierarchy = 'sana'
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+# ================== ARXIV ==================
+@admin.register(ArxivAriza)
+class ArxivArizaAdmin(admin.ModelAdmin):
+    """O'tgan o'quv yillari arizalari - faqat ko'rish (oquv_yilini_arxivlash buyrug'i to'ldiradi)"""
+    list_display = ['ariza_raqami', 'fish', 'oquv_yili', 'fakultet', 'holat', 'xona', 'ariza_sanasi']
+    list_filter = ['oquv_yili', 'holat', 'jinsi']
+    # Qidiruv get_search_results() da (search.py) - ro'yxat faqat qidiruv maydonini ko'rsatish uchun
+    search_fields = ['ariza_raqami', 'fish', 'telefon', 'pasport']
+    ordering = ['-ariza_sanasi']
+    list_per_page = 50
+    paginator = TaxminiyPaginator
+    show_full_result_count = False
+    
+    def get_search_results(self, request, queryset, search_term):
+        """Raqamlar prefiks bo'yicha (indeks), qolgani F.I.SH ichidan - maydonlar OR qilinmaydi"""
+        return arxivni_qidirish(queryset, search_term), False
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+# ================== EKSPORT VAZIFALARI ==================
+@admin.register(EksportVazifasi)
+class EksportVazifasiAdmin(admin.ModelAdmin):
+    list_display = [
+        'id', 'format', 'holat_display', 'jarayon_display',
+        'yaratuvchi', 'yaratilgan_sana', 'yuklash_display'
+    ]
+    list_filter = ['holat', 'format']
+    list_select_related = ['yaratuvchi']
+    readonly_fields = [
+        'format', 'holat', 'filtrlar', 'tanlangan', 'jami', 'bajarildi', 'yuklash_display',
+        'xato_matni', 'yaratuvchi', 'yaratilgan_sana', 'boshlangan_sana', 'yakunlangan_sana'
+    ]
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def holat_display(self, obj):
+        colors = {
+            'kutilmoqda': '#95a5a6',
+            'bajarilmoqda': '#f39c12',
+            'tayyor': '#27ae60',
+            'xato': '#e74c3c',
+        }
+        return format_html(
+            '<span style="background: {}; color: white; padding: 3px 8px; border-radius: 3px;">{}</span>',
+            colors.get(obj.holat, '#95a5a6'), obj.get_holat_display()
+        )
+    holat_display.short_description = "Holat"
+    
+    def jarayon_display(self, obj):
+        return format_html(
+            '<div style="width: 120px; background: #ecf0f1; border-radius: 10px; overflow: hidden;">'
+            '<div style="background: #3498db; width: {}%; padding: 3px; color: white; white-space: nowrap;">'
+            '{} / {}</div></div>',
+            obj.foiz, obj.bajarildi, obj.jami
+        )
+    jarayon_display.short_description = "Jarayon"
+    
+    def yuklash_display(self, obj):
+        if obj.holat == 'tayyor' and obj.fayl:
+            return format_html(
+                '<a href="{}">📥 Yuklash</a>',
+                reverse('admin:dormitory_eksport_yuklash', args=[obj.pk])
+            )
+        return '-'
+    yuklash_display.short_description = "Fayl"
+    
+    def get_urls(self):
+        custom_urls = [
+            path(
+                '<int:pk>/yuklash/',
+                self.admin_site.admin_view(self.yuklash_view),
+                name='dormitory_eksport_yuklash'
+            ),
+        ]
+        return custom_urls + super().get_urls()
+    
+    def yuklash_view(self, request, pk):
+        """Tayyor faylni faqat admin orqali yuklab berish"""
+        vazifa = EksportVazifasi.objects.filter(pk=pk, holat='tayyor').first()
+        if not vazifa or not vazifa.fayl or not self.has_view_permission(request, vazifa):
+            raise Http404("Fayl topilmadi")
+        return FileResponse(
+            vazifa.fayl.open('rb'),
+            as_attachment=True,
+            filename=f"arizalar-{vazifa.pk}.{vazifa.format}"
+        )
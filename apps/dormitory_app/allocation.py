@@ -0,0 +1,127 @@
+from collections import Counter, defaultdict, deque
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import (
+    ArizaHisoblagichi, BinoXulosasi, KunlikArizaStatistikasi, NavbatYozuvi, Xona, YotoqxonaAriza,
+    ariza_holati_keshini_tozalash
+)
+
+
+# Taqsimlanadigan ariza holatlari
+TAQSIMLANADIGAN_HOLATLAR = ['korilmoqda', 'imtixon', 'navbatda']
+
+
+class TaqsimlashNatijasi:
+    """Ommaviy taqsimlash natijasi"""
+
+    def __init__(self):
+        self.joylashtirildi = []
+        self.joy_topilmadi = []
+        self.xonalar = []
+
+    def __len__(self):
+        return len(self.joylashtirildi)
+
+
+def _xona_turlari_tartibi(afzallik):
+    """Avval afzal xona turi, keyin unga eng yaqin sig'imlar"""
+    turlar = [sig_imi for sig_imi, _ in Xona.XONA_TURI]
+    if afzallik is None:
+        return turlar
+    return sorted(turlar, key=lambda sig_imi: (abs(sig_imi - afzallik), sig_imi))
+
+
+def xonalarni_taqsimlash(arizalar):
+    """
+    Arizalarni bo'sh xonalarga bitta tranzaksiyada joylashtirish.
+
+    Arizalar ustuvorlik bali (UstuvorlikMezoni) va ariza sanasi bo'yicha navbatga qo'yiladi,
+    xonalar bir marta qulflanadi va natija bulk_update bilan yoziladi.
+    Qo'lda tanlangan xona (tayinlangan_xona) sig'sa - o'sha xona saqlanadi.
+    Joy topilmaganlar kutish navbatiga qo'yiladi (NavbatYozuvi).
+    """
+    natija = TaqsimlashNatijasi()
+
+    with transaction.atomic():
+        arizalar = list(
+            arizalar.filter(holat__in=TAQSIMLANADIGAN_HOLATLAR)
+            .select_for_update(of=('self',))
+            .order_by('-ustuvorlik_bali', 'ariza_sanasi', 'id')
+        )
+        if not arizalar:
+            return natija
+
+        tanlangan_xonalar = {a.tayinlangan_xona_id for a in arizalar if a.tayinlangan_xona_id}
+        xonalar = list(
+            Xona.objects.select_for_update(of=('self',))
+            .select_related('bino')
+            .filter(Q(bino__faol=True) | Q(pk__in=tanlangan_xonalar))
+            .filter(band_orinlar__lt=F('sig_imi'))
+            .order_by('-band_orinlar', 'bino__raqam', 'qavat', 'raqam')
+        )
+
+        xonalar_by_id = {xona.pk: xona for xona in xonalar}
+        # (bino turi, sig'imi) -> bo'sh joyi bor xonalar
+        bosh_xonalar = defaultdict(deque)
+        for xona in xonalar:
+            if xona.bino.faol:
+                bosh_xonalar[(xona.bino.turi, xona.sig_imi)].append(xona)
+
+        ozgargan_xonalar = {}
+        hozir = timezone.now()
+
+        for ariza in arizalar:
+            xona = xonalar_by_id.get(ariza.tayinlangan_xona_id)
+            if xona is None or xona.toliq_bandmi or xona.bino.turi != ariza.jinsi:
+                xona = None
+                for sig_imi in _xona_turlari_tartibi(ariza.xona_turi_afzallik):
+                    hovuz = bosh_xonalar.get((ariza.jinsi, sig_imi))
+                    while hovuz and hovuz[0].toliq_bandmi:
+                        hovuz.popleft()
+                    if hovuz:
+                        xona = hovuz[0]
+                        break
+
+            if xona is None:
+                natija.joy_topilmadi.append(ariza)
+                continue
+
+            xona.band_orinlar += 1
+            ozgargan_xonalar[xona.pk] = xona
+
+            ariza.tayinlangan_xona = xona
+            ariza.holat = 'tasdiqlandi'
+            ariza.tasdiqlangan_sana = hozir
+            ariza.yangilangan_sana = hozir
+            natija.joylashtirildi.append(ariza)
+
+        if natija.joylashtirildi:
+            natija.xonalar = list(ozgargan_xonalar.values())
+            Xona.objects.bulk_update(natija.xonalar, ['band_orinlar'], batch_size=500)
+            YotoqxonaAriza.objects.bulk_update(
+                natija.joylashtirildi,
+                ['holat', 'tayinlangan_xona', 'tasdiqlangan_sana', 'yangilangan_sana'],
+                batch_size=500,
+            )
+            BinoXulosasi.yangilash(bino_ids={xona.bino_id for xona in natija.xonalar})
+            ariza_holati_keshini_tozalash([ariza.ariza_raqami for ariza in natija.joylashtirildi])
+
+            # Dashboard hisoblagichlari (bulk_update save() ni chaqirmaydi)
+            eski_holatlar = Counter((a._asl['oquv_yili'], a._asl['holat']) for a in natija.joylashtirildi)
+            for (oquv_yili, holat), soni in eski_holatlar.items():
+                ArizaHisoblagichi.ozgartirish(oquv_yili, holat, -soni)
+                ArizaHisoblagichi.ozgartirish(oquv_yili, 'tasdiqlandi', soni)
+            for ariza in natija.joylashtirildi:
+                ariza._asl = ariza._joriy_qiymatlar()
+            KunlikArizaStatistikasi.ozgartirish(tasdiqlangan=len(natija.joylashtirildi))
+            NavbatYozuvi.objects.filter(ariza__in=[ariza.pk for ariza in natija.joylashtirildi]).delete()
+
+        if natija.joy_topilmadi:
+            YotoqxonaAriza.objects.filter(
+                pk__in=[ariza.pk for ariza in natija.joy_topilmadi]
+            ).holatni_ozgartirish('navbatda')
+
+    return natija
@@ -5,3 +5,10 @@ class DormitoryAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.dormitory_app'
     verbose_name = "Yotoqxona"
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+
+        from . import checks, signals  # noqa: F401 - checks ro'yxatdan o'tadi
+
+        post_migrate.connect(signals.qidiruv_indeksini_tekshirish, sender=self)
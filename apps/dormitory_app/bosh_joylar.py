@@ -0,0 +1,76 @@
+from django.core.cache import cache
+from django.db.models import Case, CharField, Count, Sum, Value, When
+
+from .models import BOSH_JOYLAR_KESH_KALITI, Xona, YotoqxonaBino
+
+
+# Kesh muddati (soniya) - xonalar bandligi o'zgarganda kesh darhol tozalanadi
+BOSH_JOYLAR_KESH_MUDDATI = 300
+
+# Narx oraliqlari: (kod, nomi, yuqori chegara - shu qiymatdan kichik)
+NARX_ORALIQLARI = (
+    ('arzon', "300 000 so'mgacha", 300000),
+    ('orta', "300 000 - 500 000 so'm", 500000),
+    ('qimmat', "500 000 so'mdan yuqori", None),
+)
+NARXSIZ = ('belgilanmagan', "Narx belgilanmagan")
+
+
+def narx_oraligi_ifodasi():
+    """narxi bo'yicha oraliq kodi uchun SQL ifoda"""
+    shartlar = [When(narxi__isnull=True, then=Value(NARXSIZ[0]))]
+    shartlar += [
+        When(narxi__lt=chegara, then=Value(kod))
+        for kod, _, chegara in NARX_ORALIQLARI if chegara is not None
+    ]
+    # Oxirgi oraliq yuqoridan chegaralanmagan
+    return Case(*shartlar, default=Value(NARX_ORALIQLARI[-1][0]), output_field=CharField())
+
+
+def bosh_joylar_jadvali():
+    """
+    Bo'sh joylar guruhlari (bino turi, sig'im, qulayliklar, narx oralig'i) - keshdan,
+    bo'lmasa xona_bosh_joylar_idx qisman indeksi bo'yicha bitta guruhlangan so'rov.
+    """
+    return cache.get_or_set(BOSH_JOYLAR_KESH_KALITI, _hisoblash, BOSH_JOYLAR_KESH_MUDDATI)
+
+
+def _hisoblash():
+    qatorlar = (
+        Xona.objects.filter(bosh_orinlar__gt=0, bino__in=YotoqxonaBino.objects.filter(faol=True).values('pk'))
+        .annotate(narx_oraligi=narx_oraligi_ifodasi())
+        .values('bino_turi', 'sig_imi', 'konditsioner', 'muzlatgich', 'narx_oraligi')
+        .annotate(xonalar=Count('pk'), orinlar=Sum('bosh_orinlar'))
+        .order_by('bino_turi', 'sig_imi', 'konditsioner', 'muzlatgich', 'narx_oraligi')
+    )
+    return list(qatorlar)
+
+
+def bosh_joylar(**filtrlar):
+    """Kesh jadvalidan filtrlangan guruhlar (qiymati None bo'lgan filtr e'tiborga olinmaydi)"""
+    filtrlar = {maydon: qiymat for maydon, qiymat in filtrlar.items() if qiymat is not None}
+    return [
+        qator for qator in bosh_joylar_jadvali()
+        if all(qator[maydon] == qiymat for maydon, qiymat in filtrlar.items())
+    ]
+
+
+def bosh_joylar_xulosasi():
+    """Admin vidjeti uchun: bino turi x sig'im bo'yicha bo'sh o'rinlar"""
+    jadval = {}
+    for qator in bosh_joylar_jadvali():
+        katak = jadval.setdefault(qator['bino_turi'], {}).setdefault(qator['sig_imi'], {'xonalar': 0, 'orinlar': 0})
+        katak['xonalar'] += qator['xonalar']
+        katak['orinlar'] += qator['orinlar']
+    sig_imlar = [sig_imi for sig_imi, _ in Xona.XONA_TURI]
+    return {
+        'sig_imlar': sig_imlar,
+        'qatorlar': [
+            {
+                'turi': nomi,
+                'kataklar': [jadval.get(kod, {}).get(sig_imi) for sig_imi in sig_imlar],
+                'jami': sum(katak['orinlar'] for katak in jadval.get(kod, {}).values()),
+            }
+            for kod, nomi in YotoqxonaBino.BINO_TURI
+        ],
+    }
@@ -0,0 +1,37 @@
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.checks import Error, Tags, register
+
+
+# Shablonlardagi {% static 'build/...' %} havolalari (frontend_build natijasi, git'da saqlanmaydi)
+BUILD_HAVOLASI = re.compile(r"""{%\s*static\s+['"](build/[^'"]+)['"]\s*%}""")
+
+
+def shablondagi_build_fayllari():
+    fayllar = set()
+    for papka in settings.TEMPLATES[0]['DIRS']:
+        for shablon in Path(papka).glob('**/*.html'):
+            fayllar.update(BUILD_HAVOLASI.findall(shablon.read_text(encoding='utf-8')))
+    return sorted(fayllar)
+
+
+@register(Tags.staticfiles)
+def frontend_fayllarini_tekshirish(app_configs, **kwargs):
+    """
+    Manifest storage'da manifestda yo'q fayl {% static %} da 500 beradi - shuning uchun
+    collectstatic va check --deploy frontend_build qilinmagan bo'lsa to'xtaydi.
+    """
+    if not isinstance(staticfiles_storage, ManifestStaticFilesStorage):
+        return []
+    yoq = [nom for nom in shablondagi_build_fayllari() if not finders.find(nom)]
+    if not yoq:
+        return []
+    return [Error(
+        f"Frontend fayllari yig'ilmagan: {', '.join(yoq)}",
+        hint="python manage.py frontend_build ni ishga tushiring (internet kerak), keyin collectstatic.",
+        id='dormitory_app.E001',
+    )]
@@ -0,0 +1,69 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import (
+    DASHBOARD_KESH_KALITI, ArizaHisoblagichi, KunlikArizaStatistikasi,
+    YotoqxonaAriza, joriy_oquv_yili
+)
+
+
+# Kesh muddati (soniya) - hisoblagich o'zgarganda kesh darhol tozalanadi
+DASHBOARD_KESH_MUDDATI = 60
+
+# Vaqt qatori uchun kunlar soni
+KUNLAR_SONI = 30
+
+
+def dashboard_malumotlari():
+    """Dashboard ma'lumotlari - keshdan, bo'lmasa hisoblagich jadvallaridan"""
+    return cache.get_or_set(DASHBOARD_KESH_KALITI, _hisoblash, DASHBOARD_KESH_MUDDATI)
+
+
+def _hisoblash():
+    oquv_yili = joriy_oquv_yili()
+    jami = Counter()
+    joriy_yil = Counter()
+    yillar = Counter()
+    for hisoblagich in ArizaHisoblagichi.objects.all():
+        jami[hisoblagich.holat] += hisoblagich.soni
+        yillar[hisoblagich.oquv_yili] += hisoblagich.soni
+        if hisoblagich.oquv_yili == oquv_yili:
+            joriy_yil[hisoblagich.holat] += hisoblagich.soni
+
+    bugun = timezone.localdate()
+    boshlanish = bugun - timedelta(days=KUNLAR_SONI - 1)
+    kunlik = {
+        kun.sana: kun
+        for kun in KunlikArizaStatistikasi.objects.filter(sana__gte=boshlanish)
+    }
+    vaqt_qatori = []
+    for i in range(KUNLAR_SONI):
+        sana = boshlanish + timedelta(days=i)
+        kun = kunlik.get(sana)
+        vaqt_qatori.append({
+            'sana': sana,
+            'yuborilgan': kun.yuborilgan if kun else 0,
+            'tasdiqlangan': kun.tasdiqlangan if kun else 0,
+        })
+    eng_kop = max([1] + [k['yuborilgan'] for k in vaqt_qatori] + [k['tasdiqlangan'] for k in vaqt_qatori])
+    for kun in vaqt_qatori:
+        kun['yuborilgan_foiz'] = kun['yuborilgan'] * 100 // eng_kop
+        kun['tasdiqlangan_foiz'] = kun['tasdiqlangan'] * 100 // eng_kop
+
+    holat_nomlari = dict(YotoqxonaAriza.HOLAT_TANLOV)
+    return {
+        'jami_arizalar': sum(jami.values()),
+        'yangi': jami['yangi'],
+        'tasdiqlangan': jami['tasdiqlandi'],
+        'rad_etilgan': jami['rad_etildi'],
+        'oquv_yili': oquv_yili,
+        'joriy_yil_holatlari': [
+            (holat_nomlari[kod], joriy_yil[kod]) for kod, _ in YotoqxonaAriza.HOLAT_TANLOV
+        ],
+        'oquv_yillari': sorted(yillar.items(), reverse=True),
+        'vaqt_qatori': vaqt_qatori,
+        'hisoblangan_vaqt': timezone.now(),
+    }
@@ -0,0 +1,164 @@
+import io
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections
+from PIL import Image, ImageOps
+
+from .models import YotoqxonaAriza
+
+
+logger = logging.getLogger(__name__)
+
+# Hujjat rasmining eng uzun tomoni (piksel)
+HUJJAT_MAKS_OLCHAM = 2000
+HUJJAT_WEBP_SIFATI = 80
+
+# Admin ro'yxatidagi miniatyura
+MINIATYURA_OLCHAMI = (240, 240)
+MINIATYURA_WEBP_SIFATI = 70
+
+# Fayl turini kengaytma emas, birinchi baytlar belgilaydi
+_IMZOLAR = (
+    (b'%PDF-', 'pdf'),
+    (b'\xff\xd8\xff', 'jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+)
+
+
+def haqiqiy_tur(fayl):
+    """Faylning haqiqiy turi (pdf/jpeg/png/webp) yoki None"""
+    joriy = fayl.tell() if hasattr(fayl, 'tell') else 0
+    fayl.seek(0)
+    bosh = fayl.read(16)
+    fayl.seek(joriy)
+    for imzo, tur in _IMZOLAR:
+        if bosh.startswith(imzo):
+            return tur
+    if bosh[:4] == b'RIFF' and bosh[8:12] == b'WEBP':
+        return 'webp'
+    return None
+
+
+def _webp(rasm, olcham, sifat):
+    """Rasmni o'lchamga sig'dirib EXIF'siz WebP baytlariga aylantirish"""
+    rasm = ImageOps.exif_transpose(rasm)
+    if rasm.mode not in ('RGB', 'RGBA'):
+        rasm = rasm.convert('RGBA' if 'transparency' in rasm.info or rasm.mode in ('LA', 'PA') else 'RGB')
+    rasm.thumbnail(olcham, Image.LANCZOS)
+    bufer = io.BytesIO()
+    # exif/icc uzatilmaydi - metama'lumotlar (GPS, qurilma) saqlanmaydi
+    rasm.save(bufer, 'WEBP', quality=sifat, method=6)
+    return bufer.getvalue()
+
+
+def _pdf_miniatyurasi(fayl):
+    """PDF birinchi sahifasi miniatyurasi (pdftoppm o'rnatilgan bo'lsa), aks holda None"""
+    pdftoppm = shutil.which('pdftoppm')
+    if not pdftoppm:
+        return None
+    with tempfile.TemporaryDirectory() as papka:
+        manba = os.path.join(papka, 'hujjat.pdf')
+        with open(manba, 'wb') as chiqish:
+            fayl.seek(0)
+            shutil.copyfileobj(fayl, chiqish)
+        try:
+            subprocess.run(
+                [pdftoppm, '-f', '1', '-l', '1', '-png', '-scale-to', str(max(MINIATYURA_OLCHAMI) * 2),
+                 '-singlefile', manba, os.path.join(papka, 'sahifa')],
+                check=True, timeout=30, capture_output=True,
+            )
+        except (subprocess.SubprocessError, OSError):
+            return None
+        with Image.open(os.path.join(papka, 'sahifa.png')) as rasm:
+            return _webp(rasm, MINIATYURA_OLCHAMI, MINIATYURA_WEBP_SIFATI)
+
+
+def hujjatni_qayta_ishlash(ariza_id):
+    """
+    Imtiyoz hujjatini normallashtirish: rasm EXIF'siz, kichraytirilgan WebP'ga aylanadi,
+    rasm va PDF (imkon bo'lsa) uchun miniatyura yaratiladi. Natija save() siz yoziladi.
+    """
+    asl_nom = (
+        YotoqxonaAriza.objects.filter(pk=ariza_id)
+        .values_list('imtiyoz_hujjat', flat=True)
+        .first()
+    )
+    if not asl_nom:
+        return None
+    hujjat_maydoni = YotoqxonaAriza._meta.get_field('imtiyoz_hujjat')
+    miniatyura_maydoni = YotoqxonaAriza._meta.get_field('imtiyoz_miniatyura')
+
+    hujjat = miniatyura = None
+    try:
+        with hujjat_maydoni.storage.open(asl_nom, 'rb') as fayl:
+            tur = haqiqiy_tur(fayl)
+            if tur is None:
+                raise ValueError("Fayl turi aniqlanmadi")
+            if tur == 'pdf':
+                miniatyura = _pdf_miniatyurasi(fayl)
+            else:
+                with Image.open(fayl) as rasm:
+                    hujjat = _webp(rasm, (HUJJAT_MAKS_OLCHAM, HUJJAT_MAKS_OLCHAM), HUJJAT_WEBP_SIFATI)
+                    miniatyura = _webp(rasm, MINIATYURA_OLCHAMI, MINIATYURA_WEBP_SIFATI)
+    except Exception as e:
+        logger.warning("Imtiyoz hujjati qayta ishlanmadi (ariza %s): %s", ariza_id, e)
+        YotoqxonaAriza.objects.filter(pk=ariza_id, imtiyoz_hujjat=asl_nom).update(hujjat_holati='xato')
+        return None
+
+    nom = os.path.splitext(os.path.basename(asl_nom))[0] + '.webp'
+    yangilash = {'hujjat_holati': 'tayyor'}
+    if hujjat is not None:
+        yangilash['imtiyoz_hujjat'] = hujjat_maydoni.storage.save(
+            f"{os.path.dirname(asl_nom)}/{nom}", ContentFile(hujjat)
+        )
+    if miniatyura is not None:
+        yangilash['imtiyoz_miniatyura'] = miniatyura_maydoni.storage.save(
+            miniatyura_maydoni.generate_filename(None, nom), ContentFile(miniatyura)
+        )
+
+    # Shu orada hujjat almashtirilgan bo'lsa - natija yozilmaydi, yangi fayllar o'chiriladi
+    if YotoqxonaAriza.objects.filter(pk=ariza_id, imtiyoz_hujjat=asl_nom).update(**yangilash):
+        if 'imtiyoz_hujjat' in yangilash:
+            hujjat_maydoni.storage.delete(asl_nom)
+        return yangilash
+    if 'imtiyoz_hujjat' in yangilash:
+        hujjat_maydoni.storage.delete(yangilash['imtiyoz_hujjat'])
+    if 'imtiyoz_miniatyura' in yangilash:
+        miniatyura_maydoni.storage.delete(yangilash['imtiyoz_miniatyura'])
+    return None
+
+
+# Fon ishlov berish pool'i (birinchi so'rovda yaratiladi)
+_pool = None
+_pool_qulfi = threading.Lock()
+
+
+def _bajarish(ariza_id):
+    close_old_connections()
+    try:
+        hujjatni_qayta_ishlash(ariza_id)
+    except Exception:
+        logger.exception("Imtiyoz hujjati ishlovida xato (ariza %s)", ariza_id)
+    finally:
+        close_old_connections()
+
+
+def navbatga_qoyish(ariza_id):
+    """Hujjatni fon oqimlarida qayta ishlashga yuborish (HUJJAT_ISHLOV_OQIMLARI=0 - shu oqimda)"""
+    global _pool
+    if settings.HUJJAT_ISHLOV_OQIMLARI <= 0:
+        return hujjatni_qayta_ishlash(ariza_id)
+    with _pool_qulfi:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=settings.HUJJAT_ISHLOV_OQIMLARI, thread_name_prefix='imtiyoz-hujjat'
+            )
+    return _pool.submit(_bajarish, ariza_id)
@@ -0,0 +1,221 @@
+import csv
+import io
+import re
+import secrets
+import tempfile
+import zipfile
+from datetime import date
+from xml.sax.saxutils import escape
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.files import File
+from django.db import close_old_connections
+from django.http import HttpRequest, QueryDict
+from django.utils import timezone
+
+from .models import EksportVazifasi, YotoqxonaAriza
+
+
+# CSV ustunlari (admin eksporti bilan bir xil tartibda)
+# Mavjud ustunlar tartibi o'zgarmaydi (tashqi jadvallar ustun o'rni bo'yicha o'qiydi) - yangilari oxiriga
+EKSPORT_USTUNLARI = [
+    'Ariza №', 'F.I.SH', 'Jinsi', 'Yoshi', 'Telefon',
+    'Viloyat', 'Fakultet', 'Kurs', 'Imtiyoz', 'Holat', 'Sana', 'Ball'
+]
+
+# Bog'langan nomlar JOIN orqali olinadi - har bir qator uchun qo'shimcha so'rov yo'q
+EKSPORT_MAYDONLARI = [
+    'ariza_raqami', 'fish', 'jinsi', 'tugilgan_sana', 'telefon',
+    'viloyat__nomi', 'fakultet__nomi', 'kurs__raqam',
+    'imtiyoz_turi', 'holat', 'ariza_sanasi', 'ustuvorlik_bali'
+]
+
+# Eksport ustuvorlik navbati tartibida (ariza_ustuvorlik_idx)
+EKSPORT_TARTIBI = ('-ustuvorlik_bali', 'ariza_sanasi', 'id')
+
+# Bazadan bir martada o'qiladigan qatorlar soni
+BOLAK_HAJMI = 2000
+
+
+def eksport_qatorlari(queryset, bolak_hajmi=BOLAK_HAJMI):
+    """Arizalarni eksport qatorlari ko'rinishida bo'laklab o'qish"""
+    jinslar = dict(YotoqxonaAriza.JINSI)
+    imtiyozlar = dict(YotoqxonaAriza.IMTIYOZ_TURI)
+    holatlar = dict(YotoqxonaAriza.HOLAT_TANLOV)
+    bugun = date.today()
+
+    qatorlar = queryset.values_list(*EKSPORT_MAYDONLARI).iterator(chunk_size=bolak_hajmi)
+    for (ariza_raqami, fish, jinsi, tugilgan_sana, telefon, viloyat, fakultet,
+         kurs, imtiyoz_turi, holat, ariza_sanasi, ustuvorlik_bali) in qatorlar:
+        yoshi = bugun.year - tugilgan_sana.year - (
+            (bugun.month, bugun.day) < (tugilgan_sana.month, tugilgan_sana.day)
+        )
+        yield [
+            ariza_raqami,
+            fish,
+            jinslar.get(jinsi, jinsi),
+            yoshi,
+            telefon,
+            viloyat,
+            fakultet,
+            kurs,
+            imtiyozlar.get(imtiyoz_turi, imtiyoz_turi),
+            holatlar.get(holat, holat),
+            ariza_sanasi.strftime("%d.%m.%Y"),
+            ustuvorlik_bali,
+        ]
+
+
+def csv_oqimi(queryset, bolak_hajmi=BOLAK_HAJMI):
+    """CSV matnini bo'laklab qaytaruvchi generator (UTF-8 BOM bilan)"""
+    bufer = io.StringIO()
+    writer = csv.writer(bufer)
+
+    bufer.write('\ufeff')  # UTF-8 BOM
+    writer.writerow(EKSPORT_USTUNLARI)
+
+    for i, qator in enumerate(eksport_qatorlari(queryset, bolak_hajmi), start=1):
+        writer.writerow(qator)
+        if i % bolak_hajmi == 0:
+            yield bufer.getvalue()
+            bufer.seek(0)
+            bufer.truncate()
+
+    yield bufer.getvalue()
+
+
+# ================== XLSX ==================
+_XLSX_FAYLLARI = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="xl/workbook.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Arizalar" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+        '</Relationships>'
+    ),
+}
+
+# XML 1.0 da ruxsat etilmagan boshqaruv belgilari
+_NOTOGRI_BELGILAR = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _xlsx_katak(qiymat):
+    if isinstance(qiymat, int) and not isinstance(qiymat, bool):
+        return f'<c><v>{qiymat}</v></c>'
+    matn = escape(_NOTOGRI_BELGILAR.sub('', str(qiymat)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{matn}</t></is></c>'
+
+
+def xlsx_yozish(fayl, qatorlar):
+    """Qatorlarni bitta varaqli XLSX faylga oqim sifatida yozish (openpyxl talab qilinmaydi)"""
+    with zipfile.ZipFile(fayl, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for nom, matn in _XLSX_FAYLLARI.items():
+            zf.writestr(nom, matn)
+        with zf.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as varaq:
+            varaq.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            for qator in qatorlar:
+                varaq.write(('<row>' + ''.join(_xlsx_katak(q) for q in qator) + '</row>').encode('utf-8'))
+            varaq.write(b'</sheetData></worksheet>')
+
+
+# ================== FON EKSPORT ==================
+def vazifa_queryseti(vazifa):
+    """Vazifa yaratilgan changelist filtrlari bo'yicha arizalar queryseti"""
+    if vazifa.tanlangan is not None:
+        return YotoqxonaAriza.objects.filter(pk__in=vazifa.tanlangan).order_by(*EKSPORT_TARTIBI)
+
+    from django.contrib import admin
+
+    # Changelist filtrlari, qidiruv va tartib admin orqali qayta qo'llanadi
+    request = HttpRequest()
+    request.method = 'GET'
+    request.GET = QueryDict(vazifa.filtrlar)
+    # Yaratuvchi o'chirilgan bo'lsa ham (SET_NULL) filtrlar o'sha-o'sha qo'llanadi
+    request.user = vazifa.yaratuvchi or AnonymousUser()
+    model_admin = admin.site._registry[YotoqxonaAriza]
+    return model_admin.get_changelist_instance(request).queryset.order_by(*EKSPORT_TARTIBI)
+
+
+def vazifani_bajarish(vazifa):
+    """
+    Eksport faylini yaratib MEDIA_ROOT ga saqlash, jarayonni bazaga yozib borish.
+    Jarayon yozuvi worker tirikligini ham bildiradi (EksportVazifasi.toxtaganlarni_qaytarish).
+    """
+    close_old_connections()
+    try:
+        queryset = vazifa_queryseti(vazifa)
+        vazifa.jami = queryset.count()
+        vazifa.faollikni_yozish(jami=vazifa.jami)
+
+        def jarayon_bilan(qatorlar):
+            for qator in qatorlar:
+                yield qator
+                vazifa.bajarildi += 1
+                if vazifa.bajarildi % BOLAK_HAJMI == 0:
+                    vazifa.faollikni_yozish(bajarildi=vazifa.bajarildi)
+
+        vazifa.bajarildi = 0
+        with tempfile.TemporaryFile() as vaqtinchalik:
+            qatorlar = jarayon_bilan(eksport_qatorlari(queryset))
+            if vazifa.format == 'xlsx':
+                xlsx_yozish(vaqtinchalik, _sarlavha_bilan(qatorlar))
+            else:
+                matn = io.TextIOWrapper(vaqtinchalik, encoding='utf-8', newline='')
+                matn.write('\ufeff')  # UTF-8 BOM
+                writer = csv.writer(matn)
+                writer.writerow(EKSPORT_USTUNLARI)
+                writer.writerows(qatorlar)
+                matn.flush()
+                matn.detach()
+
+            vaqtinchalik.seek(0)
+            nom = f"arizalar-{timezone.now():%Y%m%d-%H%M}-{secrets.token_hex(8)}.{vazifa.format}"
+            vazifa.fayl.save(nom, File(vaqtinchalik), save=False)
+
+        vazifa.holat = 'tayyor'
+        vazifa.yakunlangan_sana = timezone.now()
+        if not vazifa.faollikni_yozish(
+            holat='tayyor', jami=vazifa.jami, bajarildi=vazifa.bajarildi,
+            fayl=vazifa.fayl.name, yakunlangan_sana=vazifa.yakunlangan_sana,
+        ):
+            # Vazifa qayta navbatga olingan - natija boshqa worker'niki
+            vazifa.fayl.delete(save=False)
+    except Exception as e:
+        vazifa.holat = 'xato'
+        vazifa.xato_matni = str(e)
+        vazifa.yakunlangan_sana = timezone.now()
+        vazifa.faollikni_yozish(holat='xato', xato_matni=vazifa.xato_matni, yakunlangan_sana=vazifa.yakunlangan_sana)
+    return vazifa
+
+
+def _sarlavha_bilan(qatorlar):
+    yield EKSPORT_USTUNLARI
+    yield from qatorlar
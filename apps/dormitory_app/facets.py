@@ -0,0 +1,72 @@
+import hashlib
+
+from django.contrib import admin
+from django.core.cache import cache
+
+
+# Filtr yonidagi sonlar shu muddat keshlanadi (soniya)
+FACET_KESH_MUDDATI = 60
+
+
+def _kesh_kaliti(queryset, ifodalar):
+    sql, params = queryset.order_by().query.sql_with_params()
+    matn = repr((sql, params, sorted(ifodalar)))
+    return 'dormitory:facet:' + hashlib.md5(matn.encode()).hexdigest()
+
+
+def _sanash(queryset, ifodalar):
+    """Barcha Count(filter=...) ifodalari bitta aggregate so'rovida, natija keshlanadi"""
+    if not ifodalar:
+        return {}
+    return cache.get_or_set(
+        _kesh_kaliti(queryset, ifodalar),
+        lambda: queryset.order_by().aggregate(**ifodalar),
+        FACET_KESH_MUDDATI,
+    )
+
+
+def _faolmi(filtr, changelist):
+    parametrlar = changelist.get_filters_params()
+    return any(nom in parametrlar for nom in filtr.expected_parameters())
+
+
+class KeshlanganFacetMixin:
+    """
+    Django har bir filtr uchun alohida aggregate so'rovini yuboradi. Bu yerda faol bo'lmagan
+    filtrlar (ularning "filtr holati" - joriy ro'yxatning o'zi) sonlari bitta so'rovda birga
+    hisoblanadi; faol filtr o'z parametrisiz ro'yxat bo'yicha alohida sanaladi.
+    """
+
+    def get_facet_queryset(self, changelist):
+        if _faolmi(self, changelist):
+            queryset = changelist.get_queryset(self.request, exclude_parameters=self.expected_parameters())
+            return _sanash(queryset, self.get_facet_counts(changelist.pk_attname, queryset))
+
+        umumiy = getattr(changelist, '_umumiy_facetlar', None)
+        if umumiy is None:
+            ifodalar = {}
+            for i, filtr in enumerate(changelist.filter_specs):
+                if isinstance(filtr, KeshlanganFacetMixin) and not _faolmi(filtr, changelist):
+                    sanoqlar = filtr.get_facet_counts(changelist.pk_attname, changelist.queryset)
+                    ifodalar.update({f'f{i}_{kalit}': ifoda for kalit, ifoda in sanoqlar.items()})
+            umumiy = changelist._umumiy_facetlar = _sanash(changelist.queryset, ifodalar)
+
+        # filter_specs get_queryset() chaqirilganda qayta yaratiladi - tartib raqami bo'yicha
+        indeks = next(
+            i for i, filtr in enumerate(changelist.filter_specs)
+            if type(filtr) is type(self) and filtr.field_path == self.field_path
+        )
+        prefiks = f'f{indeks}_'
+        return {kalit[len(prefiks):]: son for kalit, son in umumiy.items() if kalit.startswith(prefiks)}
+
+
+class ChoicesFacetFilter(KeshlanganFacetMixin, admin.ChoicesFieldListFilter):
+    pass
+
+
+class RelatedFacetFilter(KeshlanganFacetMixin, admin.RelatedFieldListFilter):
+    pass
+
+
+class DateFacetFilter(KeshlanganFacetMixin, admin.DateFieldListFilter):
+    pass
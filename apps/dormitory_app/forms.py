@@ -1,6 +1,8 @@
 from django import forms
 from django.core.validators import RegexValidator
 from .models import YotoqxonaAriza, Fakultet, Kurs, Viloyat, Xona
+from .documents import haqiqiy_tur
+from .references import KeshlanganModelChoiceField, birinchi_kurs
 from datetime import date
 
 
@@ -30,6 +32,13 @@ class YotoqxonaArizaForm(forms.ModelForm):
             'imtiyoz_turi', 'imtiyoz_hujjat',
         ]
         
+        # Ma'lumotnomalar tanlovi va tekshiruvi keshdan - bazaga so'rov yo'q
+        field_classes = {
+            'viloyat': KeshlanganModelChoiceField,
+            'fakultet': KeshlanganModelChoiceField,
+            'kurs': KeshlanganModelChoiceField,
+        }
+        
         widgets = {
             # Shaxsiy ma'lumotlar
             'fish': forms.TextInput(attrs={
@@ -139,29 +148,30 @@ class YotoqxonaArizaForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         
-        # Kurs default 1 (yangi talabalar uchun)
-        self.fields['kurs'].initial = Kurs.objects.filter(raqam=1).first()
-        
-        # Required fieldlar
-        self.fields['fish'].required = True
-        self.fields['jinsi'].required = True
-        self.fields['tugilgan_sana'].required = True
-        self.fields['pasport'].required = True
-        self.fields['telefon'].required = True
-        self.fields['viloyat'].required = True
-        self.fields['tuman'].required = True
-        self.fields['manzil'].required = True
-        self.fields['fakultet'].required = True
-        self.fields['oila_azolari'].required = True
+        # Required fieldlar (import formasida bog'lanishlar yo'q - ular instance'da beriladi)
+        for nom in (
+            'fish', 'jinsi', 'tugilgan_sana', 'pasport', 'telefon', 'viloyat',
+            'tuman', 'manzil', 'fakultet', 'oila_azolari',
+        ):
+            if nom in self.fields:
+                self.fields[nom].required = True
         
         # Optional fieldlar
         self.fields['telefon_qoshimcha'].required = False
         self.fields['imtiyoz_hujjat'].required = False
         
-        # Viloyat empty label
-        self.fields['viloyat'].empty_label = "-- Viloyatni tanlang --"
-        self.fields['fakultet'].empty_label = "-- Fakultetni tanlang --"
+        if 'kurs' in self.fields:
+            # Kurs default 1 (yangi talabalar uchun)
+            self.fields['kurs'].initial = birinchi_kurs()
+            self.fields['viloyat'].empty_label = "-- Viloyatni tanlang --"
+            self.fields['fakultet'].empty_label = "-- Fakultetni tanlang --"
         
+    def _get_validation_exclusions(self):
+        # Keshdan tekshirilgan bog'lanishlar model validatsiyasida qayta so'ralmaydi
+        exclude = super()._get_validation_exclusions()
+        exclude.update(self.Meta.field_classes)
+        return exclude
+    
     def clean_fish(self):
         """FISh validatsiya - kamida 2 so'z"""
         fish = self.cleaned_data.get('fish')
@@ -267,6 +277,10 @@ class YotoqxonaArizaForm(forms.ModelForm):
             file_name = hujjat.name.lower()
             if not any(file_name.endswith(ext) for ext in allowed_extensions):
                 raise forms.ValidationError("Faqat PDF, JPG, PNG formatlar qabul qilinadi")
+            
+            # Haqiqiy turi - kengaytmaga emas, fayl boshidagi baytlarga qaraladi
+            if haqiqiy_tur(hujjat) not in ('pdf', 'jpeg', 'png'):
+                raise forms.ValidationError("Fayl mazmuni PDF, JPG yoki PNG emas")
         
         return hujjat
     
@@ -281,4 +295,31 @@ class YotoqxonaArizaForm(forms.ModelForm):
         if tel1 and tel2 and tel1 == tel2:
             raise forms.ValidationError("Asosiy va qo'shimcha telefon raqamlar bir xil bo'lmasligi kerak")
         
-        return cleaned_data
\ No newline at end of file
+        return cleaned_data
+
+
+class ArizaImportForm(YotoqxonaArizaForm):
+    """
+    Ommaviy import qatori uchun: tekshiruvlar (clean_*) ariza formasidan, bog'lanishlar
+    (viloyat, fakultet, kurs) esa import jadvalidan - instance'da oldindan beriladi.
+    Hujjat import qilinmaydi - shuning uchun imtiyozli qator xato sifatida qaytadi
+    (hujjat keyin ariza sahifasida yuklanadi).
+    """
+    
+    class Meta(YotoqxonaArizaForm.Meta):
+        fields = [
+            'fish', 'jinsi', 'tugilgan_sana', 'pasport',
+            'telefon', 'telefon_qoshimcha',
+            'tuman', 'manzil', 'oila_azolari', 'imtiyoz_turi', 'imtiyoz_hujjat',
+        ]
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Jadvalda fayl yo'q: maydon yuklanmaydi, faqat clean_imtiyoz_hujjat qoidasi ishlaydi
+        self.fields['imtiyoz_hujjat'].disabled = True
+    
+    def qayta_boglash(self, data, instance):
+        """Keyingi qator uchun shu formani qayta ishlatish (har qatorda maydonlarni nusxalash qimmat)"""
+        self.data = data
+        self.instance = instance
+        self._errors = None
@@ -0,0 +1,354 @@
+import csv
+import io
+import re
+import zipfile
+from collections import Counter
+from datetime import date, timedelta
+from xml.etree import ElementTree
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .forms import ArizaImportForm
+from .models import (
+    ArizaHisoblagichi, BinoXulosasi, Fakultet, KunlikArizaStatistikasi, Kurs, UstuvorlikMezoni,
+    Viloyat, Xona, YotoqxonaAriza, YotoqxonaBino, ariza_holati_keshini_tozalash,
+    ariza_raqamlari_ajratish, joriy_oquv_yili
+)
+from .references import malumotnoma_versiyasini_yangilash
+
+
+# ================== FAYL O'QISH ==================
+_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_KATAK_MANZILI = re.compile(r'^([A-Z]+)')
+
+
+def csv_qatorlari(fayl):
+    """CSV qatorlari (UTF-8, BOM bo'lsa ham; ajratuvchi , yoki ;)"""
+    matn = io.TextIOWrapper(fayl, encoding='utf-8-sig', newline='')
+    boshi = matn.readline()
+    ajratuvchi = ';' if boshi.count(';') > boshi.count(',') else ','
+    yield next(csv.reader([boshi], delimiter=ajratuvchi))
+    yield from csv.reader(matn, delimiter=ajratuvchi)
+
+
+def _ustun_raqami(manzil):
+    raqam = 0
+    for harf in _KATAK_MANZILI.match(manzil).group(1):
+        raqam = raqam * 26 + ord(harf) - 64
+    return raqam - 1
+
+
+def _birinchi_varaq(zf):
+    """Kitobdagi birinchi varaq fayli (odatda xl/worksheets/sheet1.xml)"""
+    try:
+        kitob = ElementTree.fromstring(zf.read('xl/workbook.xml'))
+        rid = kitob.find(f'{_NS}sheets/{_NS}sheet').get(f'{_REL_NS}id')
+        for rel in ElementTree.fromstring(zf.read('xl/_rels/workbook.xml.rels')):
+            if rel.get('Id') == rid:
+                nishon = rel.get('Target').lstrip('/')
+                return nishon if nishon.startswith('xl/') else 'xl/' + nishon
+    except (KeyError, AttributeError):
+        pass
+    return 'xl/worksheets/sheet1.xml'
+
+
+def _katak_qiymati(katak, umumiy_satrlar):
+    tur = katak.get('t')
+    if tur == 'inlineStr':
+        return ''.join(t.text or '' for t in katak.iter(f'{_NS}t'))
+    qiymat = katak.findtext(f'{_NS}v')
+    if qiymat is None:
+        return ''
+    if tur == 's':
+        return umumiy_satrlar[int(qiymat)]
+    if tur in (None, 'n'):
+        # 998901234567 kabi raqamlar 9.98901234567E+11 ko'rinishida saqlanishi mumkin
+        try:
+            son = float(qiymat)
+        except ValueError:
+            return qiymat
+        return str(int(son)) if son.is_integer() else qiymat
+    return qiymat
+
+
+def xlsx_qatorlari(fayl):
+    """XLSX birinchi varag'i qatorlari - oqim bilan (openpyxl talab qilinmaydi)"""
+    with zipfile.ZipFile(fayl) as zf:
+        umumiy_satrlar = []
+        if 'xl/sharedStrings.xml' in zf.namelist():
+            with zf.open('xl/sharedStrings.xml') as xml:
+                for _, element in ElementTree.iterparse(xml):
+                    if element.tag == f'{_NS}si':
+                        umumiy_satrlar.append(''.join(t.text or '' for t in element.iter(f'{_NS}t')))
+                        element.clear()
+        with zf.open(_birinchi_varaq(zf)) as xml:
+            for _, element in ElementTree.iterparse(xml):
+                if element.tag != f'{_NS}row':
+                    continue
+                qator = []
+                for katak in element.iter(f'{_NS}c'):
+                    manzil = katak.get('r')
+                    if manzil:
+                        # Bo'sh kataklar faylda yozilmaydi
+                        qator.extend([''] * (_ustun_raqami(manzil) - len(qator)))
+                    qator.append(_katak_qiymati(katak, umumiy_satrlar))
+                element.clear()
+                yield qator
+
+
+def jadval_qatorlari(yol):
+    """(qator raqami, {ustun: qiymat}) - sarlavha 1-qator, ma'lumotlar 2-qatordan"""
+    with open(yol, 'rb') as fayl:
+        qatorlar = xlsx_qatorlari(fayl) if yol.lower().endswith('.xlsx') else csv_qatorlari(fayl)
+        sarlavha = [ustun.strip().lower() for ustun in next(qatorlar, [])]
+        for raqam, qator in enumerate(qatorlar, start=2):
+            if not any(qiymat.strip() for qiymat in qator):
+                continue
+            yield raqam, {ustun: (qiymat or '').strip() for ustun, qiymat in zip(sarlavha, qator)}
+
+
+# ================== QIYMATLAR ==================
+_ROST = {'1', 'true', 'ha', 'bor', 'yes', '+'}
+_YOLGON = {'', '0', 'false', "yo'q", 'yoq', 'no', '-'}
+
+
+def _mantiqiy(qiymat):
+    qiymat = qiymat.lower()
+    if qiymat in _ROST:
+        return True
+    if qiymat in _YOLGON:
+        return False
+    raise ValidationError(f"Ha/yo'q qiymati kutilgan: {qiymat}")
+
+
+def _sana(qiymat):
+    """Excel sana raqami (45123) va 31.12.2005 ko'rinishini ISO formatga keltirish"""
+    if qiymat.isdigit() and len(qiymat) <= 5:
+        return (date(1899, 12, 30) + timedelta(days=int(qiymat))).isoformat()
+    moslik = re.match(r'^(\d{1,2})[./](\d{1,2})[./](\d{4})$', qiymat)
+    if moslik:
+        kun, oy, yil = moslik.groups()
+        return f"{yil}-{int(oy):02d}-{int(kun):02d}"
+    return qiymat[:10]
+
+
+def _kalit(qiymat):
+    return ' '.join(str(qiymat).lower().split())
+
+
+# ================== IMPORTLAR ==================
+class ModelImport:
+    """
+    Bitta model uchun import: qator -> tekshirilgan obyekt -> bo'lak bilan bulk_create.
+    Bog'lanishlar va mavjud kalitlar boshida bir marta xotiraga yuklanadi - qator uchun so'rov yo'q.
+    """
+
+    model = None
+    maydonlar = ()
+    mantiqiy_maydonlar = ()
+
+    def __init__(self):
+        self.mavjud = set(self.mavjud_kalitlar())
+
+    def mavjud_kalitlar(self):
+        return ()
+
+    def kalit(self, obyekt):
+        return None
+
+    def obyekt(self, qator, **boglanishlar):
+        qiymatlar = {maydon: qator[maydon] for maydon in self.maydonlar if qator.get(maydon, '') != ''}
+        for maydon in self.mantiqiy_maydonlar:
+            if maydon in qiymatlar:
+                qiymatlar[maydon] = _mantiqiy(qiymatlar[maydon])
+        obyekt = self.model(**qiymatlar, **boglanishlar)
+        # Bog'lanishlar xotiradagi jadvaldan olingan - FK tekshiruvi (qator uchun so'rov) kerak emas
+        obyekt.full_clean(
+            exclude=[nom.removesuffix('_id') for nom in boglanishlar],
+            validate_unique=False, validate_constraints=False,
+        )
+        return obyekt
+
+    def qator(self, qator):
+        """Tekshirilgan yangi obyekt yoki None (allaqachon bor)"""
+        obyekt = self.obyekt(qator)
+        kalit = self.kalit(obyekt)
+        if kalit is not None:
+            if kalit in self.mavjud:
+                return None
+            self.mavjud.add(kalit)
+        return obyekt
+
+    def yozish(self, obyektlar):
+        with transaction.atomic():
+            self.model.objects.bulk_create(obyektlar, ignore_conflicts=True)
+
+
+class MalumotnomaImport(ModelImport):
+    """Nomi bo'yicha noyob ma'lumotnomalar (fakultet, viloyat)"""
+
+    def mavjud_kalitlar(self):
+        return (_kalit(nomi) for nomi in self.model.objects.values_list('nomi', flat=True))
+
+    def kalit(self, obyekt):
+        return _kalit(obyekt.nomi)
+
+    def yozish(self, obyektlar):
+        with transaction.atomic():
+            self.model.objects.bulk_create(obyektlar, ignore_conflicts=True)
+            # Signal ishlamaydi - forma tanlovlari keshi shu yerda eskirtiriladi
+            malumotnoma_versiyasini_yangilash()
+
+
+class FakultetImport(MalumotnomaImport):
+    model = Fakultet
+    maydonlar = ('nomi', 'qisqartma', 'tavsif')
+
+
+class ViloyatImport(MalumotnomaImport):
+    model = Viloyat
+    maydonlar = ('nomi',)
+
+
+class BinoImport(ModelImport):
+    model = YotoqxonaBino
+    maydonlar = (
+        'raqam', 'nomi', 'turi', 'manzil', 'qavatlar_soni', 'har_qavatda_xonalar',
+        'wifi', 'oshxona', 'kir_yuvish', 'issiq_suv', 'faol',
+        'xona_raqam_shabloni', 'standart_sig_imi', 'standart_narxi',
+    )
+    mantiqiy_maydonlar = ('wifi', 'oshxona', 'kir_yuvish', 'issiq_suv', 'faol')
+
+    def mavjud_kalitlar(self):
+        return YotoqxonaBino.objects.values_list('raqam', flat=True)
+
+    def kalit(self, obyekt):
+        return obyekt.raqam
+
+    def yozish(self, obyektlar):
+        with transaction.atomic():
+            YotoqxonaBino.objects.bulk_create(obyektlar, ignore_conflicts=True)
+            # post_save signali ishlamaydi - xulosalar shu yerda
+            bino_ids = YotoqxonaBino.objects.filter(
+                raqam__in=[bino.raqam for bino in obyektlar]
+            ).values_list('pk', flat=True)
+            BinoXulosasi.yangilash(bino_ids=bino_ids)
+
+
+class XonaImport(ModelImport):
+    model = Xona
+    maydonlar = ('raqam', 'qavat', 'sig_imi', 'konditsioner', 'muzlatgich', 'narxi')
+    mantiqiy_maydonlar = ('konditsioner', 'muzlatgich')
+
+    def __init__(self):
+        self.binolar = {
+            raqam: (pk, turi) for raqam, pk, turi in YotoqxonaBino.objects.values_list('raqam', 'pk', 'turi')
+        }
+        super().__init__()
+
+    def mavjud_kalitlar(self):
+        return Xona.objects.values_list('bino_id', 'raqam')
+
+    def kalit(self, obyekt):
+        return (obyekt.bino_id, obyekt.raqam)
+
+    def obyekt(self, qator):
+        try:
+            bino_id, bino_turi = self.binolar[int(qator.get('bino', ''))]
+        except (KeyError, ValueError):
+            raise ValidationError(f"Bino topilmadi: {qator.get('bino', '')}")
+        return super().obyekt(qator, bino_id=bino_id, bino_turi=bino_turi)
+
+    def yozish(self, obyektlar):
+        with transaction.atomic():
+            Xona.objects.bulk_create(obyektlar, ignore_conflicts=True)
+            BinoXulosasi.yangilash(bino_ids={xona.bino_id for xona in obyektlar})
+
+
+class ArizaImport(ModelImport):
+    """
+    Arizalar: tekshiruv ArizaImportForm (ariza formasining clean_* qoidalari) orqali.
+    save() chaqirilmaydi - raqam, qidiruv ustunlari, ustuvorlik bali va hisoblagichlar shu yerda to'ldiriladi.
+    """
+
+    model = YotoqxonaAriza
+    # Importda ruxsat etilgan holatlar (tasdiqlash xona band qilishni talab qiladi)
+    holatlar = {'yangi', 'korilmoqda', 'imtixon', 'rad_etildi', 'bekor'}
+
+    def __init__(self):
+        super().__init__()
+        self.viloyatlar = {_kalit(nomi): pk for pk, nomi in Viloyat.objects.values_list('pk', 'nomi')}
+        self.fakultetlar = {}
+        for pk, nomi, qisqartma in Fakultet.objects.values_list('pk', 'nomi', 'qisqartma'):
+            self.fakultetlar[_kalit(nomi)] = pk
+            if qisqartma:
+                self.fakultetlar.setdefault(_kalit(qisqartma), pk)
+        self.kurslar = {str(raqam): pk for pk, raqam in Kurs.objects.values_list('pk', 'raqam')}
+        self.oquv_yili = joriy_oquv_yili()
+        self.ustuvorlik_qoidalari = UstuvorlikMezoni.qoidalar()
+        self.forma = ArizaImportForm(data={}, instance=YotoqxonaAriza())
+
+    def mavjud_kalitlar(self):
+        # Tabiiy kalit: bitta o'quv yilida bitta pasportga bitta ariza.
+        # Bazadan olinadi - nuqta yozilmay qolsa yoki fayl qayta yuklansa ham takror yozilmaydi
+        return YotoqxonaAriza.objects.values_list('pasport', 'oquv_yili')
+
+    def kalit(self, obyekt):
+        return (obyekt.pasport, obyekt.oquv_yili)
+
+    def _boglanish(self, lugat, qator, maydon, nom):
+        qiymat = qator.get(maydon, '')
+        pk = lugat.get(_kalit(qiymat).removesuffix('-kurs'))
+        if pk is None:
+            raise ValidationError(f"{nom} topilmadi: {qiymat}")
+        return pk
+
+    def obyekt(self, qator):
+        holat = qator.get('holat') or 'yangi'
+        if holat not in self.holatlar:
+            raise ValidationError(f"Holat noto'g'ri: {holat}")
+        ariza = YotoqxonaAriza(
+            viloyat_id=self._boglanish(self.viloyatlar, qator, 'viloyat', "Viloyat"),
+            fakultet_id=self._boglanish(self.fakultetlar, qator, 'fakultet', "Fakultet"),
+            kurs_id=self._boglanish(self.kurslar, qator, 'kurs', "Kurs"),
+            holat=holat,
+            oquv_yili=qator.get('oquv_yili') or self.oquv_yili,
+        )
+        malumot = dict(qator)
+        malumot['imtiyoz_turi'] = malumot.get('imtiyoz_turi') or 'yoq'
+        if malumot.get('tugilgan_sana'):
+            malumot['tugilgan_sana'] = _sana(malumot['tugilgan_sana'])
+        forma = self.forma
+        forma.qayta_boglash(malumot, ariza)
+        if not forma.is_valid():
+            raise ValidationError([
+                f"{maydon}: {xato}" if maydon != '__all__' else xato
+                for maydon, xatolar in forma.errors.items() for xato in xatolar
+            ])
+        ariza.qidiruv_maydonlarini_toldirish()
+        ariza.ustuvorlik_bali = UstuvorlikMezoni.ariza_bali(ariza, self.ustuvorlik_qoidalari)
+        return ariza
+
+    def yozish(self, arizalar):
+        # Raqamlar alohida tranzaksiyada - yozish uzoq davom etsa ham ketma-ketlik qulflanmaydi
+        for ariza, raqam in zip(arizalar, ariza_raqamlari_ajratish(len(arizalar))):
+            ariza.ariza_raqami = raqam
+        with transaction.atomic():
+            YotoqxonaAriza.objects.bulk_create(arizalar)
+            # Dashboard hisoblagichlari (bulk_create save() ni chaqirmaydi)
+            guruhlar = Counter((ariza.oquv_yili, ariza.holat) for ariza in arizalar)
+            for (oquv_yili, holat), soni in guruhlar.items():
+                ArizaHisoblagichi.ozgartirish(oquv_yili, holat, soni)
+            KunlikArizaStatistikasi.ozgartirish(yuborilgan=len(arizalar))
+            ariza_holati_keshini_tozalash([ariza.ariza_raqami for ariza in arizalar])
+
+
+IMPORTLAR = {
+    'fakultet': FakultetImport,
+    'viloyat': ViloyatImport,
+    'bino': BinoImport,
+    'xona': XonaImport,
+    'ariza': ArizaImport,
+}
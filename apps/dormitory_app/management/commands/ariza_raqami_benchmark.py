@@ -0,0 +1,80 @@
+import math
+import threading
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+
+from apps.dormitory_app import models
+from apps.dormitory_app.models import ArizaRaqamiKetmaKetligi, ariza_raqami_ajratish
+
+
+# Benchmark uchun haqiqiy yillarga tegmaydigan yil
+BENCHMARK_YILI = 9999
+
+
+class Command(BaseCommand):
+    help = "Ariza raqami ajratish tezligini eski (uuid4) usul bilan solishtirish"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--soni', type=int, default=5000, help="Har bir oqim uchun raqamlar soni")
+        parser.add_argument('--oqimlar', type=int, default=4, help="Parallel oqimlar soni")
+        parser.add_argument('--blok', type=int, default=50, help="Blok rejimi uchun blok hajmi")
+
+    def handle(self, *args, **options):
+        soni, oqimlar = options['soni'], options['oqimlar']
+        jami = soni * oqimlar
+
+        natijalar = [
+            ("uuid4 (eski usul)", self._olchash(self._eski_usul, soni, oqimlar)),
+            ("ketma-ketlik, blok=1", self._ketma_ketlik(soni, oqimlar, 1)),
+            (f"ketma-ketlik, blok={options['blok']}", self._ketma_ketlik(soni, oqimlar, options['blok'])),
+        ]
+
+        self.stdout.write(f"\n{jami} ta raqam, {oqimlar} ta oqim ({connection.vendor})\n")
+        for nomi, (soniya, raqamlar) in natijalar:
+            takror = len(raqamlar) - len(set(raqamlar))
+            self.stdout.write(
+                f"  {nomi:<28} {jami / soniya:>12,.0f} raqam/s   takrorlar: {takror}"
+            )
+
+        # Eski usulda takrorlanish ehtimoli (tug'ilgan kunlar paradoksi), 16^6 qiymat
+        qiymatlar = 16 ** 6
+        for yillik in (1_000, 5_000, 20_000):
+            ehtimol = 1 - math.exp(-yillik * (yillik - 1) / (2 * qiymatlar))
+            self.stdout.write(f"  uuid4: yiliga {yillik:>6} ariza - takrorlanish ehtimoli {ehtimol:.1%}")
+
+    def _olchash(self, funksiya, soni, oqimlar):
+        raqamlar = []
+        qulf = threading.Lock()
+
+        def ishchi():
+            try:
+                natija = [funksiya() for _ in range(soni)]
+                with qulf:
+                    raqamlar.extend(natija)
+            finally:
+                connection.close()
+
+        oqim_royxati = [threading.Thread(target=ishchi) for _ in range(oqimlar)]
+        boshlanish = time.perf_counter()
+        for oqim in oqim_royxati:
+            oqim.start()
+        for oqim in oqim_royxati:
+            oqim.join()
+        return time.perf_counter() - boshlanish, raqamlar
+
+    def _eski_usul(self):
+        return f"YA-{BENCHMARK_YILI}-{uuid.uuid4().hex[:6].upper()}"
+
+    def _ketma_ketlik(self, soni, oqimlar, blok):
+        ArizaRaqamiKetmaKetligi.objects.filter(yil=BENCHMARK_YILI).delete()
+        models._raqam_bloklari.pop(BENCHMARK_YILI, None)
+        try:
+            with override_settings(ARIZA_RAQAM_BLOK_HAJMI=blok):
+                return self._olchash(lambda: ariza_raqami_ajratish(BENCHMARK_YILI), soni, oqimlar)
+        finally:
+            ArizaRaqamiKetmaKetligi.objects.filter(yil=BENCHMARK_YILI).delete()
+            models._raqam_bloklari.pop(BENCHMARK_YILI, None)
@@ -0,0 +1,38 @@
+import csv
+
+from django.core.management.base import BaseCommand
+
+from apps.dormitory_app.models import Xona
+
+
+class Command(BaseCommand):
+    help = (
+        "Xonalardagi band_orinlar hisoblagichini tasdiqlangan arizalar soniga tenglashtirish "
+        "va farqlar hisobotini chiqarish (tungi vazifa sifatida ishga tushiriladi)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bino', type=int, action='append', help="Faqat shu bino(lar) raqami")
+        parser.add_argument('--bolak', type=int, default=2000, help="Bitta tranzaksiyadagi xonalar soni")
+        parser.add_argument('--quruq', action='store_true', help="Faqat hisobot - bazaga yozilmaydi")
+        parser.add_argument('--hisobot', help="Farqlarni CSV faylga yozish")
+
+    def handle(self, *args, **options):
+        xonalar = Xona.objects.all()
+        if options['bino']:
+            xonalar = xonalar.filter(bino__raqam__in=options['bino'])
+        farqlar = Xona.bandlikni_moslashtirish(xonalar, bolak=options['bolak'], quruq=options['quruq'])
+
+        for xona, edi, haqiqiy in farqlar:
+            ortiqcha = " (sig'imdan oshgan)" if haqiqiy > xona.sig_imi else ""
+            self.stdout.write(f"{xona}: {edi} -> {haqiqiy}{ortiqcha}")
+        if options['hisobot']:
+            with open(options['hisobot'], 'w', newline='', encoding='utf-8') as fayl:
+                yozuvchi = csv.writer(fayl)
+                yozuvchi.writerow(['bino', 'xona', 'sig_imi', 'saqlangan', 'haqiqiy'])
+                for xona, edi, haqiqiy in farqlar:
+                    yozuvchi.writerow([xona.bino.raqam, xona.raqam, xona.sig_imi, edi, haqiqiy])
+
+        holat = "topildi" if options['quruq'] else "tuzatildi"
+        uslub = self.style.WARNING if farqlar else self.style.SUCCESS
+        self.stdout.write(uslub(f"{len(farqlar)} ta xonada farq {holat}"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.dormitory_app.models import BinoXulosasi
+
+
+class Command(BaseCommand):
+    help = "Barcha binolar bandlik xulosasini xonalardan qayta hisoblash"
+
+    def handle(self, *args, **options):
+        soni = BinoXulosasi.qayta_hisoblash()
+        self.stdout.write(self.style.SUCCESS(f"{soni} ta bino xulosasi yangilandi"))
@@ -0,0 +1,53 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from apps.dormitory_app.exports import vazifani_bajarish
+from apps.dormitory_app.models import EksportVazifasi
+
+
+class Command(BaseCommand):
+    help = (
+        "Navbatdagi eksport vazifalarini mahalliy worker pool'da bajarish. "
+        "EKSPORT_VAZIFA_MUDDATI davomida jarayon yozmagan vazifalar qayta navbatga olinadi"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--oqimlar', type=int, default=2, help="Parallel workerlar soni")
+        parser.add_argument('--interval', type=float, default=5, help="Navbatni tekshirish oralig'i (soniya)")
+        parser.add_argument('--bir-marta', action='store_true', help="Navbat bo'shagach to'xtash")
+
+    def handle(self, *args, **options):
+        oqimlar = options['oqimlar']
+        self.stdout.write(f"Eksport worker ishga tushdi ({oqimlar} ta oqim)")
+
+        with ThreadPoolExecutor(max_workers=oqimlar) as pool:
+            bajarilmoqda = set()
+            while True:
+                bajarilmoqda = {f for f in bajarilmoqda if not f.done()}
+                # O'lgan workerlar tashlab ketgan vazifalar
+                qaytarildi = EksportVazifasi.toxtaganlarni_qaytarish()
+                if qaytarildi:
+                    self.stdout.write(self.style.WARNING(f"↺ {qaytarildi} ta to'xtab qolgan vazifa qaytarildi"))
+                while len(bajarilmoqda) < oqimlar:
+                    vazifa = EksportVazifasi.navbatdan_olish()
+                    if vazifa is None:
+                        break
+                    self.stdout.write(f"→ {vazifa} boshlandi")
+                    bajarilmoqda.add(pool.submit(self._bajarish, vazifa))
+
+                if options['bir_marta'] and not bajarilmoqda:
+                    break
+                time.sleep(options['interval'] if not options['bir_marta'] else 0.2)
+
+    def _bajarish(self, vazifa):
+        try:
+            vazifa = vazifani_bajarish(vazifa)
+            if vazifa.holat == 'tayyor':
+                self.stdout.write(self.style.SUCCESS(f"✓ {vazifa}: {vazifa.bajarildi} qator"))
+            else:
+                self.stdout.write(self.style.ERROR(f"✗ {vazifa}: {vazifa.xato_matni}"))
+        finally:
+            connection.close()
@@ -0,0 +1,150 @@
+import re
+import shlex
+import shutil
+import subprocess
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Yig'ilgan fayllar shu papkaga yoziladi (STATICFILES_DIRS ichida, git'da saqlanmaydi)
+BUILD_PAPKASI = Path(settings.BASE_DIR) / 'static' / 'build'
+ASSETS_PAPKASI = Path(settings.BASE_DIR) / 'assets'
+
+# Tailwind sinflari va ikonkalar qidiriladigan fayllar
+MANBA_FAYLLARI = ['templates/**/*.html', 'apps/**/forms.py']
+
+# Versiyasi qotirilgan JS/CSS kutubxonalar: static/build/vendor/ ichidagi nom -> manba
+VENDOR_FAYLLARI = {
+    'alpine.min.js': 'https://cdn.jsdelivr.net/npm/alpinejs@3.13.3/dist/cdn.min.js',
+    'aos.js': 'https://unpkg.com/aos@2.3.1/dist/aos.js',
+    'aos.css': 'https://unpkg.com/aos@2.3.1/dist/aos.css',
+    'sweetalert2.all.min.js': 'https://cdn.jsdelivr.net/npm/sweetalert2@11.10.5/dist/sweetalert2.all.min.js',
+    'lottie-player.js': 'https://unpkg.com/@lottiefiles/lottie-player@2.0.4/dist/lottie-player.js',
+    'lottie/yotoqxona.json': 'https://assets3.lottiefiles.com/packages/lf20_kkflmtur.json',
+}
+
+# Shriftlar - faqat ishlatiladigan og'irliklar
+SHRIFTLAR_URL = (
+    'https://fonts.googleapis.com/css2?family=Plus+Jakarta+Sans:wght@300;400;500;600;700;800'
+    '&family=Inter:wght@300;400;500;600;700;800;900&display=swap'
+)
+
+# Boxicons - har bir ikonka alohida SVG sifatida olinadi
+BOXICONS_URL = 'https://unpkg.com/boxicons@2.1.4/svg/{papka}/{nom}.svg'
+BOXICONS_PAPKALARI = {'bx': 'regular', 'bxs': 'solid', 'bxl': 'logos'}
+BOXICON_REGEX = re.compile(r'\b(bx[sl]?)-([a-z0-9-]+)')
+# Ikonka emas, yordamchi sinflar
+BOXICON_MODIFIKATORLARI = {'spin'}
+
+# woff2 qaytarishi uchun zamonaviy brauzer User-Agent
+USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/120.0 Safari/537.36'
+)
+
+
+def yuklab_olish(url, timeout=60):
+    sorov = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+    with urllib.request.urlopen(sorov, timeout=timeout) as javob:
+        return javob.read()
+
+
+class Command(BaseCommand):
+    help = (
+        "Frontend fayllarini yig'ish: siqilgan Tailwind CSS, ishlatilgan Boxicons ikonkalari, "
+        "shriftlar va kutubxonalar static/build/ ga yoziladi. Keyin collectstatic ishga tushiriladi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tailwind', default=settings.TAILWIND_CLI,
+            help="Tailwind CLI buyrug'i (standalone binary yoki npx)"
+        )
+        parser.add_argument('--faqat-css', action='store_true', help="Faqat Tailwind CSS ni qayta yig'ish")
+
+    def handle(self, *args, **options):
+        BUILD_PAPKASI.mkdir(parents=True, exist_ok=True)
+        self._tailwind(options['tailwind'])
+        if options['faqat_css']:
+            return
+        self._ikonkalar()
+        self._shriftlar()
+        self._vendor()
+        self.stdout.write(self.style.SUCCESS(
+            f"Frontend fayllari {BUILD_PAPKASI} ga yozildi. Endi: python manage.py collectstatic"
+        ))
+
+    def _tailwind(self, cli):
+        chiqish = BUILD_PAPKASI / 'app.css'
+        buyruq = shlex.split(cli) + [
+            '-c', str(ASSETS_PAPKASI / 'tailwind.config.js'),
+            '-i', str(ASSETS_PAPKASI / 'tailwind.css'),
+            '-o', str(chiqish),
+            '--minify',
+        ]
+        if not shutil.which(buyruq[0]):
+            raise CommandError(f"Tailwind CLI topilmadi: {buyruq[0]} (--tailwind yoki TAILWIND_CLI)")
+        try:
+            subprocess.run(buyruq, cwd=settings.BASE_DIR, check=True)
+        except subprocess.CalledProcessError as e:
+            raise CommandError(f"Tailwind yig'ishda xato: {e}")
+        self.stdout.write(f"✓ app.css ({chiqish.stat().st_size // 1024} KB)")
+
+    def _ishlatilgan_ikonkalar(self):
+        ikonkalar = set()
+        for naqsh in MANBA_FAYLLARI:
+            for fayl in Path(settings.BASE_DIR).glob(naqsh):
+                for prefiks, nom in BOXICON_REGEX.findall(fayl.read_text(encoding='utf-8')):
+                    if nom not in BOXICON_MODIFIKATORLARI:
+                        ikonkalar.add((prefiks, nom))
+        return sorted(ikonkalar)
+
+    def _ikonkalar(self):
+        """Faqat shablonlarda uchragan Boxicons ikonkalari - CSS mask sifatida"""
+        qatorlar = [
+            '.bx,.bxs,.bxl{display:inline-block;width:1em;height:1em;vertical-align:-.125em;'
+            'background-color:currentColor;-webkit-mask:var(--bx) center/contain no-repeat;'
+            'mask:var(--bx) center/contain no-repeat}',
+            '.bx-spin{animation:bx-spin 2s linear infinite}',
+            '@keyframes bx-spin{to{transform:rotate(360deg)}}',
+        ]
+        ikonkalar = self._ishlatilgan_ikonkalar()
+        for prefiks, nom in ikonkalar:
+            sinf = f'{prefiks}-{nom}'
+            url = BOXICONS_URL.format(papka=BOXICONS_PAPKALARI[prefiks], nom=sinf)
+            try:
+                svg = yuklab_olish(url).decode('utf-8')
+            except OSError as e:
+                self.stderr.write(f"  ikonka olinmadi: {sinf} ({e})")
+                continue
+            svg = re.sub(r'\s+', ' ', svg).strip()
+            qatorlar.append(f'.{sinf}{{--bx:url("data:image/svg+xml,{urllib.parse.quote(svg)}")}}')
+        (BUILD_PAPKASI / 'icons.css').write_text('\n'.join(qatorlar), encoding='utf-8')
+        self.stdout.write(f"✓ icons.css ({len(ikonkalar)} ta ikonka)")
+
+    def _shriftlar(self):
+        """Google Fonts CSS va woff2 fayllarini o'zimizda saqlash"""
+        papka = BUILD_PAPKASI / 'fonts'
+        papka.mkdir(exist_ok=True)
+        css = yuklab_olish(SHRIFTLAR_URL).decode('utf-8')
+
+        def almashtirish(moslik):
+            url = moslik.group(1)
+            nom = Path(urllib.parse.urlparse(url).path).name
+            (papka / nom).write_bytes(yuklab_olish(url))
+            return f'url({nom})'
+
+        css = re.sub(r'url\((https://fonts\.gstatic\.com/[^)]+)\)', almashtirish, css)
+        (papka / 'fonts.css').write_text(css, encoding='utf-8')
+        self.stdout.write(f"✓ fonts.css ({len(list(papka.glob('*.woff2')))} ta shrift fayli)")
+
+    def _vendor(self):
+        for nom, url in VENDOR_FAYLLARI.items():
+            fayl = BUILD_PAPKASI / 'vendor' / nom
+            fayl.parent.mkdir(parents=True, exist_ok=True)
+            fayl.write_bytes(yuklab_olish(url))
+            self.stdout.write(f"✓ vendor/{nom}")
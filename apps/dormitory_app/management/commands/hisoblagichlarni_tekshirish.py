@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.dormitory_app.models import ArizaHisoblagichi, KunlikArizaStatistikasi
+
+
+class Command(BaseCommand):
+    help = "Dashboard hisoblagichlarini arizalar jadvali bilan solishtirib tuzatish (cron uchun)"
+
+    def handle(self, *args, **options):
+        farq = ArizaHisoblagichi.qayta_hisoblash()
+        kunlar = KunlikArizaStatistikasi.qayta_hisoblash()
+        if farq:
+            self.stdout.write(self.style.WARNING(f"{farq} ta hisoblagich tuzatildi"))
+        self.stdout.write(self.style.SUCCESS(f"Hisoblagichlar tekshirildi, {kunlar} kunlik qator qayta qurildi"))
@@ -0,0 +1,125 @@
+import os
+from collections import Counter
+from datetime import timedelta
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.dormitory_app.models import ArxivAriza, SaqlanganFayl, YotoqxonaAriza
+from apps.dormitory_app.storage import KONTENT_NOMI
+
+
+# Kontent manzilli storage ishlatadigan maydonlar
+MAYDONLAR = ('imtiyoz_hujjat', 'imtiyoz_miniatyura')
+
+
+class Command(BaseCommand):
+    help = (
+        "Imtiyoz hujjatlari: eski fayllarni kontent xeshi bo'yicha saqlashga ko'chirish (--kochirish), "
+        "havolalar sonini bazadagi arizalar bilan tekshirish va havolasiz fayllarni o'chirish"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kochirish', action='store_true', help="Eski yo'llardagi fayllarni ko'chirish")
+        parser.add_argument('--quruq', action='store_true', help="Hech narsa o'zgartirmay faqat hisobot")
+        parser.add_argument(
+            '--muddat', type=int, default=24,
+            help="Shu soatdan yangi fayllar o'chirilmaydi (yuklanayotgan fayllar uchun)"
+        )
+
+    def handle(self, *args, **options):
+        self.quruq = options['quruq']
+        self.storage = YotoqxonaAriza._meta.get_field('imtiyoz_hujjat').storage
+        if options['kochirish']:
+            self._kochirish()
+        self._tozalash(timezone.now() - timedelta(hours=options['muddat']))
+
+    def _kochirish(self):
+        kochirildi = topilmadi = 0
+        for maydon in MAYDONLAR:
+            qatorlar = (
+                YotoqxonaAriza.objects.exclude(**{maydon: ''}).exclude(**{f'{maydon}__isnull': True})
+                .values_list('pk', maydon)
+                .iterator()
+            )
+            for pk, eski in qatorlar:
+                if KONTENT_NOMI.match(eski):
+                    continue
+                if not self.storage.exists(eski):
+                    topilmadi += 1
+                    self.stderr.write(f"  topilmadi: {eski}")
+                    continue
+                if self.quruq:
+                    kochirildi += 1
+                    continue
+                with self.storage.open(eski, 'rb') as fayl:
+                    yangi = self.storage.save(eski, File(fayl))
+                if not YotoqxonaAriza.objects.filter(pk=pk, **{maydon: eski}).update(**{maydon: yangi}):
+                    # Shu orada o'zgargan - yangi havola qaytariladi
+                    self.storage.delete(yangi)
+                    continue
+                kochirildi += 1
+        # Eski fayllarning o'zi quyidagi tozalashda (havolasiz fayl sifatida) o'chiriladi
+        self.stdout.write(f"Ko'chirildi: {kochirildi}, topilmadi: {topilmadi}")
+
+    def _tozalash(self, chegara):
+        havolalar = Counter()
+        for maydon in MAYDONLAR:
+            for nom in YotoqxonaAriza.objects.values_list(maydon, flat=True).iterator():
+                if nom:
+                    havolalar[nom] += 1
+            # Arxivdagi arizalar hujjatlari ham havola hisoblanadi
+            for nom in ArxivAriza.objects.values_list(f'malumotlar__{maydon}', flat=True).iterator():
+                if nom:
+                    havolalar[nom] += 1
+
+        # 1) Havolalar soni bazadagi haqiqiy qiymatga tenglashtiriladi
+        tuzatildi = []
+        ochiriladigan = []
+        for fayl in SaqlanganFayl.objects.iterator():
+            haqiqiy = havolalar.get(fayl.nom, 0)
+            if haqiqiy == 0:
+                if fayl.yaratilgan_sana < chegara:
+                    ochiriladigan.append(fayl)
+            elif haqiqiy != fayl.havolalar:
+                fayl.havolalar = haqiqiy
+                tuzatildi.append(fayl)
+
+        # 2) Diskda bor, lekin bazada ham, jadvalda ham yo'q fayllar (eski yo'llar, bekor qilingan yuklashlar)
+        kuzatilgan = set(SaqlanganFayl.objects.values_list('nom', flat=True))
+        yetim_fayllar = []
+        chegara_vaqti = chegara.timestamp()
+        for prefiks in {nom.split('/', 1)[0] for nom in self._upload_papkalari()}:
+            ildiz = self.storage.path(prefiks)
+            for papka, _, fayllar in os.walk(ildiz):
+                for fayl_nomi in fayllar:
+                    yol = os.path.join(papka, fayl_nomi)
+                    nom = os.path.relpath(yol, self.storage.location).replace(os.sep, '/')
+                    if nom in havolalar or nom in kuzatilgan:
+                        continue
+                    if os.path.getmtime(yol) < chegara_vaqti:
+                        yetim_fayllar.append(nom)
+
+        hajm = sum(fayl.hajm for fayl in ochiriladigan)
+        hajm += sum(os.path.getsize(self.storage.path(nom)) for nom in yetim_fayllar)
+        self.stdout.write(
+            f"Havolalar tuzatildi: {len(tuzatildi)}, havolasiz fayllar: "
+            f"{len(ochiriladigan) + len(yetim_fayllar)} ({hajm // 1024} KB)"
+        )
+        if self.quruq:
+            return
+
+        SaqlanganFayl.objects.bulk_update(tuzatildi, ['havolalar'], batch_size=500)
+        for fayl in ochiriladigan:
+            # Shu orada yangi havola qo'shilmagan bo'lsagina
+            if SaqlanganFayl.objects.filter(pk=fayl.pk, havolalar=fayl.havolalar).delete()[0]:
+                FileSystemStorage.delete(self.storage, fayl.nom)
+        for nom in yetim_fayllar:
+            FileSystemStorage.delete(self.storage, nom)
+        self.stdout.write(self.style.SUCCESS("Tozalash yakunlandi"))
+
+    def _upload_papkalari(self):
+        for maydon in MAYDONLAR:
+            yield YotoqxonaAriza._meta.get_field(maydon).upload_to
@@ -0,0 +1,104 @@
+import csv
+import json
+import os
+import time
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.dormitory_app.imports import IMPORTLAR, jadval_qatorlari
+
+
+class Command(BaseCommand):
+    help = (
+        "CSV/XLSX fayldan ommaviy import (ariza, xona, bino, fakultet, viloyat). "
+        "Har bo'lakdan keyin nazorat nuqtasi yoziladi - uzilsa --davom bilan qolgan joydan davom etadi; "
+        "xato qatorlar <fayl>.xatolar.csv ga yoziladi"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('turi', choices=sorted(IMPORTLAR), help="Import qilinadigan ma'lumot turi")
+        parser.add_argument('fayl', help="CSV yoki XLSX fayl (1-qator - ustun nomlari)")
+        parser.add_argument('--bolak', type=int, default=2000, help="Bitta bulk_create dagi qatorlar soni")
+        parser.add_argument('--davom', action='store_true', help="Oldingi nazorat nuqtasidan davom ettirish")
+        parser.add_argument('--xatolar', help="Xatolar hisoboti fayli (default: <fayl>.xatolar.csv)")
+
+    def handle(self, *args, **options):
+        yol = options['fayl']
+        self.verbosity = options['verbosity']
+        if not os.path.exists(yol):
+            raise CommandError(f"Fayl topilmadi: {yol}")
+        self.nuqta_yoli = yol + '.nuqta.json'
+        xatolar_yoli = options['xatolar'] or yol + '.xatolar.csv'
+        # Nazorat nuqtasi faqat aynan shu fayl va tur uchun amal qiladi
+        self.imzo = {
+            'turi': options['turi'],
+            'hajm': os.path.getsize(yol),
+            'ozgargan': int(os.path.getmtime(yol)),
+        }
+
+        boshlash, self.natija = 0, {'yozildi': 0, 'mavjud': 0, 'xato': 0}
+        if options['davom'] and os.path.exists(self.nuqta_yoli):
+            with open(self.nuqta_yoli) as fayl:
+                nuqta = json.load(fayl)
+            if any(nuqta.get(kalit) != qiymat for kalit, qiymat in self.imzo.items()):
+                raise CommandError("Fayl yoki tur nazorat nuqtasidagidan farq qiladi - --davom siz qayta boshlang")
+            boshlash = nuqta['qator']
+            self.natija = nuqta['natija']
+            self.stdout.write(f"{boshlash}-qatordan davom etilmoqda")
+
+        importer = IMPORTLAR[options['turi']]()
+        boshlangan = time.monotonic()
+        with open(xatolar_yoli, 'a' if boshlash else 'w', newline='', encoding='utf-8') as xatolar_fayli:
+            self.xatolar_yozuvchi = csv.writer(xatolar_fayli)
+            self.xatolar_fayli = xatolar_fayli
+            self.sarlavha_yozildi = bool(boshlash)
+            bolak, xatolar, oxirgi = [], [], boshlash
+            for raqam, qator in jadval_qatorlari(yol):
+                if raqam <= boshlash:
+                    continue
+                try:
+                    obyekt = importer.qator(qator)
+                except ValidationError as e:
+                    xatolar.append((raqam, '; '.join(e.messages), qator))
+                else:
+                    if obyekt is None:
+                        self.natija['mavjud'] += 1
+                    else:
+                        bolak.append(obyekt)
+                oxirgi = raqam
+                if len(bolak) >= options['bolak']:
+                    self._saqlash(importer, bolak, xatolar, oxirgi)
+                    bolak, xatolar = [], []
+            self._saqlash(importer, bolak, xatolar, oxirgi)
+
+        os.remove(self.nuqta_yoli)
+        if not self.natija['xato'] and not boshlash:
+            os.remove(xatolar_yoli)
+        sarf = time.monotonic() - boshlangan
+        self.stdout.write(self.style.SUCCESS(
+            f"Yozildi: {self.natija['yozildi']}, mavjud (o'tkazildi): {self.natija['mavjud']}, "
+            f"xato: {self.natija['xato']} ({sarf:.1f} s)"
+        ))
+        if self.natija['xato']:
+            self.stdout.write(self.style.WARNING(f"Xatolar hisoboti: {xatolar_yoli}"))
+
+    def _saqlash(self, importer, bolak, xatolar, oxirgi):
+        """Bo'lakni yozish, so'ng xatolar va nazorat nuqtasini diskka tushirish"""
+        if bolak:
+            importer.yozish(bolak)
+            self.natija['yozildi'] += len(bolak)
+        for raqam, xato, qator in xatolar:
+            if not self.sarlavha_yozildi:
+                self.xatolar_yozuvchi.writerow(['qator', 'xato', *qator])
+                self.sarlavha_yozildi = True
+            self.xatolar_yozuvchi.writerow([raqam, xato, *qator.values()])
+        self.natija['xato'] += len(xatolar)
+        self.xatolar_fayli.flush()
+
+        vaqtinchalik = self.nuqta_yoli + '.tmp'
+        with open(vaqtinchalik, 'w') as fayl:
+            json.dump({**self.imzo, 'qator': oxirgi, 'natija': self.natija}, fayl)
+        os.replace(vaqtinchalik, self.nuqta_yoli)
+        if self.verbosity >= 2:
+            self.stdout.write(f"  {oxirgi}-qatorgacha: yozildi {self.natija['yozildi']}")
@@ -0,0 +1,36 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from apps.dormitory_app.documents import hujjatni_qayta_ishlash
+from apps.dormitory_app.models import YotoqxonaAriza
+
+
+class Command(BaseCommand):
+    help = "Ishlov berilmagan imtiyoz hujjatlarini WebP'ga o'tkazish va miniatyura yaratish"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--oqimlar', type=int, default=4, help="Parallel oqimlar soni")
+        parser.add_argument('--xatolar', action='store_true', help="Avval xato bergan hujjatlarni ham qayta urinish")
+
+    def handle(self, *args, **options):
+        holatlar = ['', 'kutilmoqda'] + (['xato'] if options['xatolar'] else [])
+        idlar = list(
+            YotoqxonaAriza.objects.exclude(imtiyoz_hujjat='').exclude(imtiyoz_hujjat__isnull=True)
+            .filter(hujjat_holati__in=holatlar)
+            .values_list('pk', flat=True)
+        )
+        self.stdout.write(f"{len(idlar)} ta hujjat qayta ishlanadi")
+
+        with ThreadPoolExecutor(max_workers=options['oqimlar']) as pool:
+            natijalar = list(pool.map(self._bajarish, idlar))
+
+        tayyor = sum(1 for natija in natijalar if natija)
+        self.stdout.write(self.style.SUCCESS(f"{tayyor} ta hujjat tayyor, {len(idlar) - tayyor} ta o'tkazib yuborildi"))
+
+    def _bajarish(self, ariza_id):
+        try:
+            return hujjatni_qayta_ishlash(ariza_id)
+        finally:
+            connection.close()
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+
+from apps.dormitory_app.models import ArxivAriza, YotoqxonaAriza, joriy_oquv_yili
+
+
+class Command(BaseCommand):
+    help = (
+        "Tugagan o'quv yillari arizalarini arxivga ko'chirish: egallangan o'rinlar bo'shatiladi, "
+        "joriy jadvalda faqat joriy mavsum qoladi. Qayta ishga tushirish xavfsiz"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'yillar', nargs='*',
+            help="O'quv yillari, masalan 2024-2025 (bo'sh bo'lsa - joriydan oldingi barcha yillar)"
+        )
+        parser.add_argument('--bolak', type=int, default=1000, help="Bitta tranzaksiyadagi arizalar soni")
+        parser.add_argument('--quruq', action='store_true', help="Faqat yillar bo'yicha sonlarni ko'rsatish")
+
+    def handle(self, *args, **options):
+        joriy = joriy_oquv_yili()
+        if joriy in options['yillar']:
+            raise CommandError(f"Joriy o'quv yili ({joriy}) arxivlanmaydi")
+
+        yillar = YotoqxonaAriza.objects.filter(oquv_yili__lt=joriy)
+        if options['yillar']:
+            yillar = yillar.filter(oquv_yili__in=options['yillar'])
+        sonlar = dict(yillar.order_by('oquv_yili').values_list('oquv_yili').annotate(soni=Count('pk')))
+        if not sonlar:
+            self.stdout.write(self.style.SUCCESS("Arxivlanadigan arizalar yo'q"))
+            return
+
+        for oquv_yili, soni in sonlar.items():
+            self.stdout.write(f"{oquv_yili}: {soni} ta ariza")
+        if options['quruq']:
+            return
+
+        jami = ArxivAriza.arxivlash(list(sonlar), bolak=options['bolak'])
+        self.stdout.write(self.style.SUCCESS(f"Jami {jami} ta ariza arxivga ko'chirildi"))
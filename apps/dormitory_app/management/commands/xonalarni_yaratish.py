@@ -0,0 +1,47 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.dormitory_app.models import YotoqxonaBino
+
+
+class Command(BaseCommand):
+    help = (
+        "Bino tuzilmasi (qavatlar x har qavatdagi xonalar), raqam shabloni va qavat sozlamalari "
+        "bo'yicha yetishmayotgan xonalarni yaratish. Qayta ishga tushirish xavfsiz"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('binolar', nargs='*', type=int, help="Bino raqamlari (bo'sh bo'lsa - barcha faol binolar)")
+        parser.add_argument('--quruq', action='store_true', help="Faqat reja va haqiqiy xonalar farqini ko'rsatish")
+
+    def handle(self, *args, **options):
+        binolar = YotoqxonaBino.objects.prefetch_related('qavat_sozlamalari').order_by('raqam')
+        if options['binolar']:
+            binolar = binolar.filter(raqam__in=options['binolar'])
+            topilmadi = set(options['binolar']) - {bino.raqam for bino in binolar}
+            if topilmadi:
+                raise CommandError(f"Bino topilmadi: {', '.join(map(str, sorted(topilmadi)))}")
+        else:
+            binolar = binolar.filter(faol=True)
+
+        jami = 0
+        for bino in binolar:
+            try:
+                bino.clean()
+            except ValidationError as e:
+                self.stdout.write(self.style.ERROR(f"{bino.raqam}-bino: {'; '.join(e.messages)}"))
+                continue
+            if options['quruq']:
+                mavjud = set(bino.xonalar.values_list('raqam', flat=True))
+                yetishmaydi = sum(1 for xona in bino.xonalar_rejasi() if xona.raqam not in mavjud)
+                self.stdout.write(
+                    f"{bino.raqam}-bino: reja {bino.rejadagi_xonalar}, mavjud {len(mavjud)}, "
+                    f"yaratiladi {yetishmaydi}"
+                )
+                continue
+            soni = bino.xonalarni_yaratish()
+            jami += soni
+            self.stdout.write(f"{bino.raqam}-bino: {soni} ta xona yaratildi")
+
+        if not options['quruq']:
+            self.stdout.write(self.style.SUCCESS(f"Jami {jami} ta xona yaratildi"))
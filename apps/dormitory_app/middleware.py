@@ -0,0 +1,268 @@
+import mimetypes
+import os
+import re
+import stat
+from urllib.parse import urlparse
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_http_date_safe
+
+
+# ManifestStaticFilesStorage nomlari: app.3f2a9c81b0d4.css
+XESHLANGAN_NOM = re.compile(r'\.[0-9a-f]{12}\.[A-Za-z0-9]+$')
+
+# Oldindan siqilgan variantlar (afzallik tartibida)
+SIQILGAN_VARIANTLAR = (('br', '.br'), ('gzip', '.gz'))
+
+BOLAK_HAJMI = 64 * 1024
+BIR_YIL = 365 * 24 * 60 * 60
+
+RANGE_REGEX = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def _url_yoli(url):
+    """STATIC_URL/MEDIA_URL ning yo'l qismi (boshqa domen bo'lsa None)"""
+    if not url:
+        return None
+    qismlar = urlparse(url)
+    if qismlar.netloc:
+        return None
+    return qismlar.path if qismlar.path.endswith('/') else qismlar.path + '/'
+
+
+def _qabul_qilinadi(accept_encoding, kodlash):
+    """Accept-Encoding sarlavhasida kodlash ruxsat etilganmi (q=0 rad etadi)"""
+    for qism in accept_encoding.split(','):
+        nomi, _, parametrlar = qism.strip().partition(';')
+        if nomi.strip().lower() == kodlash:
+            return parametrlar.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000')
+    return False
+
+
+def _oraliq(range_sarlavha, hajm):
+    """
+    Bitta bayt oralig'ini ajratish: (boshi, oxiri), qanoatlantirib bo'lmasa False,
+    tushunilmasa None (butun fayl beriladi).
+    """
+    moslik = RANGE_REGEX.match(range_sarlavha.strip())
+    if not moslik:
+        return None
+    boshi, oxiri = moslik.groups()
+    if not boshi and not oxiri:
+        return None
+    if not boshi:
+        uzunlik = int(oxiri)
+        if uzunlik == 0:
+            return False
+        return max(hajm - uzunlik, 0), hajm - 1
+    boshi = int(boshi)
+    oxiri = min(int(oxiri), hajm - 1) if oxiri else hajm - 1
+    if boshi >= hajm or boshi > oxiri:
+        return False
+    return boshi, oxiri
+
+
+def _fayl_bolaklari(yol, boshi, uzunlik):
+    with open(yol, 'rb') as fayl:
+        fayl.seek(boshi)
+        while uzunlik > 0:
+            bolak = fayl.read(min(BOLAK_HAJMI, uzunlik))
+            if not bolak:
+                break
+            uzunlik -= len(bolak)
+            yield bolak
+
+
+async def _async_fayl_bolaklari(yol, boshi, uzunlik):
+    fayl = await sync_to_async(open, thread_sensitive=False)(yol, 'rb')
+    try:
+        await sync_to_async(fayl.seek, thread_sensitive=False)(boshi)
+        while uzunlik > 0:
+            bolak = await sync_to_async(fayl.read, thread_sensitive=False)(min(BOLAK_HAJMI, uzunlik))
+            if not bolak:
+                break
+            uzunlik -= len(bolak)
+            yield bolak
+    finally:
+        fayl.close()
+
+
+class StatikFayllarMiddleware:
+    """
+    STATIC_ROOT va MEDIA_ROOT fayllarini ilova ichida berish (WSGI va ASGI).
+
+    MEDIA_ROOT dan faqat OMMAVIY_MEDIA_PAPKALARI dagi papkalar beriladi - shaxsiy fayllar
+    (imtiyoz hujjatlari, eksportlar) MAXFIY_MEDIA_ROOT da va faqat admin orqali.
+
+    - statik fayllar uchun oldindan siqilgan .br/.gz variantlar (collectstatic yaratadi);
+    - ETag/Last-Modified bilan 304, bitta oraliqli Range so'rovlari (206);
+    - xeshlangan nomlarga bir yillik immutable kesh;
+    - to'liq fayl WSGI'da FileResponse orqali - server wsgi.file_wrapper bilan sendfile ishlatadi.
+    Fayl topilmasa so'rov keyingi qatlamga o'tadi.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.ildizlar = []
+        self.ommaviy_papkalar = {papka.strip('/') for papka in settings.OMMAVIY_MEDIA_PAPKALARI}
+        for url, ildiz, turi in (
+            (settings.STATIC_URL, settings.STATIC_ROOT, 'static'),
+            (settings.MEDIA_URL, settings.MEDIA_ROOT, 'media'),
+        ):
+            prefiks = _url_yoli(url)
+            if prefiks and ildiz:
+                self.ildizlar.append((prefiks, os.path.abspath(ildiz), turi))
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        tayyor = self._tayyorlash(request)
+        if tayyor is None:
+            return self.get_response(request)
+        if isinstance(tayyor, HttpResponse):
+            return tayyor
+        status, sarlavhalar, yol, boshi, uzunlik, content_type = tayyor
+        if status == 200:
+            # To'liq fayl: WSGI server wsgi.file_wrapper (sendfile) bilan yuboradi
+            response = FileResponse(open(yol, 'rb'), content_type=content_type)
+        else:
+            response = StreamingHttpResponse(_fayl_bolaklari(yol, boshi, uzunlik), content_type=content_type)
+        return self._sarlavhalar(response, status, sarlavhalar, uzunlik)
+
+    async def __acall__(self, request):
+        tayyor = await sync_to_async(self._tayyorlash, thread_sensitive=False)(request)
+        if tayyor is None:
+            return await self.get_response(request)
+        if isinstance(tayyor, HttpResponse):
+            return tayyor
+        status, sarlavhalar, yol, boshi, uzunlik, content_type = tayyor
+        response = StreamingHttpResponse(
+            _async_fayl_bolaklari(yol, boshi, uzunlik), content_type=content_type
+        )
+        return self._sarlavhalar(response, status, sarlavhalar, uzunlik)
+
+    @staticmethod
+    def _sarlavhalar(response, status, sarlavhalar, uzunlik):
+        response.status_code = status
+        for nomi, qiymat in sarlavhalar.items():
+            response[nomi] = qiymat
+        response['Content-Length'] = str(uzunlik)
+        return response
+
+    def _fayl_yoli(self, yol):
+        for prefiks, ildiz, turi in self.ildizlar:
+            if yol.startswith(prefiks):
+                nisbiy = yol[len(prefiks):]
+                if not nisbiy or nisbiy.endswith('/'):
+                    return None
+                try:
+                    toliq = safe_join(ildiz, nisbiy)
+                except SuspiciousFileOperation:
+                    return None
+                # '..' bilan ochiq papkadan chiqib ketmaslik uchun normallashgan yo'l tekshiriladi
+                if turi == 'media' and os.path.relpath(toliq, ildiz).split(os.sep)[0] not in self.ommaviy_papkalar:
+                    return None
+                return toliq, turi
+        return None
+
+    def _kesh_sarlavhasi(self, yol, turi):
+        if turi == 'media':
+            # Arizachilar hujjatlari - umumiy keshlarda saqlanmaydi
+            return 'private, no-cache'
+        if XESHLANGAN_NOM.search(yol):
+            return f'public, max-age={BIR_YIL}, immutable'
+        return 'public, max-age=300'
+
+    def _tayyorlash(self, request):
+        """
+        Javob uchun ma'lumot: None (fayl emas), tayyor HttpResponse (304/416/HEAD)
+        yoki (status, sarlavhalar, yo'l, boshi, uzunlik, content_type).
+        """
+        if request.method not in ('GET', 'HEAD') or not self.ildizlar:
+            return None
+        topildi = self._fayl_yoli(request.path)
+        if topildi is None:
+            return None
+        yol, turi = topildi
+        try:
+            st = os.stat(yol)
+        except OSError:
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+
+        content_type = mimetypes.guess_type(yol)[0] or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type in ('application/javascript', 'application/json'):
+            content_type += '; charset=utf-8'
+
+        sarlavhalar = {
+            'Cache-Control': self._kesh_sarlavhasi(yol, turi),
+            'Accept-Ranges': 'bytes',
+        }
+        range_sarlavha = request.headers.get('Range')
+        kodlash = None
+        if turi == 'static':
+            sarlavhalar['Vary'] = 'Accept-Encoding'
+            # Oraliq so'rovlari siqilmagan fayldan beriladi
+            if not range_sarlavha:
+                accept_encoding = request.headers.get('Accept-Encoding', '')
+                for nomi, kengaytma in SIQILGAN_VARIANTLAR:
+                    if _qabul_qilinadi(accept_encoding, nomi):
+                        try:
+                            variant = os.stat(yol + kengaytma)
+                        except OSError:
+                            continue
+                        yol, st, kodlash = yol + kengaytma, variant, nomi
+                        break
+        if kodlash:
+            sarlavhalar['Content-Encoding'] = kodlash
+
+        etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}{"-" + kodlash if kodlash else ""}"'
+        sarlavhalar['ETag'] = etag
+        sarlavhalar['Last-Modified'] = http_date(st.st_mtime)
+
+        # Shartli so'rovlar
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match:
+            teglar = [teg.strip().removeprefix('W/') for teg in if_none_match.split(',')]
+            if '*' in teglar or etag in teglar:
+                return self._ozgarmagan(sarlavhalar)
+        else:
+            if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+            if if_modified_since is not None and int(st.st_mtime) <= if_modified_since:
+                return self._ozgarmagan(sarlavhalar)
+
+        hajm = st.st_size
+        status, boshi, uzunlik = 200, 0, hajm
+        if_range = request.headers.get('If-Range')
+        if range_sarlavha and (not if_range or if_range.strip() == etag):
+            oraliq = _oraliq(range_sarlavha, hajm)
+            if oraliq is False:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{hajm}'
+                return response
+            if oraliq:
+                boshi, oxiri = oraliq
+                status, uzunlik = 206, oxiri - boshi + 1
+                sarlavhalar['Content-Range'] = f'bytes {boshi}-{oxiri}/{hajm}'
+
+        if request.method == 'HEAD':
+            response = HttpResponse(status=status, content_type=content_type)
+            return self._sarlavhalar(response, status, sarlavhalar, uzunlik)
+        return status, sarlavhalar, yol, boshi, uzunlik, content_type
+
+    @staticmethod
+    def _ozgarmagan(sarlavhalar):
+        response = HttpResponseNotModified()
+        for nomi in ('ETag', 'Last-Modified', 'Cache-Control', 'Vary'):
+            if nomi in sarlavhalar:
+                response[nomi] = sarlavhalar[nomi]
+        return response
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.5 on 2026-10-18 00:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def xulosalarni_toldirish(apps, schema_editor):
+    YotoqxonaBino = apps.get_model('dormitory_app', 'YotoqxonaBino')
+    BinoXulosasi = apps.get_model('dormitory_app', 'BinoXulosasi')
+    binolar = YotoqxonaBino.objects.annotate(
+        xonalar_soni=Count('xonalar'),
+        band_xonalar=Count('xonalar', filter=Q(xonalar__band_orinlar__gt=0)),
+        bosh_xonalar=Count('xonalar', filter=Q(xonalar__band_orinlar=0)),
+        jami_orinlar=Sum('xonalar__sig_imi'),
+        band_orinlar=Sum('xonalar__band_orinlar'),
+    )
+    BinoXulosasi.objects.bulk_create([
+        BinoXulosasi(
+            bino_id=bino.pk,
+            xonalar_soni=bino.xonalar_soni,
+            band_xonalar=bino.band_xonalar,
+            bosh_xonalar=bino.bosh_xonalar,
+            jami_orinlar=bino.jami_orinlar or 0,
+            band_orinlar=bino.band_orinlar or 0,
+        )
+        for bino in binolar
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dormitory_app', '0002_alter_xona_sig_imi_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BinoXulosasi',
+            fields=[
+                ('bino', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='xulosa', serialize=False, to='dormitory_app.yotoqxonabino')),
+                ('xonalar_soni', models.IntegerField(default=0, verbose_name='Xonalar')),
+                ('band_xonalar', models.IntegerField(default=0, verbose_name='Band xonalar')),
+                ('bosh_xonalar', models.IntegerField(default=0, verbose_name="Bo'sh xonalar")),
+                ('jami_orinlar', models.IntegerField(default=0, verbose_name="Jami o'rinlar")),
+                ('band_orinlar', models.IntegerField(default=0, verbose_name="Band o'rinlar")),
+                ('yangilangan_sana', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Bino xulosasi',
+                'verbose_name_plural': 'Binolar xulosasi',
+            },
+        ),
+        migrations.RunPython(xulosalarni_toldirish, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.5 on 2026-10-18 00:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dormitory_app', '0003_bino_xulosasi'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EksportVazifasi',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('format', models.CharField(choices=[('csv', 'CSV'), ('xlsx', 'Excel (XLSX)')], default='csv', max_length=4, verbose_name='Format')),
+                ('holat', models.CharField(choices=[('kutilmoqda', '⏳ Navbatda'), ('bajarilmoqda', '⚙️ Bajarilmoqda'), ('tayyor', '✅ Tayyor'), ('xato', '❌ Xato')], default='kutilmoqda', max_length=15, verbose_name='Holat')),
+                ('filtrlar', models.TextField(blank=True, verbose_name='Filtrlar')),
+                ('tanlangan', models.JSONField(blank=True, null=True, verbose_name='Tanlangan arizalar')),
+                ('jami', models.IntegerField(default=0, verbose_name='Jami qatorlar')),
+                ('bajarildi', models.IntegerField(default=0, verbose_name='Yozilgan qatorlar')),
+                ('fayl', models.FileField(blank=True, upload_to='eksport/%Y/%m/', verbose_name='Fayl')),
+                ('xato_matni', models.TextField(blank=True, verbose_name='Xato')),
+                ('yaratilgan_sana', models.DateTimeField(auto_now_add=True, verbose_name='Yaratilgan')),
+                ('boshlangan_sana', models.DateTimeField(blank=True, null=True, verbose_name='Boshlangan')),
+                ('yakunlangan_sana', models.DateTimeField(blank=True, null=True, verbose_name='Yakunlangan')),
+                ('yaratuvchi', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Yaratuvchi')),
+            ],
+            options={
+                'verbose_name': 'Eksport vazifasi',
+                'verbose_name_plural': 'Eksport vazifalari',
+                'ordering': ['-yaratilgan_sana'],
+                'indexes': [models.Index(fields=['holat', 'yaratilgan_sana'], name='dormitory_a_holat_7acf7c_idx')],
+            },
+        ),
+    ]
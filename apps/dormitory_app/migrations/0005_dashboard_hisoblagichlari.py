@@ -0,0 +1,72 @@
+# Generated by Django 5.2.5 on 2026-10-18 00:50
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def hisoblagichlarni_toldirish(apps, schema_editor):
+    YotoqxonaAriza = apps.get_model('dormitory_app', 'YotoqxonaAriza')
+    ArizaHisoblagichi = apps.get_model('dormitory_app', 'ArizaHisoblagichi')
+    KunlikArizaStatistikasi = apps.get_model('dormitory_app', 'KunlikArizaStatistikasi')
+
+    ArizaHisoblagichi.objects.bulk_create([
+        ArizaHisoblagichi(oquv_yili=qator['oquv_yili'], holat=qator['holat'], soni=qator['soni'])
+        for qator in YotoqxonaAriza.objects.order_by()
+        .values('oquv_yili', 'holat').annotate(soni=Count('id'))
+    ])
+
+    kunlar = {}
+    for qator in (
+        YotoqxonaAriza.objects.order_by()
+        .annotate(kun=TruncDate('ariza_sanasi'))
+        .values('kun').annotate(soni=Count('id'))
+    ):
+        kunlar.setdefault(qator['kun'], KunlikArizaStatistikasi(sana=qator['kun'])).yuborilgan = qator['soni']
+    for qator in (
+        YotoqxonaAriza.objects.order_by()
+        .filter(holat='tasdiqlandi', tasdiqlangan_sana__isnull=False)
+        .annotate(kun=TruncDate('tasdiqlangan_sana'))
+        .values('kun').annotate(soni=Count('id'))
+    ):
+        kunlar.setdefault(qator['kun'], KunlikArizaStatistikasi(sana=qator['kun'])).tasdiqlangan = qator['soni']
+    KunlikArizaStatistikasi.objects.bulk_create(kunlar.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dormitory_app', '0004_eksport_vazifasi'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KunlikArizaStatistikasi',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sana', models.DateField(unique=True, verbose_name='Sana')),
+                ('yuborilgan', models.IntegerField(default=0, verbose_name='Yuborilgan')),
+                ('tasdiqlangan', models.IntegerField(default=0, verbose_name='Tasdiqlangan')),
+            ],
+            options={
+                'verbose_name': 'Kunlik statistika',
+                'verbose_name_plural': 'Kunlik statistika',
+                'ordering': ['-sana'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArizaHisoblagichi',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('oquv_yili', models.CharField(max_length=9, verbose_name="O'quv yili")),
+                ('holat', models.CharField(choices=[('yangi', '📝 Yangi'), ('korilmoqda', "👀 Ko'rib chiqilmoqda"), ('imtixon', '📋 Imtixon kutilmoqda'), ('tasdiqlandi', '✅ Tasdiqlandi'), ('rad_etildi', '❌ Rad etildi'), ('bekor', '🚫 Bekor qilindi')], max_length=20, verbose_name='Holat')),
+                ('soni', models.IntegerField(default=0, verbose_name='Soni')),
+            ],
+            options={
+                'verbose_name': 'Arizalar hisoblagichi',
+                'verbose_name_plural': 'Arizalar hisoblagichlari',
+                'unique_together': {('oquv_yili', 'holat')},
+            },
+        ),
+        migrations.RunPython(hisoblagichlarni_toldirish, migrations.RunPython.noop),
+    ]
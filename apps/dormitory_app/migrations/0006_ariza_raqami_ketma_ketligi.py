@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-18 00:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dormitory_app', '0005_dashboard_hisoblagichlari'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArizaRaqamiKetmaKetligi',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('yil', models.IntegerField(unique=True, verbose_name='Yil')),
+                ('oxirgi_raqam', models.BigIntegerField(default=0, verbose_name='Oxirgi berilgan raqam')),
+            ],
+            options={
+                'verbose_name': 'Ariza raqamlari ketma-ketligi',
+                'verbose_name_plural': 'Ariza raqamlari ketma-ketliklari',
+            },
+        ),
+    ]
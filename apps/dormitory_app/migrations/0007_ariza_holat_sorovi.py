@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-18 00:54
+
+from django.db import migrations, models
+from django.db.models import F
+from django.db.models.functions import Coalesce
+
+
+def yangilangan_sanani_toldirish(apps, schema_editor):
+    """Mavjud arizalar uchun oxirgi o'zgarish - tasdiqlangan yoki ariza sanasi"""
+    YotoqxonaAriza = apps.get_model('dormitory_app', 'YotoqxonaAriza')
+    YotoqxonaAriza.objects.update(yangilangan_sana=Coalesce(F('tasdiqlangan_sana'), F('ariza_sanasi')))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dormitory_app', '0006_ariza_raqami_ketma_ketligi'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='yotoqxonaariza',
+            name='yangilangan_sana',
+            field=models.DateTimeField(auto_now=True, verbose_name='Yangilangan sana'),
+        ),
+        migrations.RunPython(yangilangan_sanani_toldirish, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='yotoqxonaariza',
+            index=models.Index(fields=['ariza_raqami', 'telefon', 'holat', 'yangilangan_sana'], name='ariza_holat_sorovi_idx'),
+        ),
+    ]
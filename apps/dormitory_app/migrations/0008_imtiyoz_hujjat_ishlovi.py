@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-18 01:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dormitory_app', '0007_ariza_holat_sorovi'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='yotoqxonaariza',
+            name='hujjat_holati',
+            field=models.CharField(blank=True, choices=[('kutilmoqda', 'Ishlov kutilmoqda'), ('tayyor', 'Tayyor'), ('xato', 'Xato')], editable=False, max_length=20, verbose_name='Hujjat ishlovi'),
+        ),
+        migrations.AddField(
+            model_name='yotoqxonaariza',
+            name='imtiyoz_miniatyura',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='imtiyoz/miniatyura/%Y/%m/', verbose_name='Hujjat miniatyurasi'),
+        ),
+    ]
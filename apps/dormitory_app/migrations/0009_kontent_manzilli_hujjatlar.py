@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-18 01:04
+
+import apps.dormitory_app.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dormitory_app', '0008_imtiyoz_hujjat_ishlovi'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SaqlanganFayl',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nom', models.CharField(max_length=255, unique=True, verbose_name='Fayl nomi')),
+                ('hajm', models.BigIntegerField(default=0, verbose_name='Hajmi (bayt)')),
+                ('havolalar', models.PositiveIntegerField(default=0, verbose_name='Havolalar soni')),
+                ('yaratilgan_sana', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Saqlangan fayl',
+                'verbose_name_plural': 'Saqlangan fayllar',
+            },
+        ),
+        migrations.AlterField(
+            model_name='yotoqxonaariza',
+            name='imtiyoz_hujjat',
+            field=models.FileField(blank=True, null=True, storage=apps.dormitory_app.storage.hujjat_storage, upload_to='imtiyoz/%Y/%m/', verbose_name='Imtiyoz hujjati (PDF/rasm)'),
+        ),
+        migrations.AlterField(
+            model_name='yotoqxonaariza',
+            name='imtiyoz_miniatyura',
+            field=models.ImageField(blank=True, editable=False, null=True, storage=apps.dormitory_app.storage.hujjat_storage, upload_to='imtiyoz/miniatyura/%Y/%m/', verbose_name='Hujjat miniatyurasi'),
+        ),
+    ]
@@ -0,0 +1,117 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:12
+
+import re
+
+from django.db import migrations, models
+
+
+# Migratsiya ilova kodiga (search.py) bog'lanmaydi - normallashtirish shu yerda muzlatilgan nusxa
+_KIRILL_LOTIN = str.maketrans({
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'ғ': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo',
+    'ж': 'j', 'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'қ': 'q', 'л': 'l', 'м': 'm',
+    'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u', 'ў': 'o',
+    'ф': 'f', 'х': 'x', 'ҳ': 'h', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'sh', 'ъ': '',
+    'ь': '', 'ы': 'i', 'э': 'e', 'ю': 'yu', 'я': 'ya',
+})
+_TUTUQLAR = re.compile(r"['`ʻʼ‘’]")
+_HARF_RAQAM_EMAS = re.compile(r'[^a-z0-9]+')
+
+FTS_JADVALI = 'dormitory_ariza_fts'
+ARIZA_JADVALI = 'dormitory_app_yotoqxonaariza'
+
+
+def normallashtirish(matn):
+    matn = _TUTUQLAR.sub('', (matn or '').lower().translate(_KIRILL_LOTIN))
+    return _HARF_RAQAM_EMAS.sub(' ', matn).strip()
+
+
+def telefon_raqamlari(telefon):
+    raqamlar = re.sub(r'\D', '', telefon or '')
+    if len(raqamlar) == 12 and raqamlar.startswith('998'):
+        return raqamlar[3:]
+    return raqamlar
+
+
+def qidiruv_ustunlarini_toldirish(apps, schema_editor):
+    YotoqxonaAriza = apps.get_model('dormitory_app', 'YotoqxonaAriza')
+    arizalar = []
+    for ariza in YotoqxonaAriza.objects.only('pk', 'fish', 'telefon').iterator(chunk_size=2000):
+        ariza.fish_qidiruv = normallashtirish(ariza.fish)
+        ariza.telefon_qidiruv = telefon_raqamlari(ariza.telefon)
+        arizalar.append(ariza)
+        if len(arizalar) >= 2000:
+            YotoqxonaAriza.objects.bulk_update(arizalar, ['fish_qidiruv', 'telefon_qidiruv'])
+            arizalar = []
+    YotoqxonaAriza.objects.bulk_update(arizalar, ['fish_qidiruv', 'telefon_qidiruv'])
+
+
+def fish_indeksini_yaratish(apps, schema_editor):
+    """PostgreSQL - pg_trgm GIN indeksi, SQLite - FTS5 trigram jadvali va triggerlari"""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS ariza_fish_qidiruv_trgm_idx '
+            'ON dormitory_app_yotoqxonaariza USING gin (fish_qidiruv gin_trgm_ops)'
+        )
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_JADVALI} USING fts5("
+            f"fish_qidiruv, content='{ARIZA_JADVALI}', content_rowid='id', tokenize='trigram')"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {FTS_JADVALI}_ai AFTER INSERT ON {ARIZA_JADVALI} BEGIN "
+            f"INSERT INTO {FTS_JADVALI}(rowid, fish_qidiruv) VALUES (new.id, new.fish_qidiruv); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {FTS_JADVALI}_ad AFTER DELETE ON {ARIZA_JADVALI} BEGIN "
+            f"INSERT INTO {FTS_JADVALI}({FTS_JADVALI}, rowid, fish_qidiruv) "
+            f"VALUES ('delete', old.id, old.fish_qidiruv); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {FTS_JADVALI}_au AFTER UPDATE OF fish_qidiruv ON {ARIZA_JADVALI} BEGIN "
+            f"INSERT INTO {FTS_JADVALI}({FTS_JADVALI}, rowid, fish_qidiruv) "
+            f"VALUES ('delete', old.id, old.fish_qidiruv); "
+            f"INSERT INTO {FTS_JADVALI}(rowid, fish_qidiruv) VALUES (new.id, new.fish_qidiruv); END"
+        )
+        schema_editor.execute(f"INSERT INTO {FTS_JADVALI}({FTS_JADVALI}) VALUES ('rebuild')")
+
+
+def fish_indeksini_ochirish(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS ariza_fish_qidiruv_trgm_idx')
+    elif vendor == 'sqlite':
+        for nom in ('_ai', '_ad', '_au'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS dormitory_ariza_fts{nom}')
+        schema_editor.execute('DROP TABLE IF EXISTS dormitory_ariza_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dormitory_app', '0009_kontent_manzilli_hujjatlar'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='yotoqxonaariza',
+            name='fish_qidiruv',
+            field=models.CharField(blank=True, editable=False, max_length=300),
+        ),
+        migrations.AddField(
+            model_name='yotoqxonaariza',
+            name='telefon_qidiruv',
+            field=models.CharField(blank=True, editable=False, max_length=9),
+        ),
+        migrations.RunPython(qidiruv_ustunlarini_toldirish, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='yotoqxonaariza',
+            index=models.Index(fields=['telefon_qidiruv'], name='ariza_telefon_qidiruv_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='yotoqxonaariza',
+            index=models.Index(fields=['pasport'], name='ariza_pasport_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.RunPython(fish_indeksini_yaratish, fish_indeksini_ochirish),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-18 01:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dormitory_app', '0010_ariza_qidiruv'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='yotoqxonaariza',
+            index=models.Index(fields=['-ariza_sanasi', '-id'], name='ariza_sana_kursor_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.5 on 2026-10-18 01:19
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dormitory_app', '0011_ariza_kursor_indeksi'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='yotoqxonabino',
+            name='standart_narxi',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True, verbose_name="Standart oylik to'lov"),
+        ),
+        migrations.AddField(
+            model_name='yotoqxonabino',
+            name='standart_sig_imi',
+            field=models.IntegerField(choices=[(2, '2 kishilik'), (3, '3 kishilik'), (4, '4 kishilik'), (5, '5 kishilik'), (6, '6 kishilik')], default=4, verbose_name="Standart sig'im"),
+        ),
+        migrations.AddField(
+            model_name='yotoqxonabino',
+            name='xona_raqam_shabloni',
+            field=models.CharField(default='{qavat}{xona:02d}', help_text='{bino}, {qavat}, {xona} - masalan {qavat}{xona:02d} -> 101, 102, ...', max_length=30, verbose_name='Xona raqami shabloni'),
+        ),
+        migrations.CreateModel(
+            name='QavatSozlamasi',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('qavat', models.IntegerField(validators=[django.core.validators.MinValueValidator(1)], verbose_name='Qavat')),
+                ('sig_imi', models.IntegerField(blank=True, choices=[(2, '2 kishilik'), (3, '3 kishilik'), (4, '4 kishilik'), (5, '5 kishilik'), (6, '6 kishilik')], null=True, verbose_name="Sig'imi")),
+                ('narxi', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True, verbose_name="Oylik to'lov")),
+                ('bino', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='qavat_sozlamalari', to='dormitory_app.yotoqxonabino')),
+            ],
+            options={
+                'verbose_name': 'Qavat sozlamasi',
+                'verbose_name_plural': 'Qavat sozlamalari',
+                'ordering': ['bino', 'qavat'],
+                'unique_together': {('bino', 'qavat')},
+            },
+        ),
+    ]
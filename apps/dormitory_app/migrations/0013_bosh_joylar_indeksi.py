@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-18 01:21
+
+import django.db.models.expressions
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def bino_turini_toldirish(apps, schema_editor):
+    YotoqxonaBino = apps.get_model('dormitory_app', 'YotoqxonaBino')
+    Xona = apps.get_model('dormitory_app', 'Xona')
+    Xona.objects.update(
+        bino_turi=Subquery(YotoqxonaBino.objects.filter(pk=OuterRef('bino_id')).values('turi')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dormitory_app', '0012_xonalarni_yaratish'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='xona',
+            name='bino_turi',
+            field=models.CharField(choices=[('erkak', '🚹 Erkaklar binosi'), ('ayol', '🚺 Ayollar binosi')], default='', editable=False, max_length=10),
+            preserve_default=False,
+        ),
+        migrations.RunPython(bino_turini_toldirish, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='xona',
+            name='bosh_orinlar',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(models.F('sig_imi'), '-', models.F('band_orinlar')), output_field=models.IntegerField(), verbose_name="Bo'sh o'rinlar"),
+        ),
+        migrations.AddIndex(
+            model_name='xona',
+            index=models.Index(condition=models.Q(('bosh_orinlar__gt', 0)), fields=['bino_turi', 'sig_imi', 'konditsioner', 'muzlatgich', 'narxi', 'bino', 'bosh_orinlar'], name='xona_bosh_joylar_idx'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.5 on 2026-10-18 01:25
+
+from django.db import migrations, models
+
+# Oldingi taqsimlash tartibi (imtiyoz turlari ro'yxatdagi tartibda) boshlang'ich qoidalar sifatida
+BOSHLANGICH_IMTIYOZ_BALLARI = [
+    ('1_guruh_nogironlik', 100),
+    ('2_guruh_nogironlik', 90),
+    ('3_guruh_nogironlik', 80),
+    ('yetim', 70),
+    ('bir_ota_ona', 60),
+    ('kam_taminlangan', 50),
+    ('kop_bolali', 40),
+    ('temir_daftar', 30),
+    ('ayollar_daftari', 20),
+    ('yoshlar_daftari', 10),
+]
+
+
+def boshlangich_qoidalar(apps, schema_editor):
+    UstuvorlikMezoni = apps.get_model('dormitory_app', 'UstuvorlikMezoni')
+    YotoqxonaAriza = apps.get_model('dormitory_app', 'YotoqxonaAriza')
+    UstuvorlikMezoni.objects.bulk_create([
+        UstuvorlikMezoni(mezon='imtiyoz_turi', qiymat=kod, ball=ball)
+        for kod, ball in BOSHLANGICH_IMTIYOZ_BALLARI
+    ])
+    YotoqxonaAriza.objects.exclude(imtiyoz_turi='yoq').update(ustuvorlik_bali=models.Case(
+        *[models.When(imtiyoz_turi=kod, then=models.Value(ball)) for kod, ball in BOSHLANGICH_IMTIYOZ_BALLARI],
+        default=models.Value(0),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dormitory_app', '0013_bosh_joylar_indeksi'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UstuvorlikMezoni',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mezon', models.CharField(choices=[('imtiyoz_turi', 'Imtiyoz turi (qiymat - imtiyoz kodi)'), ('kurs', 'Kurs (qiymat - kurs raqami)'), ('viloyat', 'Viloyat (qiymat - viloyat nomi)'), ('oila_azolari', "Oila a'zolari (qiymat - kamida shuncha)")], max_length=20, verbose_name='Mezon')),
+                ('qiymat', models.CharField(max_length=100, verbose_name='Qiymat')),
+                ('ball', models.IntegerField(verbose_name='Ball')),
+            ],
+            options={
+                'verbose_name': 'Ustuvorlik mezoni',
+                'verbose_name_plural': 'Ustuvorlik mezonlari',
+                'ordering': ['mezon', '-ball'],
+            },
+        ),
+        migrations.AddField(
+            model_name='yotoqxonaariza',
+            name='ustuvorlik_bali',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Ustuvorlik bali'),
+        ),
+        migrations.AddIndex(
+            model_name='yotoqxonaariza',
+            index=models.Index(fields=['-ustuvorlik_bali', 'ariza_sanasi', 'id'], name='ariza_ustuvorlik_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='ustuvorlikmezoni',
+            unique_together={('mezon', 'qiymat')},
+        ),
+        migrations.RunPython(boshlangich_qoidalar, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.5 on 2026-10-18 01:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dormitory_app', '0014_ustuvorlik_bali'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='arizahisoblagichi',
+            name='holat',
+            field=models.CharField(choices=[('yangi', '📝 Yangi'), ('korilmoqda', "👀 Ko'rib chiqilmoqda"), ('imtixon', '📋 Imtixon kutilmoqda'), ('navbatda', '⏳ Navbatda'), ('tasdiqlandi', '✅ Tasdiqlandi'), ('rad_etildi', '❌ Rad etildi'), ('bekor', '🚫 Bekor qilindi')], max_length=20, verbose_name='Holat'),
+        ),
+        migrations.AlterField(
+            model_name='yotoqxonaariza',
+            name='holat',
+            field=models.CharField(choices=[('yangi', '📝 Yangi'), ('korilmoqda', "👀 Ko'rib chiqilmoqda"), ('imtixon', '📋 Imtixon kutilmoqda'), ('navbatda', '⏳ Navbatda'), ('tasdiqlandi', '✅ Tasdiqlandi'), ('rad_etildi', '❌ Rad etildi'), ('bekor', '🚫 Bekor qilindi')], default='yangi', max_length=20, verbose_name='Holat'),
+        ),
+        migrations.CreateModel(
+            name='NavbatTarixi',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ariza_raqami', models.CharField(max_length=20, verbose_name='Ariza raqami')),
+                ('ustuvorlik_bali', models.IntegerField(verbose_name='Ustuvorlik bali')),
+                ('navbatga_qoshilgan', models.DateTimeField(verbose_name="Navbatga qo'shilgan")),
+                ('sabab', models.CharField(choices=[('bosatildi', "Ariza holati o'zgardi"), ('ochirildi', "Ariza o'chirildi"), ('tozalandi', 'Xona tozalandi'), ('moslashtirildi', 'Bandlik moslashtirildi')], max_length=20, verbose_name='Sabab')),
+                ('sana', models.DateTimeField(auto_now_add=True, verbose_name='Joylashtirilgan')),
+                ('ariza', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='navbat_tarixi', to='dormitory_app.yotoqxonaariza', verbose_name='Ariza')),
+                ('xona', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to='dormitory_app.xona', verbose_name='Xona')),
+            ],
+            options={
+                'verbose_name': 'Navbatdan joylashtirish',
+                'verbose_name_plural': 'Navbatdan joylashtirishlar',
+                'ordering': ['-sana'],
+            },
+        ),
+        migrations.CreateModel(
+            name='NavbatYozuvi',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bino_turi', models.CharField(choices=[('erkak', '🚹 Erkaklar binosi'), ('ayol', '🚺 Ayollar binosi')], max_length=10, verbose_name='Bino turi')),
+                ('sig_imi', models.IntegerField(blank=True, choices=[(2, '2 kishilik'), (3, '3 kishilik'), (4, '4 kishilik'), (5, '5 kishilik'), (6, '6 kishilik')], null=True, verbose_name="Xona sig'imi")),
+                ('ustuvorlik_bali', models.IntegerField(default=0, verbose_name='Ustuvorlik bali')),
+                ('ariza_sanasi', models.DateTimeField(verbose_name='Ariza sanasi')),
+                ('qoshilgan_sana', models.DateTimeField(auto_now_add=True, verbose_name="Navbatga qo'shilgan")),
+                ('ariza', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='navbat', to='dormitory_app.yotoqxonaariza', verbose_name='Ariza')),
+            ],
+            options={
+                'verbose_name': 'Navbat',
+                'verbose_name_plural': 'Kutish navbati',
+                'ordering': ['bino_turi', 'sig_imi', '-ustuvorlik_bali', 'ariza_sanasi', 'id'],
+                'indexes': [models.Index(fields=['bino_turi', 'sig_imi', '-ustuvorlik_bali', 'ariza_sanasi', 'id'], name='navbat_tartibi_idx')],
+            },
+        ),
+    ]
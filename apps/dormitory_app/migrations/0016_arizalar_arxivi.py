@@ -0,0 +1,47 @@
+# Generated by Django 5.2.5 on 2026-10-18 01:32
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dormitory_app', '0015_kutish_navbati'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='navbattarixi',
+            name='sabab',
+            field=models.CharField(choices=[('bosatildi', "Ariza holati o'zgardi"), ('ochirildi', "Ariza o'chirildi"), ('tozalandi', 'Xona tozalandi'), ('moslashtirildi', 'Bandlik moslashtirildi'), ('arxivlandi', "O'quv yili arxivlandi")], max_length=20, verbose_name='Sabab'),
+        ),
+        migrations.CreateModel(
+            name='ArxivAriza',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ariza_raqami', models.CharField(max_length=20, unique=True, verbose_name='Ariza raqami')),
+                ('oquv_yili', models.CharField(max_length=9, verbose_name="O'quv yili")),
+                ('fish', models.CharField(max_length=300, verbose_name="To'liq ism familiya")),
+                ('jinsi', models.CharField(choices=[('erkak', 'Erkak'), ('ayol', 'Ayol')], max_length=10, verbose_name='Jinsi')),
+                ('telefon', models.CharField(max_length=13, verbose_name='Telefon raqami')),
+                ('pasport', models.CharField(max_length=9, verbose_name='Pasport seriya raqami')),
+                ('fakultet', models.CharField(max_length=200, verbose_name='Fakultet')),
+                ('holat', models.CharField(choices=[('yangi', '📝 Yangi'), ('korilmoqda', "👀 Ko'rib chiqilmoqda"), ('imtixon', '📋 Imtixon kutilmoqda'), ('navbatda', '⏳ Navbatda'), ('tasdiqlandi', '✅ Tasdiqlandi'), ('rad_etildi', '❌ Rad etildi'), ('bekor', '🚫 Bekor qilindi')], max_length=20, verbose_name='Holat')),
+                ('xona', models.CharField(blank=True, max_length=100, verbose_name='Tayinlangan xona')),
+                ('ustuvorlik_bali', models.IntegerField(default=0, verbose_name='Ustuvorlik bali')),
+                ('ariza_sanasi', models.DateTimeField(verbose_name='Ariza sanasi')),
+                ('tasdiqlangan_sana', models.DateTimeField(blank=True, null=True, verbose_name='Tasdiqlangan sana')),
+                ('yangilangan_sana', models.DateTimeField(verbose_name='Yangilangan sana')),
+                ('rad_sababi', models.TextField(blank=True, verbose_name='Rad etish sababi')),
+                ('malumotlar', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name="To'liq ma'lumotlar")),
+                ('arxivlangan_sana', models.DateTimeField(auto_now_add=True, verbose_name='Arxivlangan sana')),
+            ],
+            options={
+                'verbose_name': 'Arxiv arizasi',
+                'verbose_name_plural': 'Arxiv arizalari',
+                'ordering': ['-ariza_sanasi'],
+                'indexes': [models.Index(fields=['oquv_yili', 'holat'], name='arxiv_yil_holat_idx')],
+            },
+        ),
+    ]
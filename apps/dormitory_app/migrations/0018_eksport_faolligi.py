@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-18 01:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dormitory_app', '0017_navbat_sababi'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eksportvazifasi',
+            name='faollik_sana',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Oxirgi faollik'),
+        ),
+        migrations.AddField(
+            model_name='eksportvazifasi',
+            name='urinishlar',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Urinishlar'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-18 01:50
+
+import apps.dormitory_app.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dormitory_app', '0018_eksport_faolligi'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='qavatsozlamasi',
+            name='sig_imi',
+            field=models.IntegerField(blank=True, choices=apps.dormitory_app.models.xona_sigimlari, null=True, verbose_name="Sig'imi"),
+        ),
+        migrations.AlterField(
+            model_name='yotoqxonabino',
+            name='standart_sig_imi',
+            field=models.IntegerField(choices=apps.dormitory_app.models.xona_sigimlari, default=4, verbose_name="Standart sig'im"),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 01:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dormitory_app', '0019_xona_sigimlari'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='navbattarixi',
+            name='sabab',
+            field=models.CharField(choices=[('bosatildi', "Ariza holati o'zgardi"), ('ochirildi', "Ariza o'chirildi"), ('moslashtirildi', 'Bandlik moslashtirildi'), ('arxivlandi', "O'quv yili arxivlandi"), ('tozalandi', "Xona bo'shatildi")], max_length=20, verbose_name='Sabab'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-18 01:58
+
+import apps.dormitory_app.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dormitory_app', '0020_navbat_sababi_tozalandi'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='eksportvazifasi',
+            name='fayl',
+            field=models.FileField(blank=True, storage=apps.dormitory_app.storage.maxfiy_storage, upload_to='eksport/%Y/%m/', verbose_name='Fayl'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-18 02:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dormitory_app', '0021_eksport_maxfiy_storage'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='yotoqxonaariza',
+            name='ariza_holat_sorovi_idx',
+        ),
+        migrations.AddIndex(
+            model_name='yotoqxonaariza',
+            index=models.Index(fields=['ariza_raqami'], include=('telefon', 'holat', 'ariza_sanasi', 'tasdiqlangan_sana', 'yangilangan_sana'), name='ariza_holat_sorovi_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-18 02:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dormitory_app', '0022_ariza_holat_qamrovchi_indeks'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='arxivariza',
+            index=models.Index(fields=['telefon'], name='arxiv_telefon_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='arxivariza',
+            index=models.Index(fields=['pasport'], name='arxiv_pasport_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
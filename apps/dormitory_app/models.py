@@ -1,9 +1,34 @@
-from django.db import models
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.cache import cache
+from django.db import IntegrityError, connection, models, transaction
+from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator, RegexValidator
 from django.utils import timezone
-from django.db.models import Sum, Count, Q
-import uuid
-from datetime import date
+from django.db.models import Sum, Count, Q, F, Value
+from django.db.models.functions import Coalesce, Greatest, TruncDate
+import hashlib
+import os
+import threading
+from collections import Counter
+from datetime import date, timedelta
+from functools import partial
+
+from .search import normallashtirish, telefon_raqamlari
+from .storage import hujjat_storage, maxfiy_storage
+
+
+def joriy_oquv_yili():
+    """Joriy o'quv yili (sentyabrdan boshlanadi), masalan 2025-2026"""
+    now = timezone.now()
+    if now.month >= 9:
+        return f"{now.year}-{now.year + 1}"
+    return f"{now.year - 1}-{now.year}"
+
+
+def xona_sigimlari():
+    """Xona sig'imi tanlovlari (Xona.XONA_TURI) - Xona'dan oldin e'lon qilingan modellar uchun"""
+    return Xona.XONA_TURI
 
 
 class Fakultet(models.Model):
@@ -56,6 +81,21 @@ class Viloyat(models.Model):
         return self.nomi
 
 
+class YotoqxonaBinoQuerySet(models.QuerySet):
+    """Binolar bandligi bitta guruhlangan so'rovda"""
+    
+    def bandlik_bilan(self):
+        return self.annotate(
+            xonalar_soni=Count('xonalar'),
+            band_xonalar_soni=Count('xonalar', filter=Q(xonalar__band_orinlar__gt=0)),
+            bosh_xonalar_soni=Count('xonalar', filter=Q(xonalar__band_orinlar=0)),
+            jami_orinlar=Coalesce(Sum('xonalar__sig_imi'), 0),
+            band_orinlar_soni=Coalesce(Sum('xonalar__band_orinlar'), 0),
+        ).annotate(
+            bosh_orinlar_soni=F('jami_orinlar') - F('band_orinlar_soni'),
+        )
+
+
 class YotoqxonaBino(models.Model):
     """Yotoqxona binosi"""
     BINO_TURI = [
@@ -79,9 +119,27 @@ class YotoqxonaBino(models.Model):
     kir_yuvish = models.BooleanField(default=True, verbose_name="Kir yuvish xonasi")
     issiq_suv = models.BooleanField(default=True, verbose_name="Issiq suv")
     
+    # Xonalarni avtomatik yaratish (qavat bo'yicha sozlamalar - QavatSozlamasi)
+    xona_raqam_shabloni = models.CharField(
+        max_length=30,
+        default='{qavat}{xona:02d}',
+        verbose_name="Xona raqami shabloni",
+        help_text="{bino}, {qavat}, {xona} - masalan {qavat}{xona:02d} -> 101, 102, ..."
+    )
+    standart_sig_imi = models.IntegerField(choices=xona_sigimlari, default=4, verbose_name="Standart sig'im")
+    standart_narxi = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        verbose_name="Standart oylik to'lov"
+    )
+    
     faol = models.BooleanField(default=True, verbose_name="Faol")
     yaratilgan_sana = models.DateTimeField(auto_now_add=True)
     
+    objects = YotoqxonaBinoQuerySet.as_manager()
+    
     class Meta:
         verbose_name = "Yotoqxona binosi"
         verbose_name_plural = "Yotoqxona binolari"
@@ -91,21 +149,175 @@ class YotoqxonaBino(models.Model):
         return f"{self.raqam}-bino: {self.nomi}"
     
     @property
-    def umumiy_xonalar(self):
-        """Umumiy xonalar soni"""
+    def rejadagi_xonalar(self):
+        """Tuzilma bo'yicha xonalar soni (qavatlar x har qavatdagi xonalar)"""
         return self.qavatlar_soni * self.har_qavatda_xonalar
     
+    @property
+    def umumiy_xonalar(self):
+        """Haqiqatda mavjud xonalar soni"""
+        if 'xonalar_soni' in self.__dict__:
+            return self.xonalar_soni
+        xulosa = getattr(self, 'xulosa', None)
+        if xulosa is not None:
+            return xulosa.xonalar_soni
+        return self.xonalar.count()
+    
+    def xona_raqami(self, qavat, xona):
+        return self.xona_raqam_shabloni.format(bino=self.raqam, qavat=qavat, xona=xona)
+    
+    def clean(self):
+        super().clean()
+        if not self.qavatlar_soni or not self.har_qavatda_xonalar:
+            return
+        try:
+            raqamlar = [
+                self.xona_raqami(qavat, xona)
+                for qavat in range(1, self.qavatlar_soni + 1)
+                for xona in range(1, self.har_qavatda_xonalar + 1)
+            ]
+        except (KeyError, IndexError, ValueError, AttributeError, TypeError):
+            raise ValidationError({'xona_raqam_shabloni': "Shablonda faqat {bino}, {qavat} va {xona} ishlatiladi"})
+        if max(len(raqam) for raqam in raqamlar) > Xona._meta.get_field('raqam').max_length:
+            raise ValidationError({'xona_raqam_shabloni': "Xona raqami 10 belgidan oshmasligi kerak"})
+        if len(set(raqamlar)) != len(raqamlar):
+            raise ValidationError({'xona_raqam_shabloni': "Shablon bir xil xona raqamlarini beradi"})
+    
+    def xonalar_rejasi(self):
+        """Tuzilma bo'yicha barcha xonalar (saqlanmagan Xona obyektlari)"""
+        sozlamalar = {sozlama.qavat: sozlama for sozlama in self.qavat_sozlamalari.all()}
+        for qavat in range(1, self.qavatlar_soni + 1):
+            sozlama = sozlamalar.get(qavat)
+            sig_imi = sozlama.sig_imi if sozlama and sozlama.sig_imi else self.standart_sig_imi
+            narxi = sozlama.narxi if sozlama and sozlama.narxi is not None else self.standart_narxi
+            for xona in range(1, self.har_qavatda_xonalar + 1):
+                yield Xona(
+                    bino=self, bino_turi=self.turi, raqam=self.xona_raqami(qavat, xona),
+                    qavat=qavat, sig_imi=sig_imi, narxi=narxi,
+                )
+    
+    def xonalarni_yaratish(self):
+        """Rejadagi, lekin hali yo'q xonalarni bitta bulk_create bilan yaratish (qayta chaqirish xavfsiz)"""
+        mavjud = set(self.xonalar.values_list('raqam', flat=True))
+        yangi = [xona for xona in self.xonalar_rejasi() if xona.raqam not in mavjud]
+        with transaction.atomic():
+            # Parallel yaratilgan xonalar unique (bino, raqam) bo'yicha o'tkazib yuboriladi
+            Xona.objects.bulk_create(yangi, ignore_conflicts=True)
+            BinoXulosasi.yangilash(bino_ids=[self.pk])
+        return len(yangi)
+    
     @property
     def band_xonalar(self):
         """Band xonalar soni"""
+        if 'band_xonalar_soni' in self.__dict__:
+            return self.band_xonalar_soni
         return self.xonalar.filter(band_orinlar__gt=0).count()
     
     @property
     def bosh_xonalar(self):
         """To'liq bo'sh xonalar soni"""
+        if 'bosh_xonalar_soni' in self.__dict__:
+            return self.bosh_xonalar_soni
         return self.xonalar.filter(band_orinlar=0).count()
 
 
+class QavatSozlamasi(models.Model):
+    """Xonalarni yaratishda qavat uchun sig'im va narx (bo'sh bo'lsa - bino standarti)"""
+    bino = models.ForeignKey(YotoqxonaBino, on_delete=models.CASCADE, related_name='qavat_sozlamalari')
+    qavat = models.IntegerField(verbose_name="Qavat", validators=[MinValueValidator(1)])
+    sig_imi = models.IntegerField(choices=xona_sigimlari, null=True, blank=True, verbose_name="Sig'imi")
+    narxi = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        verbose_name="Oylik to'lov"
+    )
+    
+    class Meta:
+        verbose_name = "Qavat sozlamasi"
+        verbose_name_plural = "Qavat sozlamalari"
+        unique_together = ['bino', 'qavat']
+        ordering = ['bino', 'qavat']
+    
+    def __str__(self):
+        return f"{self.bino_id}-bino, {self.qavat}-qavat"
+
+
+class BinoXulosasi(models.Model):
+    """Bino bandligi xulosasi - xonalar o'zgarganda shu bino uchun qayta hisoblanadi"""
+    bino = models.OneToOneField(
+        YotoqxonaBino,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='xulosa'
+    )
+    xonalar_soni = models.IntegerField(default=0, verbose_name="Xonalar")
+    band_xonalar = models.IntegerField(default=0, verbose_name="Band xonalar")
+    bosh_xonalar = models.IntegerField(default=0, verbose_name="Bo'sh xonalar")
+    jami_orinlar = models.IntegerField(default=0, verbose_name="Jami o'rinlar")
+    band_orinlar = models.IntegerField(default=0, verbose_name="Band o'rinlar")
+    yangilangan_sana = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Bino xulosasi"
+        verbose_name_plural = "Binolar xulosasi"
+    
+    def __str__(self):
+        return f"{self.bino_id}-bino xulosasi"
+    
+    @property
+    def bosh_orinlar(self):
+        """Bo'sh o'rinlar soni"""
+        return self.jami_orinlar - self.band_orinlar
+    
+    @classmethod
+    def qayta_hisoblash(cls, bino_ids=None, xona_ids=None):
+        """Berilgan binolar (yoki xonalar binolari) xulosasini bitta so'rovda hisoblab yozish"""
+        binolar = YotoqxonaBino.objects.all()
+        if xona_ids is not None:
+            binolar = binolar.filter(pk__in=Xona.objects.filter(pk__in=xona_ids).values('bino_id'))
+        elif bino_ids is not None:
+            binolar = binolar.filter(pk__in=bino_ids)
+        
+        hozir = timezone.now()
+        xulosalar = [
+            cls(
+                bino_id=qator['pk'],
+                xonalar_soni=qator['xonalar_soni'],
+                band_xonalar=qator['band_xonalar_soni'],
+                bosh_xonalar=qator['bosh_xonalar_soni'],
+                jami_orinlar=qator['jami_orinlar'],
+                band_orinlar=qator['band_orinlar_soni'],
+                yangilangan_sana=hozir,
+            )
+            for qator in binolar.bandlik_bilan().values(
+                'pk', 'xonalar_soni', 'band_xonalar_soni', 'bosh_xonalar_soni',
+                'jami_orinlar', 'band_orinlar_soni'
+            )
+        ]
+        cls.objects.bulk_create(
+            xulosalar,
+            update_conflicts=True,
+            unique_fields=['bino'],
+            update_fields=[
+                'xonalar_soni', 'band_xonalar', 'bosh_xonalar',
+                'jami_orinlar', 'band_orinlar', 'yangilangan_sana'
+            ],
+        )
+        bosh_joylar_keshini_tozalash()
+        return len(xulosalar)
+    
+    @classmethod
+    def yangilash(cls, bino_ids=None, xona_ids=None):
+        """Tranzaksiya muvaffaqiyatli yakunlangach xulosani yangilash"""
+        bino_ids = set(bino_ids) if bino_ids is not None else None
+        xona_ids = set(xona_ids) if xona_ids is not None else None
+        if not bino_ids and not xona_ids:
+            return
+        transaction.on_commit(lambda: cls.qayta_hisoblash(bino_ids=bino_ids, xona_ids=xona_ids))
+
+
 class Xona(models.Model):
     """Yotoqxona xonasi"""
     XONA_TURI = [
@@ -121,6 +333,15 @@ class Xona(models.Model):
     qavat = models.IntegerField(verbose_name="Qavat")
     sig_imi = models.IntegerField(choices=XONA_TURI, verbose_name="Sig'imi")
     band_orinlar = models.IntegerField(default=0, verbose_name="Band o'rinlar")
+    # Bazada saqlanadi - F() bilan band qilish/bo'shatishda ham avtomatik yangilanadi
+    bosh_orinlar = models.GeneratedField(
+        expression=F('sig_imi') - F('band_orinlar'),
+        output_field=models.IntegerField(),
+        db_persist=True,
+        verbose_name="Bo'sh o'rinlar",
+    )
+    # Bo'sh joylar indeksi uchun bino turi nusxasi (bino saqlanganda yangilanadi)
+    bino_turi = models.CharField(max_length=10, choices=YotoqxonaBino.BINO_TURI, editable=False)
     
     # Qulayliklar
     konditsioner = models.BooleanField(default=False, verbose_name="Konditsioner")
@@ -139,15 +360,115 @@ class Xona(models.Model):
         verbose_name_plural = "Xonalar"
         unique_together = ['bino', 'raqam']
         ordering = ['bino', 'qavat', 'raqam']
+        indexes = [
+            # Faqat bo'sh joyi bor xonalar - to'la xonalar soni indeks hajmiga ta'sir qilmaydi
+            models.Index(
+                fields=['bino_turi', 'sig_imi', 'konditsioner', 'muzlatgich', 'narxi', 'bino', 'bosh_orinlar'],
+                condition=Q(bosh_orinlar__gt=0),
+                name='xona_bosh_joylar_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.bino.raqam}-bino, {self.raqam}-xona"
     
-    @property
-    def bosh_orinlar(self):
-        """Bo'sh o'rinlar soni"""
-        return self.sig_imi - self.band_orinlar
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'bino' in update_fields:
+            self.bino_turi = self.bino.turi
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'bino_turi'}
+        super().save(*args, **kwargs)
     
+    @classmethod
+    def orin_band_qilish(cls, xona_id):
+        """Bo'sh joy bo'lsa band o'rinni bazada atomik oshirish"""
+        yangilandi = cls.objects.filter(
+            pk=xona_id, band_orinlar__lt=F('sig_imi')
+        ).update(band_orinlar=F('band_orinlar') + 1) == 1
+        if yangilandi:
+            BinoXulosasi.yangilash(xona_ids=[xona_id])
+        return yangilandi
+    
+    @classmethod
+    def orin_bosatish(cls, xona_id, soni=1):
+        """Band o'rinlarni bazada atomik kamaytirish (0 dan pastga tushmaydi)"""
+        yangilandi = cls.objects.filter(pk=xona_id, band_orinlar__gt=0).update(
+            band_orinlar=Greatest(F('band_orinlar') - soni, Value(0))
+        ) == 1
+        if yangilandi:
+            BinoXulosasi.yangilash(xona_ids=[xona_id])
+        return yangilandi
+
+    @classmethod
+    def xonalarni_bosatish(cls, xonalar):
+        """
+        Xonalarni butunlay bo'shatish: tasdiqlangan yashovchilar xonadan chiqariladi (holati
+        o'zgarmaydi), band_orinlar qayta hisoblanadi va bo'shagan o'rinlar shu tranzaksiyada
+        navbatdagilarga beriladi. Natija - (chiqarilgan arizalar soni, joylashtirilganlar).
+        """
+        with transaction.atomic():
+            xona_ids = list(
+                xonalar.select_for_update(of=('self',)).order_by('pk').values_list('pk', flat=True)
+            )
+            yashovchilar = YotoqxonaAriza.objects.filter(holat='tasdiqlandi', tayinlangan_xona__in=xona_ids)
+            ariza_holati_keshini_tozalash(yashovchilar.values_list('ariza_raqami', flat=True))
+            chiqarildi = yashovchilar.update(tayinlangan_xona=None, yangilangan_sana=timezone.now())
+            # Xonada tasdiqlangan ariza qolmadi - haqiqiy bandlik 0
+            cls.objects.filter(pk__in=xona_ids).update(band_orinlar=0)
+            BinoXulosasi.yangilash(xona_ids=xona_ids)
+            joylashtirildi = NavbatYozuvi.orinlarni_toldirish(xona_ids, sabab='tozalandi')
+        return chiqarildi, joylashtirildi
+
+    @classmethod
+    def bandlikni_moslashtirish(cls, xonalar=None, bolak=2000, quruq=False):
+        """
+        band_orinlar ni tasdiqlangan arizalar soniga tenglashtirish.
+
+        Xonalar pk tartibida bo'laklab qulflanadi, har bo'lak uchun haqiqiy bandlik bitta
+        GROUP BY bilan olinadi va farq qilganlari bulk_update bilan yoziladi.
+        Natija - farqlar ro'yxati: (xona, saqlangan qiymat, haqiqiy qiymat).
+        """
+        xonalar = cls.objects.all() if xonalar is None else xonalar
+        farqlar = []
+        oxirgi_pk = 0
+        while True:
+            with transaction.atomic():
+                qism = list(
+                    xonalar.select_for_update(of=('self',))
+                    .select_related('bino')
+                    .filter(pk__gt=oxirgi_pk)
+                    .order_by('pk')[:bolak]
+                )
+                if not qism:
+                    break
+                oxirgi_pk = qism[-1].pk
+                haqiqiy = dict(
+                    YotoqxonaAriza.objects.filter(
+                        holat='tasdiqlandi',
+                        tayinlangan_xona__gte=qism[0].pk,
+                        tayinlangan_xona__lte=oxirgi_pk,
+                    )
+                    .values_list('tayinlangan_xona')
+                    .annotate(soni=Count('pk'))
+                    .order_by()
+                )
+                ozgarganlar = []
+                bosagan = []
+                for xona in qism:
+                    soni = haqiqiy.get(xona.pk, 0)
+                    if xona.band_orinlar != soni:
+                        farqlar.append((xona, xona.band_orinlar, soni))
+                        if soni < xona.band_orinlar:
+                            bosagan.append(xona.pk)
+                        xona.band_orinlar = soni
+                        ozgarganlar.append(xona)
+                if ozgarganlar and not quruq:
+                    cls.objects.bulk_update(ozgarganlar, ['band_orinlar'])
+                    BinoXulosasi.yangilash(bino_ids={xona.bino_id for xona in ozgarganlar})
+                    NavbatYozuvi.orinlarni_toldirish(bosagan, sabab='moslashtirildi')
+        return farqlar
+
     @property
     def toliq_bandmi(self):
         """Xona to'liq bandmi"""
@@ -163,12 +484,215 @@ class Xona(models.Model):
             return "danger"  # Qizil - to'liq
 
 
+# ================== USTUVORLIK BALI ==================
+# Qoidalar umumiy keshda (barcha worker'lar uchun bitta) - o'zgarganda tranzaksiya yakunida o'chiriladi
+USTUVORLIK_KESH_KALITI = 'dormitory:ustuvorlik-qoidalari'
+# O'chirish bilan parallel o'qish eski nusxani qaytarib yozsa ham, u shu muddatdan eskirmaydi
+USTUVORLIK_KESH_MUDDATI = 300
+
+
+class UstuvorlikMezoni(models.Model):
+    """
+    Ariza ustuvorligi qoidasi. Ariza bali - mos kelgan qoidalar ballari yig'indisi;
+    oila a'zolari bo'yicha faqat eng katta mos chegara hisoblanadi.
+    """
+    MEZON_TURI = [
+        ('imtiyoz_turi', "Imtiyoz turi (qiymat - imtiyoz kodi)"),
+        ('kurs', "Kurs (qiymat - kurs raqami)"),
+        ('viloyat', "Viloyat (qiymat - viloyat nomi)"),
+        ('oila_azolari', "Oila a'zolari (qiymat - kamida shuncha)"),
+    ]
+    
+    mezon = models.CharField(max_length=20, choices=MEZON_TURI, verbose_name="Mezon")
+    qiymat = models.CharField(max_length=100, verbose_name="Qiymat")
+    ball = models.IntegerField(verbose_name="Ball")
+    
+    class Meta:
+        verbose_name = "Ustuvorlik mezoni"
+        verbose_name_plural = "Ustuvorlik mezonlari"
+        unique_together = ['mezon', 'qiymat']
+        ordering = ['mezon', '-ball']
+    
+    def __str__(self):
+        return f"{self.get_mezon_display().split(' (')[0]}: {self.qiymat} = {self.ball}"
+    
+    def clean(self):
+        super().clean()
+        self.qiymat = self.qiymat.strip()
+        if self.mezon == 'imtiyoz_turi':
+            if self.qiymat not in dict(YotoqxonaAriza.IMTIYOZ_TURI):
+                raise ValidationError({'qiymat': "Bunday imtiyoz turi yo'q"})
+        elif self.mezon == 'kurs':
+            if not Kurs.objects.filter(raqam=int(self.qiymat) if self.qiymat.isdigit() else None).exists():
+                raise ValidationError({'qiymat': "Bunday kurs yo'q"})
+            # SQL'da kurs raqami matni bilan solishtiriladi ('01' emas, '1')
+            self.qiymat = str(int(self.qiymat))
+        elif self.mezon == 'viloyat':
+            if not Viloyat.objects.filter(nomi=self.qiymat).exists():
+                raise ValidationError({'qiymat': "Bunday viloyat yo'q"})
+        elif self.mezon == 'oila_azolari' and not self.qiymat.isdigit():
+            raise ValidationError({'qiymat': "Oila a'zolari soni butun son bo'lishi kerak"})
+    
+    @classmethod
+    def qoidalar(cls):
+        """
+        Qoidalar ariza ustunlari bo'yicha (bazadan): {ustun: [(qiymat, ball), ...]}.
+        Kurs va viloyat nomlari id ga aylantiriladi, oila chegaralari kamayish tartibida.
+        Ommaviy yozishlar (import, qayta hisoblash) bir marta yuklab ishlatadi.
+        """
+        mezonlar = {}
+        for mezon, qiymat, ball in cls.objects.values_list('mezon', 'qiymat', 'ball'):
+            mezonlar.setdefault(mezon, {})[qiymat] = ball
+        kurslar = dict(Kurs.objects.values_list('raqam', 'pk'))
+        viloyatlar = dict(Viloyat.objects.values_list('nomi', 'pk'))
+        return {
+            'imtiyoz_turi': list(mezonlar.get('imtiyoz_turi', {}).items()),
+            'kurs_id': [
+                (kurslar[int(qiymat)], ball) for qiymat, ball in mezonlar.get('kurs', {}).items()
+                if qiymat.isdigit() and int(qiymat) in kurslar
+            ],
+            'viloyat_id': [
+                (viloyatlar[qiymat], ball) for qiymat, ball in mezonlar.get('viloyat', {}).items()
+                if qiymat in viloyatlar
+            ],
+            'oila_azolari': sorted(
+                ((int(qiymat), ball) for qiymat, ball in mezonlar.get('oila_azolari', {}).items() if qiymat.isdigit()),
+                reverse=True,
+            ),
+        }
+    
+    @classmethod
+    def ball_ifodasi(cls, qoidalar=None):
+        """Ustuvorlik bali uchun SQL ifoda - bitta UPDATE bilan ko'p qatorga yoziladi"""
+        qoidalar = cls.qoidalar() if qoidalar is None else qoidalar
+        qismlar = [
+            models.Case(
+                *[models.When(**{ustun: qiymat}, then=Value(ball)) for qiymat, ball in qoidalar[ustun]],
+                default=Value(0),
+            )
+            for ustun in ('imtiyoz_turi', 'kurs_id', 'viloyat_id') if qoidalar[ustun]
+        ]
+        if qoidalar['oila_azolari']:
+            qismlar.append(models.Case(
+                *[models.When(oila_azolari__gte=chegara, then=Value(ball)) for chegara, ball in qoidalar['oila_azolari']],
+                default=Value(0),
+            ))
+        ifoda = Value(0)
+        for qism in qismlar:
+            ifoda = ifoda + qism
+        return models.ExpressionWrapper(ifoda, output_field=models.IntegerField())
+    
+    @classmethod
+    def joriy_qoidalar(cls):
+        """qoidalar() umumiy keshdan (saqlashda qoida jadvallariga so'rov yo'q)"""
+        return cache.get_or_set(USTUVORLIK_KESH_KALITI, cls.qoidalar, USTUVORLIK_KESH_MUDDATI)
+    
+    @classmethod
+    def ariza_bali(cls, ariza, qoidalar=None):
+        """Bitta ariza bali (Python'da, obyekt maydonlaridan; ball_ifodasi bilan bir xil qoida)"""
+        qoidalar = cls.joriy_qoidalar() if qoidalar is None else qoidalar
+        jami = 0
+        for ustun in ('imtiyoz_turi', 'kurs_id', 'viloyat_id'):
+            jami += dict(qoidalar[ustun]).get(getattr(ariza, ustun), 0)
+        jami += next((ball for chegara, ball in qoidalar['oila_azolari'] if ariza.oila_azolari >= chegara), 0)
+        return jami
+    
+    @classmethod
+    def ballarni_qayta_hisoblash(cls, qoidalar=None, bolak=5000):
+        """Barcha arizalar balini pk oraliqlari bo'yicha bo'laklab UPDATE qilish (o'zgarganlarigina yoziladi)"""
+        ifoda = cls.ball_ifodasi(qoidalar)
+        chegaralar = YotoqxonaAriza.objects.aggregate(boshi=models.Min('pk'), oxiri=models.Max('pk'))
+        if chegaralar['boshi'] is None:
+            return 0
+        yangilandi = 0
+        for boshi in range(chegaralar['boshi'], chegaralar['oxiri'] + 1, bolak):
+            yangilandi += (
+                YotoqxonaAriza.objects.filter(pk__gte=boshi, pk__lt=boshi + bolak)
+                .annotate(_yangi_ball=ifoda)
+                .exclude(ustuvorlik_bali=F('_yangi_ball'))
+                .update(ustuvorlik_bali=ifoda)
+            )
+        # Navbat tartibi ariza balining nusxasi bo'yicha
+        NavbatYozuvi.objects.update(ustuvorlik_bali=models.Subquery(
+            YotoqxonaAriza.objects.filter(pk=models.OuterRef('ariza_id')).values('ustuvorlik_bali')[:1]
+        ))
+        return yangilandi
+    
+    @classmethod
+    def qoidalar_ozgardi(cls):
+        """
+        Tranzaksiya yakunida qoidalar keshini o'chirish va barcha ballarni qayta hisoblash.
+        Bir tranzaksiyada bir nechta qoida o'zgarsa ham bir marta navbatga qo'yiladi: belgi
+        ulanishning on_commit ro'yxatida, shuning uchun rollback bilan birga yo'qoladi.
+        """
+        ulanish = transaction.get_connection()
+        if any(getattr(vazifa, 'ustuvorlik_kutilmoqda', False) for _, vazifa, _ in ulanish.run_on_commit):
+            return
+        
+        def qayta_hisoblash():
+            qayta_hisoblash.ustuvorlik_kutilmoqda = False
+            cache.delete(USTUVORLIK_KESH_KALITI)
+            cls.ballarni_qayta_hisoblash()
+        
+        qayta_hisoblash.ustuvorlik_kutilmoqda = True
+        transaction.on_commit(qayta_hisoblash)
+
+
+class YotoqxonaArizaQuerySet(models.QuerySet):
+    """Arizalar uchun ommaviy amallar"""
+    
+    def holatni_ozgartirish(self, yangi_holat):
+        """
+        Holatni bitta UPDATE bilan o'zgartirish.
+        Tasdiqlangan arizalar boshqa holatga o'tsa, xonadagi o'rinlar bo'shatiladi
+        va shu tranzaksiyada navbatdagilarga beriladi.
+        """
+        with transaction.atomic(using=self.db):
+            if yangi_holat != 'navbatda':
+                NavbatYozuvi.objects.filter(ariza__in=self).delete()
+            bosatilgan_xonalar = []
+            if yangi_holat != 'tasdiqlandi':
+                bosatiladigan = (
+                    self.filter(holat='tasdiqlandi', tayinlangan_xona__isnull=False)
+                    .values('tayinlangan_xona')
+                    .annotate(soni=Count('id'))
+                    .order_by()
+                )
+                for qator in bosatiladigan:
+                    if Xona.orin_bosatish(qator['tayinlangan_xona'], qator['soni']):
+                        bosatilgan_xonalar.append(qator['tayinlangan_xona'])
+            
+            ozgaradigan = self.exclude(holat=yangi_holat)
+            navbatga = list(ozgaradigan.values_list('pk', flat=True)) if yangi_holat == 'navbatda' else []
+            guruhlar = list(
+                ozgaradigan.values('oquv_yili', 'holat').annotate(soni=Count('id')).order_by()
+            )
+            ariza_holati_keshini_tozalash(ozgaradigan.values_list('ariza_raqami', flat=True))
+            hozir = timezone.now()
+            # Tasdiqlash sanasi keyin o'chirilmaydi - kunlik statistika undan qayta quriladi
+            sanalar = {'tasdiqlangan_sana': hozir} if yangi_holat == 'tasdiqlandi' else {}
+            yangilandi = ozgaradigan.update(holat=yangi_holat, yangilangan_sana=hozir, **sanalar)
+            
+            # Dashboard hisoblagichlari
+            for guruh in guruhlar:
+                ArizaHisoblagichi.ozgartirish(guruh['oquv_yili'], guruh['holat'], -guruh['soni'])
+                ArizaHisoblagichi.ozgartirish(guruh['oquv_yili'], yangi_holat, guruh['soni'])
+            if yangi_holat == 'tasdiqlandi':
+                KunlikArizaStatistikasi.ozgartirish(tasdiqlangan=yangilandi)
+            
+            NavbatYozuvi.orinlarni_toldirish(bosatilgan_xonalar, sabab='bosatildi')
+            if navbatga:
+                NavbatYozuvi.navbatga_qoshish(YotoqxonaAriza.objects.filter(pk__in=navbatga))
+            return yangilandi
+
+
 class YotoqxonaAriza(models.Model):
     """Yotoqxona arizasi - yangi talabalar uchun"""
     HOLAT_TANLOV = [
         ('yangi', '📝 Yangi'),
         ('korilmoqda', '👀 Ko\'rib chiqilmoqda'),
         ('imtixon', '📋 Imtixon kutilmoqda'),
+        ('navbatda', '⏳ Navbatda'),
         ('tasdiqlandi', '✅ Tasdiqlandi'),
         ('rad_etildi', '❌ Rad etildi'),
         ('bekor', '🚫 Bekor qilindi'),
@@ -193,6 +717,12 @@ class YotoqxonaAriza(models.Model):
         ('yoshlar_daftari', 'Yoshlar daftari'),
     ]
     
+    HUJJAT_HOLATLARI = [
+        ('kutilmoqda', 'Ishlov kutilmoqda'),
+        ('tayyor', 'Tayyor'),
+        ('xato', 'Xato'),
+    ]
+    
     # Ariza raqami (unique)
     ariza_raqami = models.CharField(
         max_length=20, 
@@ -257,10 +787,26 @@ class YotoqxonaAriza(models.Model):
     )
     imtiyoz_hujjat = models.FileField(
         upload_to='imtiyoz/%Y/%m/',
+        storage=hujjat_storage,
         blank=True,
         null=True,
         verbose_name="Imtiyoz hujjati (PDF/rasm)"
     )
+    imtiyoz_miniatyura = models.ImageField(
+        upload_to='imtiyoz/miniatyura/%Y/%m/',
+        storage=hujjat_storage,
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name="Hujjat miniatyurasi"
+    )
+    hujjat_holati = models.CharField(
+        max_length=20,
+        choices=HUJJAT_HOLATLARI,
+        blank=True,
+        editable=False,
+        verbose_name="Hujjat ishlovi"
+    )
     
     # Afzalliklar
     xona_turi_afzallik = models.IntegerField(
@@ -272,6 +818,7 @@ class YotoqxonaAriza(models.Model):
     
     # Tizim ma'lumotlari
     ariza_sanasi = models.DateTimeField(auto_now_add=True, verbose_name="Ariza sanasi")
+    yangilangan_sana = models.DateTimeField(auto_now=True, verbose_name="Yangilangan sana")
     oquv_yili = models.CharField(max_length=9, verbose_name="O'quv yili")
     holat = models.CharField(
         max_length=20,
@@ -292,6 +839,15 @@ class YotoqxonaAriza(models.Model):
     rad_sababi = models.TextField(blank=True, verbose_name="Rad etish sababi")
     izoh = models.TextField(blank=True, verbose_name="Admin izohi")
     
+    # Qidiruv uchun normallashtirilgan nusxalar (save() da to'ldiriladi, search.py)
+    fish_qidiruv = models.CharField(max_length=300, blank=True, editable=False)
+    telefon_qidiruv = models.CharField(max_length=9, blank=True, editable=False)
+    
+    # UstuvorlikMezoni qoidalari bo'yicha (save() da va qoidalar o'zgarganda hisoblanadi)
+    ustuvorlik_bali = models.IntegerField(default=0, editable=False, verbose_name="Ustuvorlik bali")
+    
+    objects = YotoqxonaArizaQuerySet.as_manager()
+    
     class Meta:
         verbose_name = "Yotoqxona arizasi"
         verbose_name_plural = "Yotoqxona arizalari"
@@ -299,36 +855,161 @@ class YotoqxonaAriza(models.Model):
         indexes = [
             models.Index(fields=['holat', 'ariza_sanasi']),
             models.Index(fields=['fakultet', 'kurs']),
+            # Holat so'rovi (status.HOLAT_MAYDONLARI) faqat indeksdan javob oladi (PostgreSQL INCLUDE)
+            models.Index(
+                fields=['ariza_raqami'],
+                include=['telefon', 'holat', 'ariza_sanasi', 'tasdiqlangan_sana', 'yangilangan_sana'],
+                name='ariza_holat_sorovi_idx',
+            ),
+            # Admin ro'yxatining kursorli sahifalari: ORDER BY ariza_sanasi DESC, id DESC
+            models.Index(fields=['-ariza_sanasi', '-id'], name='ariza_sana_kursor_idx'),
+            # Admin qidiruvidagi prefiks (LIKE 'abc%') so'rovlari uchun; ariza_raqami unique -
+            # PostgreSQL'da Django unga varchar_pattern_ops (*_like) indeksini o'zi qo'shadi
+            models.Index(fields=['telefon_qidiruv'], name='ariza_telefon_qidiruv_idx',
+                         opclasses=['varchar_pattern_ops']),
+            models.Index(fields=['pasport'], name='ariza_pasport_idx',
+                         opclasses=['varchar_pattern_ops']),
+            # Ustuvorlik bo'yicha navbat: ORDER BY ustuvorlik_bali DESC, ariza_sanasi, id
+            models.Index(fields=['-ustuvorlik_bali', 'ariza_sanasi', 'id'], name='ariza_ustuvorlik_idx'),
         ]
     
     def __str__(self):
         return f"#{self.ariza_raqami} - {self.fish}"
     
+    # Holat o'tishlarini aniqlash uchun eslab qolinadigan maydonlar
+    KUZATILADIGAN_MAYDONLAR = ('holat', 'tayinlangan_xona_id', 'oquv_yili')
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._asl = None
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._asl_holatni_eslab_qolish()
+        return instance
+    
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._asl_holatni_eslab_qolish()
+    
+    def _asl_holatni_eslab_qolish(self):
+        """Bazadagi holat, xona va o'quv yilini eslab qolish"""
+        if all(maydon in self.__dict__ for maydon in self.KUZATILADIGAN_MAYDONLAR):
+            self._asl = {maydon: self.__dict__[maydon] for maydon in self.KUZATILADIGAN_MAYDONLAR}
+        else:
+            # Maydonlar yuklanmagan (deferred) - save() da bazadan olinadi
+            self._asl = models.DEFERRED
+    
+    def _asl_qiymatlar(self, qulflash=False):
+        """Bazadagi asl qiymatlar (yangi ariza uchun None)"""
+        if self._state.adding:
+            return None
+        if self._asl is models.DEFERRED or qulflash:
+            qs = type(self)._default_manager.filter(pk=self.pk)
+            if qulflash:
+                qs = qs.select_for_update()
+            self._asl = qs.values(*self.KUZATILADIGAN_MAYDONLAR).first()
+        return self._asl
+    
+    @staticmethod
+    def _band_xona(qiymatlar):
+        if qiymatlar and qiymatlar['holat'] == 'tasdiqlandi':
+            return qiymatlar['tayinlangan_xona_id']
+        return None
+    
+    def _joriy_qiymatlar(self):
+        return {maydon: getattr(self, maydon) for maydon in self.KUZATILADIGAN_MAYDONLAR}
+    
+    def clean(self):
+        super().clean()
+        if self.holat == 'tasdiqlandi' and self.tayinlangan_xona_id:
+            xona = self.tayinlangan_xona
+            if xona.bino.turi != self.jinsi:
+                raise ValidationError({'tayinlangan_xona': "Xona binosi talabaning jinsiga mos emas"})
+            if xona.pk != self._band_xona(self._asl_qiymatlar()) and xona.toliq_bandmi:
+                raise ValidationError({'tayinlangan_xona': "Bu xonada bo'sh o'rin yo'q"})
+    
     def save(self, *args, **kwargs):
-        # Ariza raqami generatsiya
+        # Ariza raqami generatsiya (yillik ketma-ketlikdan)
         if not self.ariza_raqami:
-            yil = timezone.now().year
-            self.ariza_raqami = f"YA-{yil}-{uuid.uuid4().hex[:6].upper()}"
+            self.ariza_raqami = ariza_raqami_ajratish()
         
         # O'quv yilini avtomatik belgilash
         if not self.oquv_yili:
-            now = timezone.now()
-            if now.month >= 9:
-                self.oquv_yili = f"{now.year}-{now.year + 1}"
-            else:
-                self.oquv_yili = f"{now.year - 1}-{now.year}"
+            self.oquv_yili = joriy_oquv_yili()
         
-        # Agar tasdiqlansa
-        if self.holat == 'tasdiqlandi' and self.tayinlangan_xona:
-            self.tasdiqlangan_sana = timezone.now()
-            # Xona bandligini oshirish
-            if self.tayinlangan_xona.band_orinlar < self.tayinlangan_xona.sig_imi:
-                self.tayinlangan_xona.band_orinlar += 1
-                self.tayinlangan_xona.save()
+        self.qidiruv_maydonlarini_toldirish()
+        self.ustuvorlik_bali = UstuvorlikMezoni.ariza_bali(self)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            qoshimcha = {
+                'fish': 'fish_qidiruv', 'telefon': 'telefon_qidiruv',
+                **dict.fromkeys(['imtiyoz_turi', 'kurs', 'viloyat', 'oila_azolari'], 'ustuvorlik_bali'),
+            }
+            kwargs['update_fields'] = set(update_fields) | {
+                qoshimcha[maydon] for maydon in update_fields if maydon in qoshimcha
+            }
         
-        super().save(*args, **kwargs)
+        # Yangi yuklangan hujjat fonda qayta ishlanadi (WebP, miniatyura)
+        yangi_hujjat = bool(self.imtiyoz_hujjat) and not self.imtiyoz_hujjat._committed
+        if yangi_hujjat:
+            self.hujjat_holati = 'kutilmoqda'
+            self.imtiyoz_miniatyura = None
+        elif not self.imtiyoz_hujjat:
+            self.hujjat_holati = ''
+            self.imtiyoz_miniatyura = None
+        
+        with transaction.atomic(using=kwargs.get('using')):
+            asl = self._asl_qiymatlar()
+            joriy = self._joriy_qiymatlar()
+            if asl is not None and asl != joriy:
+                # Parallel saqlashda ikki marta hisoblanmasligi uchun qatorni qulflab qayta o'qish
+                asl = self._asl_qiymatlar(qulflash=True)
+            
+            # Xona bandligi faqat "tasdiqlandi" holatiga kirish/chiqishda o'zgaradi
+            eski_xona_id = self._band_xona(asl)
+            yangi_xona_id = self._band_xona(joriy)
+            if eski_xona_id != yangi_xona_id:
+                if yangi_xona_id:
+                    if not Xona.orin_band_qilish(yangi_xona_id):
+                        raise ValidationError("Tanlangan xonada bo'sh o'rin qolmagan")
+                    if not eski_xona_id:
+                        self.tasdiqlangan_sana = timezone.now()
+                if eski_xona_id:
+                    Xona.orin_bosatish(eski_xona_id)
+            
+            super().save(*args, **kwargs)
+            
+            # Kutish navbati: avval navbatdan chiqish, so'ng bo'shagan o'ringa navbatdagini
+            # joylashtirish, oxirida navbatga kirish (ariza o'zi bo'shatgan o'ringa qaytmaydi)
+            if self.holat != 'navbatda' and asl is not None and asl['holat'] == 'navbatda':
+                NavbatYozuvi.objects.filter(ariza=self).delete()
+            if eski_xona_id and eski_xona_id != yangi_xona_id:
+                NavbatYozuvi.orinlarni_toldirish([eski_xona_id], sabab='bosatildi')
+            if self.holat == 'navbatda':
+                NavbatYozuvi.navbatga_qoshish([self])
+            
+            # Dashboard hisoblagichlari
+            if asl is None:
+                ArizaHisoblagichi.ozgartirish(self.oquv_yili, self.holat, 1)
+                KunlikArizaStatistikasi.ozgartirish(yuborilgan=1)
+            elif (asl['holat'], asl['oquv_yili']) != (self.holat, self.oquv_yili):
+                ArizaHisoblagichi.ozgartirish(asl['oquv_yili'], asl['holat'], -1)
+                ArizaHisoblagichi.ozgartirish(self.oquv_yili, self.holat, 1)
+            if self.holat == 'tasdiqlandi' and (asl is None or asl['holat'] != 'tasdiqlandi'):
+                KunlikArizaStatistikasi.ozgartirish(tasdiqlangan=1)
+            ariza_holati_keshini_tozalash([self.ariza_raqami])
+            if yangi_hujjat:
+                transaction.on_commit(partial(hujjat_ishlovini_boshlash, self.pk))
+        
+        self._asl = joriy
+    
+    def qidiruv_maydonlarini_toldirish(self):
+        """Qidiruv ustunlari (save() chaqirilmaydigan ommaviy yozishda ham)"""
+        self.fish_qidiruv = normallashtirish(self.fish)
+        self.telefon_qidiruv = telefon_raqamlari(self.telefon)
     
-
     @property
     def yoshi(self):
         """Talabaning yoshi"""
@@ -343,6 +1024,133 @@ class YotoqxonaAriza(models.Model):
         return self.imtiyoz_turi != 'yoq'
 
 
+class NavbatYozuvi(models.Model):
+    """
+    Kutish navbati: bino turi (talaba jinsi) va xona sig'imi bo'yicha, ustuvorlik tartibida.
+    Ariza "navbatda" holatida bo'lsa yozuvi bor; sig'im bo'sh - istalgan xona.
+    """
+    ariza = models.OneToOneField(
+        YotoqxonaAriza, on_delete=models.CASCADE, related_name='navbat', verbose_name="Ariza"
+    )
+    bino_turi = models.CharField(max_length=10, choices=YotoqxonaBino.BINO_TURI, verbose_name="Bino turi")
+    sig_imi = models.IntegerField(choices=Xona.XONA_TURI, null=True, blank=True, verbose_name="Xona sig'imi")
+    # Tartib ustunlari ariza qatoridan nusxa - navbat boshi bitta indeks qidiruvi
+    ustuvorlik_bali = models.IntegerField(default=0, verbose_name="Ustuvorlik bali")
+    ariza_sanasi = models.DateTimeField(verbose_name="Ariza sanasi")
+    qoshilgan_sana = models.DateTimeField(auto_now_add=True, verbose_name="Navbatga qo'shilgan")
+    
+    class Meta:
+        verbose_name = "Navbat"
+        verbose_name_plural = "Kutish navbati"
+        ordering = ['bino_turi', 'sig_imi', '-ustuvorlik_bali', 'ariza_sanasi', 'id']
+        indexes = [
+            models.Index(
+                fields=['bino_turi', 'sig_imi', '-ustuvorlik_bali', 'ariza_sanasi', 'id'],
+                name='navbat_tartibi_idx',
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.ariza_id} ({self.bino_turi}, {self.sig_imi or 'istalgan'})"
+    
+    @classmethod
+    def navbatga_qoshish(cls, arizalar):
+        """Navbatdagi arizalar yozuvini yaratish yoki kalitini (sig'im, ball) yangilash"""
+        cls.objects.bulk_create(
+            [
+                cls(
+                    ariza=ariza, bino_turi=ariza.jinsi, sig_imi=ariza.xona_turi_afzallik,
+                    ustuvorlik_bali=ariza.ustuvorlik_bali, ariza_sanasi=ariza.ariza_sanasi,
+                )
+                for ariza in arizalar
+            ],
+            update_conflicts=True,
+            unique_fields=['ariza'],
+            update_fields=['bino_turi', 'sig_imi', 'ustuvorlik_bali'],
+        )
+    
+    @classmethod
+    def navbat_boshi(cls, bino_turi, sig_imi):
+        """
+        Xona uchun navbatdagi birinchi yozuv: shu sig'im navbati va "istalgan" navbati boshlaridan
+        yaxshirog'i. Ikkalasi ham navbat_tartibi_idx bo'yicha LIMIT 1 qidiruv.
+        """
+        boshlar = [
+            cls.objects.select_for_update(skip_locked=True, of=('self',))
+            .select_related('ariza')
+            .filter(bino_turi=bino_turi, **shart)
+            .order_by('-ustuvorlik_bali', 'ariza_sanasi', 'id')
+            .first()
+            for shart in ({'sig_imi': sig_imi}, {'sig_imi__isnull': True})
+        ]
+        return min(
+            (yozuv for yozuv in boshlar if yozuv is not None),
+            key=lambda yozuv: (-yozuv.ustuvorlik_bali, yozuv.ariza_sanasi, yozuv.pk),
+            default=None,
+        )
+    
+    @classmethod
+    def orinlarni_toldirish(cls, xona_ids, sabab):
+        """
+        Bo'shagan o'rinlarga navbatdagi arizalarni joylashtirish (chaqiruvchi tranzaksiyasida).
+        Har bir joylashtirish NavbatTarixi ga yoziladi.
+        """
+        joylashtirildi = []
+        if not xona_ids:
+            return joylashtirildi
+        with transaction.atomic():
+            xonalar = (
+                Xona.objects.select_for_update(of=('self',))
+                .filter(pk__in=set(xona_ids), bosh_orinlar__gt=0, bino__faol=True)
+                .order_by('pk')
+            )
+            for xona in xonalar:
+                for _ in range(xona.bosh_orinlar):
+                    yozuv = cls.navbat_boshi(xona.bino_turi, xona.sig_imi)
+                    if yozuv is None:
+                        break
+                    ariza = yozuv.ariza
+                    ariza.holat = 'tasdiqlandi'
+                    ariza.tayinlangan_xona = xona
+                    ariza.save()
+                    NavbatTarixi.objects.create(
+                        ariza=ariza, ariza_raqami=ariza.ariza_raqami, xona=xona,
+                        ustuvorlik_bali=yozuv.ustuvorlik_bali,
+                        navbatga_qoshilgan=yozuv.qoshilgan_sana, sabab=sabab,
+                    )
+                    joylashtirildi.append(ariza)
+        return joylashtirildi
+
+
+class NavbatTarixi(models.Model):
+    """Navbatdan xonaga joylashtirishlar tarixi"""
+    SABAB_TANLOV = [
+        ('bosatildi', "Ariza holati o'zgardi"),
+        ('ochirildi', "Ariza o'chirildi"),
+        ('moslashtirildi', "Bandlik moslashtirildi"),
+        ('arxivlandi', "O'quv yili arxivlandi"),
+        ('tozalandi', "Xona bo'shatildi"),
+    ]
+    
+    ariza = models.ForeignKey(
+        YotoqxonaAriza, on_delete=models.SET_NULL, null=True, related_name='navbat_tarixi', verbose_name="Ariza"
+    )
+    ariza_raqami = models.CharField(max_length=20, verbose_name="Ariza raqami")
+    xona = models.ForeignKey(Xona, on_delete=models.SET_NULL, null=True, verbose_name="Xona")
+    ustuvorlik_bali = models.IntegerField(verbose_name="Ustuvorlik bali")
+    navbatga_qoshilgan = models.DateTimeField(verbose_name="Navbatga qo'shilgan")
+    sabab = models.CharField(max_length=20, choices=SABAB_TANLOV, verbose_name="Sabab")
+    sana = models.DateTimeField(auto_now_add=True, verbose_name="Joylashtirilgan")
+    
+    class Meta:
+        verbose_name = "Navbatdan joylashtirish"
+        verbose_name_plural = "Navbatdan joylashtirishlar"
+        ordering = ['-sana']
+    
+    def __str__(self):
+        return f"{self.ariza_raqami} -> {self.xona_id}"
+
+
 class ArizaIzohi(models.Model):
     """Ariza uchun admin izohlari"""
     ariza = models.ForeignKey(YotoqxonaAriza, on_delete=models.CASCADE, related_name='izohlar')
@@ -356,3 +1164,490 @@ class ArizaIzohi(models.Model):
     
     def __str__(self):
         return f"{self.ariza.ariza_raqami} - izoh"
+
+
+# ================== ARXIV ==================
+class ArxivAriza(models.Model):
+    """
+    Tugagan o'quv yillari arizalari. Qator o'zgarmaydi: ro'yxat uchun asosiy ustunlar,
+    qolgan barcha maydonlar va izohlar malumotlar ichida (ma'lumotnomalar nomi bilan).
+    """
+    ariza_raqami = models.CharField(max_length=20, unique=True, verbose_name="Ariza raqami")
+    oquv_yili = models.CharField(max_length=9, verbose_name="O'quv yili")
+    fish = models.CharField(max_length=300, verbose_name="To'liq ism familiya")
+    jinsi = models.CharField(max_length=10, choices=YotoqxonaAriza.JINSI, verbose_name="Jinsi")
+    telefon = models.CharField(max_length=13, verbose_name="Telefon raqami")
+    pasport = models.CharField(max_length=9, verbose_name="Pasport seriya raqami")
+    fakultet = models.CharField(max_length=200, verbose_name="Fakultet")
+    holat = models.CharField(max_length=20, choices=YotoqxonaAriza.HOLAT_TANLOV, verbose_name="Holat")
+    xona = models.CharField(max_length=100, blank=True, verbose_name="Tayinlangan xona")
+    ustuvorlik_bali = models.IntegerField(default=0, verbose_name="Ustuvorlik bali")
+    ariza_sanasi = models.DateTimeField(verbose_name="Ariza sanasi")
+    tasdiqlangan_sana = models.DateTimeField(null=True, blank=True, verbose_name="Tasdiqlangan sana")
+    yangilangan_sana = models.DateTimeField(verbose_name="Yangilangan sana")
+    rad_sababi = models.TextField(blank=True, verbose_name="Rad etish sababi")
+    malumotlar = models.JSONField(encoder=DjangoJSONEncoder, verbose_name="To'liq ma'lumotlar")
+    arxivlangan_sana = models.DateTimeField(auto_now_add=True, verbose_name="Arxivlangan sana")
+    
+    class Meta:
+        verbose_name = "Arxiv arizasi"
+        verbose_name_plural = "Arxiv arizalari"
+        ordering = ['-ariza_sanasi']
+        indexes = [
+            models.Index(fields=['oquv_yili', 'holat'], name='arxiv_yil_holat_idx'),
+            # Admin qidiruvidagi prefiks (LIKE '+99890%') so'rovlari uchun (search.arxivni_qidirish)
+            models.Index(fields=['telefon'], name='arxiv_telefon_idx', opclasses=['varchar_pattern_ops']),
+            models.Index(fields=['pasport'], name='arxiv_pasport_idx', opclasses=['varchar_pattern_ops']),
+        ]
+    
+    def __str__(self):
+        return f"#{self.ariza_raqami} - {self.fish} ({self.oquv_yili})"
+    
+    @classmethod
+    def nusxa(cls, ariza, izohlar=()):
+        """Ariza qatoridan arxiv yozuvi (saqlanmagan)"""
+        malumotlar = {
+            maydon.attname: maydon.value_to_string(ariza)
+            for maydon in YotoqxonaAriza._meta.concrete_fields
+        }
+        malumotlar.update(
+            fakultet_nomi=ariza.fakultet.nomi,
+            kurs_nomi=str(ariza.kurs),
+            viloyat_nomi=ariza.viloyat.nomi,
+            izohlar=list(izohlar),
+        )
+        return cls(
+            ariza_raqami=ariza.ariza_raqami,
+            oquv_yili=ariza.oquv_yili,
+            fish=ariza.fish,
+            jinsi=ariza.jinsi,
+            telefon=ariza.telefon,
+            pasport=ariza.pasport,
+            fakultet=ariza.fakultet.nomi,
+            holat=ariza.holat,
+            xona=str(ariza.tayinlangan_xona) if ariza.tayinlangan_xona_id else '',
+            ustuvorlik_bali=ariza.ustuvorlik_bali,
+            ariza_sanasi=ariza.ariza_sanasi,
+            tasdiqlangan_sana=ariza.tasdiqlangan_sana,
+            yangilangan_sana=ariza.yangilangan_sana,
+            rad_sababi=ariza.rad_sababi,
+            malumotlar=malumotlar,
+        )
+    
+    @classmethod
+    def arxivlash(cls, oquv_yillari, bolak=1000):
+        """
+        Berilgan o'quv yillari arizalarini arxivga ko'chirish. Har bo'lak (pk tartibida) alohida
+        tranzaksiya: arxivga bulk_create, egallangan o'rinlar bitta UPDATE bilan bo'shatiladi,
+        so'ng arizalar oddiy delete() bilan o'chiriladi. post_delete signali (ariza_ochirildi)
+        arxivga ko'chirishni origin orqali taniydi: hisoblagichlar arxivni ham sanaydi, o'rinlar
+        shu yerda bo'shatilgan, hujjat havolalari esa arxiv yozuviga o'tadi (kamaytirilmaydi).
+        Natija - ko'chirilgan arizalar soni.
+        """
+        jami = 0
+        oxirgi_pk = 0
+        while True:
+            with transaction.atomic():
+                qism = list(
+                    YotoqxonaAriza.objects.select_for_update(of=('self',))
+                    .select_related('fakultet', 'kurs', 'viloyat', 'tayinlangan_xona__bino')
+                    .filter(oquv_yili__in=oquv_yillari, pk__gt=oxirgi_pk)
+                    .order_by('pk')[:bolak]
+                )
+                if not qism:
+                    break
+                oxirgi_pk = qism[-1].pk
+                arizalar = YotoqxonaAriza.objects.filter(pk__in=[ariza.pk for ariza in qism])
+                
+                izohlar = {}
+                for izoh in ArizaIzohi.objects.filter(ariza__in=arizalar).order_by('sana').values('ariza', 'matn', 'sana'):
+                    izohlar.setdefault(izoh.pop('ariza'), []).append(izoh)
+                cls.objects.bulk_create([cls.nusxa(ariza, izohlar.get(ariza.pk, ())) for ariza in qism])
+                
+                # Bo'shaydigan o'rinlar: har xona uchun shu bo'lakdagi tasdiqlangan arizalar soni
+                egallaganlar = arizalar.filter(holat='tasdiqlandi', tayinlangan_xona__isnull=False)
+                xona_ids = list(egallaganlar.values_list('tayinlangan_xona', flat=True).distinct())
+                if xona_ids:
+                    soni = (
+                        egallaganlar.filter(tayinlangan_xona=models.OuterRef('pk'))
+                        .values('tayinlangan_xona').annotate(soni=Count('pk')).values('soni')
+                    )
+                    Xona.objects.filter(pk__in=xona_ids).update(
+                        band_orinlar=Greatest(F('band_orinlar') - models.Subquery(soni), Value(0))
+                    )
+                
+                NavbatYozuvi.objects.filter(ariza__in=arizalar).delete()
+                NavbatTarixi.objects.filter(ariza__in=arizalar).update(ariza=None)
+                ArizaIzohi.objects.filter(ariza__in=arizalar).delete()
+                arizalar.arxivga_kochirish = True
+                arizalar.delete()
+                
+                ariza_holati_keshini_tozalash([ariza.ariza_raqami for ariza in qism])
+                if xona_ids:
+                    BinoXulosasi.yangilash(xona_ids=xona_ids)
+                    # Joriy mavsum navbatidagilar bo'shagan o'rinlarga
+                    NavbatYozuvi.orinlarni_toldirish(xona_ids, sabab='arxivlandi')
+                jami += len(qism)
+        return jami
+
+
+# ================== ARIZA RAQAMLARI ==================
+class ArizaRaqamiKetmaKetligi(models.Model):
+    """Yillik ariza raqamlari ketma-ketligi"""
+    yil = models.IntegerField(unique=True, verbose_name="Yil")
+    oxirgi_raqam = models.BigIntegerField(default=0, verbose_name="Oxirgi berilgan raqam")
+    
+    class Meta:
+        verbose_name = "Ariza raqamlari ketma-ketligi"
+        verbose_name_plural = "Ariza raqamlari ketma-ketliklari"
+    
+    def __str__(self):
+        return f"{self.yil}: {self.oxirgi_raqam}"
+    
+    @classmethod
+    def ajratish(cls, yil, soni=1):
+        """Ketma-ketlikdan [boshi, oxiri] oralig'ini atomik band qilish"""
+        with transaction.atomic():
+            if not cls.objects.filter(yil=yil).update(oxirgi_raqam=F('oxirgi_raqam') + soni):
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(yil=yil, oxirgi_raqam=soni)
+                except IntegrityError:
+                    # Parallel so'rov yil qatorini allaqachon yaratgan
+                    cls.objects.filter(yil=yil).update(oxirgi_raqam=F('oxirgi_raqam') + soni)
+            oxiri = cls.objects.filter(yil=yil).values_list('oxirgi_raqam', flat=True).get()
+        return oxiri - soni + 1, oxiri
+
+
+# Jarayon (worker) ichida oldindan olingan raqamlar bloki: {yil: [keyingi, oxirgi]}
+_raqam_bloklari = {}
+_raqam_bloklari_pid = None
+_raqam_bloklari_qulfi = threading.Lock()
+
+
+def ariza_raqami_ajratish(yil=None):
+    """
+    Navbatdagi ariza raqami, masalan YA-2025-0000042.
+    
+    ARIZA_RAQAM_BLOK_HAJMI > 1 bo'lsa, worker raqamlarni blok bilan oladi va
+    ketma-ketlik qatoriga kamroq murojaat qiladi. Blok faqat alohida (commit
+    qilinadigan) tranzaksiyada olinadi - tashqi tranzaksiya bekor qilinsa ham
+    boshqa worker bilan takrorlanish bo'lmaydi.
+    """
+    global _raqam_bloklari_pid
+    yil = yil or timezone.now().year
+    blok_hajmi = getattr(settings, 'ARIZA_RAQAM_BLOK_HAJMI', 1)
+    
+    with _raqam_bloklari_qulfi:
+        if _raqam_bloklari_pid != os.getpid():
+            # fork'dan keyin ota jarayon bloklari ishlatilmaydi
+            _raqam_bloklari.clear()
+            _raqam_bloklari_pid = os.getpid()
+        
+        blok = _raqam_bloklari.get(yil)
+        if blok and blok[0] <= blok[1]:
+            raqam = blok[0]
+            blok[0] += 1
+        elif blok_hajmi > 1 and not connection.in_atomic_block:
+            boshi, oxiri = ArizaRaqamiKetmaKetligi.ajratish(yil, blok_hajmi)
+            _raqam_bloklari[yil] = [boshi + 1, oxiri]
+            raqam = boshi
+        else:
+            raqam, _ = ArizaRaqamiKetmaKetligi.ajratish(yil)
+    
+    return f"YA-{yil}-{raqam:07d}"
+
+
+def ariza_raqamlari_ajratish(soni, yil=None):
+    """Ommaviy yozish uchun ketma-ket raqamlar bloki (bitta so'rovda)"""
+    yil = yil or timezone.now().year
+    boshi, oxiri = ArizaRaqamiKetmaKetligi.ajratish(yil, soni)
+    return [f"YA-{yil}-{raqam:07d}" for raqam in range(boshi, oxiri + 1)]
+
+
+def hujjat_ishlovini_boshlash(ariza_id):
+    """Imtiyoz hujjatini qayta ishlashga yuborish (documents.py)"""
+    from .documents import navbatga_qoyish
+    navbatga_qoyish(ariza_id)
+
+
+# ================== HOLAT SO'ROVI KESHI ==================
+def ariza_holati_kesh_kaliti(ariza_raqami):
+    """Ariza holati kesh kaliti (foydalanuvchi kiritgan raqam xeshlanadi)"""
+    return 'dormitory:ariza-holati:' + hashlib.md5(ariza_raqami.encode()).hexdigest()
+
+
+def ariza_holati_keshini_tozalash(ariza_raqamlari):
+    """Tranzaksiya yakunida arizalar holati keshini o'chirish"""
+    kalitlar = [ariza_holati_kesh_kaliti(raqam) for raqam in ariza_raqamlari]
+    if kalitlar:
+        transaction.on_commit(lambda: cache.delete_many(kalitlar))
+
+
+# ================== DASHBOARD HISOBLAGICHLARI ==================
+DASHBOARD_KESH_KALITI = 'dormitory:dashboard'
+
+
+def dashboard_keshini_tozalash():
+    """Tranzaksiya yakunida dashboard keshini o'chirish"""
+    transaction.on_commit(lambda: cache.delete(DASHBOARD_KESH_KALITI))
+
+
+# ================== BO'SH JOYLAR ==================
+BOSH_JOYLAR_KESH_KALITI = 'dormitory:bosh-joylar'
+
+
+def bosh_joylar_keshini_tozalash():
+    """Tranzaksiya yakunida bo'sh joylar jadvali keshini o'chirish"""
+    transaction.on_commit(lambda: cache.delete(BOSH_JOYLAR_KESH_KALITI))
+
+
+def _hisoblagichni_oshirish(model, kalitlar, farqlar):
+    """Hisoblagich qatorini bazada atomik oshirish, yo'q bo'lsa yaratish"""
+    farqlar = {maydon: farq for maydon, farq in farqlar.items() if farq}
+    if not farqlar:
+        return
+    ifodalar = {maydon: F(maydon) + farq for maydon, farq in farqlar.items()}
+    if not model.objects.filter(**kalitlar).update(**ifodalar):
+        try:
+            with transaction.atomic():
+                model.objects.create(**kalitlar, **farqlar)
+        except IntegrityError:
+            # Parallel so'rov qatorni allaqachon yaratgan
+            model.objects.filter(**kalitlar).update(**ifodalar)
+    dashboard_keshini_tozalash()
+
+
+class ArizaHisoblagichi(models.Model):
+    """O'quv yili va holat bo'yicha arizalar soni"""
+    oquv_yili = models.CharField(max_length=9, verbose_name="O'quv yili")
+    holat = models.CharField(max_length=20, choices=YotoqxonaAriza.HOLAT_TANLOV, verbose_name="Holat")
+    soni = models.IntegerField(default=0, verbose_name="Soni")
+    
+    class Meta:
+        verbose_name = "Arizalar hisoblagichi"
+        verbose_name_plural = "Arizalar hisoblagichlari"
+        unique_together = ['oquv_yili', 'holat']
+    
+    def __str__(self):
+        return f"{self.oquv_yili} / {self.holat}: {self.soni}"
+    
+    @classmethod
+    def ozgartirish(cls, oquv_yili, holat, farq):
+        _hisoblagichni_oshirish(cls, {'oquv_yili': oquv_yili, 'holat': holat}, {'soni': farq})
+    
+    @classmethod
+    def qayta_hisoblash(cls):
+        """Hisoblagichlarni arizalar va arxiv jadvallaridan GROUP BY bilan qayta qurish"""
+        # Arxivlangan yillar ham hisobga olinadi (dashboard tarixi saqlanadi)
+        haqiqiy = Counter()
+        for model in (YotoqxonaAriza, ArxivAriza):
+            for qator in model.objects.order_by().values('oquv_yili', 'holat').annotate(soni=Count('id')):
+                haqiqiy[(qator['oquv_yili'], qator['holat'])] += qator['soni']
+        with transaction.atomic():
+            mavjud = {(h.oquv_yili, h.holat): h for h in cls.objects.select_for_update()}
+            farq = 0
+            for kalit, hisoblagich in mavjud.items():
+                soni = haqiqiy.pop(kalit, 0)
+                if hisoblagich.soni != soni:
+                    farq += 1
+                    hisoblagich.soni = soni
+                    hisoblagich.save(update_fields=['soni'])
+            cls.objects.bulk_create([
+                cls(oquv_yili=oquv_yili, holat=holat, soni=soni)
+                for (oquv_yili, holat), soni in haqiqiy.items()
+            ])
+            farq += len(haqiqiy)
+            dashboard_keshini_tozalash()
+        return farq
+
+
+class KunlikArizaStatistikasi(models.Model):
+    """Kunlik yuborilgan va tasdiqlangan arizalar soni"""
+    sana = models.DateField(unique=True, verbose_name="Sana")
+    yuborilgan = models.IntegerField(default=0, verbose_name="Yuborilgan")
+    tasdiqlangan = models.IntegerField(default=0, verbose_name="Tasdiqlangan")
+    
+    class Meta:
+        verbose_name = "Kunlik statistika"
+        verbose_name_plural = "Kunlik statistika"
+        ordering = ['-sana']
+    
+    def __str__(self):
+        return f"{self.sana}: +{self.yuborilgan} / ✅{self.tasdiqlangan}"
+    
+    @classmethod
+    def ozgartirish(cls, sana=None, yuborilgan=0, tasdiqlangan=0):
+        sana = sana or timezone.localdate()
+        _hisoblagichni_oshirish(
+            cls, {'sana': sana}, {'yuborilgan': yuborilgan, 'tasdiqlangan': tasdiqlangan}
+        )
+    
+    @classmethod
+    def qayta_hisoblash(cls):
+        """
+        Kunlik qatorlarni ariza va tasdiqlash sanalaridan qayta qurish (joriy jadval va arxiv -
+        ArizaHisoblagichi.qayta_hisoblash bilan bir xil manba). Keyin bekor qilingan tasdiqlash
+        ham sanaladi: tasdiqlangan_sana o'chirilmaydi (qayta tasdiqlansa - oxirgi sana).
+        """
+        kunlar = {}
+        for model in (YotoqxonaAriza, ArxivAriza):
+            for maydon, sanoq in (('ariza_sanasi', 'yuborilgan'), ('tasdiqlangan_sana', 'tasdiqlangan')):
+                for qator in (
+                    model.objects.order_by()
+                    .filter(**{f'{maydon}__isnull': False})
+                    .annotate(kun=TruncDate(maydon))
+                    .values('kun').annotate(soni=Count('id'))
+                ):
+                    kun = kunlar.setdefault(qator['kun'], cls(sana=qator['kun']))
+                    setattr(kun, sanoq, getattr(kun, sanoq) + qator['soni'])
+        
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create(kunlar.values())
+            dashboard_keshini_tozalash()
+        return len(kunlar)
+
+
+class EksportVazifasi(models.Model):
+    """Fon rejimida bajariladigan arizalar eksporti (bazadagi navbat)"""
+    FORMAT_TANLOV = [
+        ('csv', 'CSV'),
+        ('xlsx', 'Excel (XLSX)'),
+    ]
+    
+    HOLAT_TANLOV = [
+        ('kutilmoqda', '⏳ Navbatda'),
+        ('bajarilmoqda', '⚙️ Bajarilmoqda'),
+        ('tayyor', '✅ Tayyor'),
+        ('xato', '❌ Xato'),
+    ]
+    
+    format = models.CharField(max_length=4, choices=FORMAT_TANLOV, default='csv', verbose_name="Format")
+    holat = models.CharField(max_length=15, choices=HOLAT_TANLOV, default='kutilmoqda', verbose_name="Holat")
+    
+    # Changelist filtrlari (query string) yoki tanlangan arizalar
+    filtrlar = models.TextField(blank=True, verbose_name="Filtrlar")
+    tanlangan = models.JSONField(null=True, blank=True, verbose_name="Tanlangan arizalar")
+    
+    # Jarayon
+    jami = models.IntegerField(default=0, verbose_name="Jami qatorlar")
+    bajarildi = models.IntegerField(default=0, verbose_name="Yozilgan qatorlar")
+    fayl = models.FileField(upload_to='eksport/%Y/%m/', storage=maxfiy_storage, blank=True, verbose_name="Fayl")
+    xato_matni = models.TextField(blank=True, verbose_name="Xato")
+    
+    yaratuvchi = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        verbose_name="Yaratuvchi"
+    )
+    yaratilgan_sana = models.DateTimeField(auto_now_add=True, verbose_name="Yaratilgan")
+    boshlangan_sana = models.DateTimeField(null=True, blank=True, verbose_name="Boshlangan")
+    # Worker jarayonni yozgan oxirgi vaqt - to'xtab qolgan vazifalarni aniqlash uchun
+    faollik_sana = models.DateTimeField(null=True, blank=True, editable=False, verbose_name="Oxirgi faollik")
+    urinishlar = models.PositiveIntegerField(default=0, editable=False, verbose_name="Urinishlar")
+    yakunlangan_sana = models.DateTimeField(null=True, blank=True, verbose_name="Yakunlangan")
+    
+    # Shuncha marta worker o'lsa - vazifa xato deb belgilanadi
+    URINISHLAR_CHEGARASI = 3
+    
+    class Meta:
+        verbose_name = "Eksport vazifasi"
+        verbose_name_plural = "Eksport vazifalari"
+        ordering = ['-yaratilgan_sana']
+        indexes = [
+            models.Index(fields=['holat', 'yaratilgan_sana']),
+        ]
+    
+    def __str__(self):
+        return f"Eksport #{self.pk} ({self.get_format_display()})"
+    
+    @property
+    def foiz(self):
+        """Bajarilish foizi"""
+        if self.holat == 'tayyor':
+            return 100
+        if not self.jami:
+            return 0
+        return min(100, int(self.bajarildi * 100 / self.jami))
+    
+    @classmethod
+    def navbatdan_olish(cls):
+        """Navbatdagi eng eski vazifani band qilish (bir nechta worker uchun xavfsiz)"""
+        nomzodlar = cls.objects.filter(holat='kutilmoqda').order_by('yaratilgan_sana').values_list('pk', flat=True)[:10]
+        for pk in nomzodlar:
+            hozir = timezone.now()
+            olindi = cls.objects.filter(pk=pk, holat='kutilmoqda').update(
+                holat='bajarilmoqda', boshlangan_sana=hozir, faollik_sana=hozir,
+                urinishlar=F('urinishlar') + 1, bajarildi=0,
+            )
+            if olindi:
+                return cls.objects.get(pk=pk)
+        return None
+    
+    @classmethod
+    def toxtaganlarni_qaytarish(cls):
+        """
+        EKSPORT_VAZIFA_MUDDATI davomida jarayon yozmagan vazifalar (worker o'lgan) navbatga
+        qaytariladi, urinishlar chegarasiga yetganlari xato bilan yakunlanadi.
+        """
+        chegara = timezone.now() - timedelta(seconds=getattr(settings, 'EKSPORT_VAZIFA_MUDDATI', 600))
+        toxtagan = cls.objects.filter(holat='bajarilmoqda', faollik_sana__lt=chegara)
+        xato = toxtagan.filter(urinishlar__gte=cls.URINISHLAR_CHEGARASI).update(
+            holat='xato', xato_matni="Worker javob bermay qoldi", yakunlangan_sana=timezone.now()
+        )
+        return xato + toxtagan.update(holat='kutilmoqda')
+    
+    def faollikni_yozish(self, **maydonlar):
+        """
+        Jarayonni yozish. Vazifa boshqa workerga o'tgan bo'lsa (urinish raqami o'zgargan) - False.
+        """
+        return bool(
+            type(self).objects.filter(pk=self.pk, holat='bajarilmoqda', urinishlar=self.urinishlar)
+            .update(faollik_sana=timezone.now(), **maydonlar)
+        )
+
+
+# ================== HUJJAT FAYLLARI ==================
+class SaqlanganFayl(models.Model):
+    """Kontent xeshi bo'yicha saqlangan fayl va unga havolalar soni"""
+    nom = models.CharField(max_length=255, unique=True, verbose_name="Fayl nomi")
+    hajm = models.BigIntegerField(default=0, verbose_name="Hajmi (bayt)")
+    havolalar = models.PositiveIntegerField(default=0, verbose_name="Havolalar soni")
+    yaratilgan_sana = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = "Saqlangan fayl"
+        verbose_name_plural = "Saqlangan fayllar"
+    
+    def __str__(self):
+        return f"{self.nom} ({self.havolalar})"
+    
+    @classmethod
+    def havola_qoshish(cls, nom, hajm):
+        """Havolani oshirish (qator qulflanadi), yo'q bo'lsa yaratish. Yangi yaratilsa True."""
+        if cls.objects.select_for_update().filter(nom=nom).update(havolalar=F('havolalar') + 1):
+            return False
+        try:
+            with transaction.atomic():
+                cls.objects.create(nom=nom, hajm=hajm, havolalar=1)
+            return True
+        except IntegrityError:
+            # Parallel so'rov qatorni allaqachon yaratgan
+            cls.objects.filter(nom=nom).update(havolalar=F('havolalar') + 1)
+            return False
+    
+    @classmethod
+    def havola_ayirish(cls, nom):
+        """Havolani kamaytirish; oxirgi havola bo'lsa qator o'chiriladi va True qaytadi"""
+        fayl = cls.objects.select_for_update().filter(nom=nom).first()
+        if fayl is None:
+            # Hisobga olinmagan (eski) fayl
+            return True
+        if fayl.havolalar > 1:
+            cls.objects.filter(pk=fayl.pk).update(havolalar=F('havolalar') - 1)
+            return False
+        fayl.delete()
+        return True
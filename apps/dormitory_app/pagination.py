@@ -0,0 +1,137 @@
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ChangeList
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+
+# Shundan ko'p qator bo'lsa aniq COUNT(*) o'rniga rejalashtiruvchi bahosi ishlatiladi
+TAXMINIY_SANASH_CHEGARASI = 10000
+
+# Kursor parametrlari (?keyingi=... / ?oldingi=...)
+KEYINGI_VAR = 'keyingi'
+OLDINGI_VAR = 'oldingi'
+
+_EPOXA = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class TaxminiyPaginator(Paginator):
+    """
+    Katta jadvalda COUNT(*) butun indeksni o'qiydi. PostgreSQL'da avval EXPLAIN bahosi
+    olinadi va u chegaradan katta bo'lsa shu qiymat ishlatiladi (aniq son kerak emas).
+    """
+
+    taxminiy = False
+
+    @cached_property
+    def count(self):
+        baho = self._rejalashtiruvchi_bahosi()
+        if baho is not None and baho > TAXMINIY_SANASH_CHEGARASI:
+            self.taxminiy = True
+            return baho
+        return super().count
+
+    def _rejalashtiruvchi_bahosi(self):
+        queryset = self.object_list
+        if not hasattr(queryset, 'explain') or connections[queryset.db].vendor != 'postgresql':
+            return None
+        reja = json.loads(queryset.order_by().explain(format='json'))
+        return int(reja[0]['Plan']['Plan Rows'])
+
+
+def kursor_yaratish(ariza):
+    """(ariza_sanasi, id) juftligi URL uchun: '<mikrosekund>-<id>'"""
+    mikrosekund = (ariza.ariza_sanasi - _EPOXA) // timedelta(microseconds=1)
+    return f"{mikrosekund}-{ariza.pk}"
+
+
+def kursor_ochish(kursor):
+    try:
+        mikrosekund, pk = (int(qism) for qism in kursor.split('-'))
+    except ValueError:
+        raise IncorrectLookupParameters("Noto'g'ri kursor")
+    return _EPOXA + timedelta(microseconds=mikrosekund), pk
+
+
+class KursorChangeList(ChangeList):
+    """
+    Standart tartibda (-ariza_sanasi, -id) sahifalar OFFSET emas, kursor bo'yicha olinadi:
+    WHERE (ariza_sanasi, id) < (kursor) ORDER BY ... LIMIT n - chuqur sahifa ham birinchisidek
+    arzon. Boshqa ustun bo'yicha saralanganda oddiy (taxminiy sonli) sahifalashga qaytadi.
+    """
+
+    KURSOR_TARTIBI = ('-ariza_sanasi', '-pk')
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(KEYINGI_VAR, None)
+        lookup_params.pop(OLDINGI_VAR, None)
+        return lookup_params
+
+    def get_query_string(self, new_params=None, remove=None):
+        # Filtr, saralash va sahifa havolalari kursorni olib yurmaydi
+        new_params = new_params or {}
+        remove = list(remove or [])
+        remove += [var for var in (KEYINGI_VAR, OLDINGI_VAR) if var not in new_params]
+        return super().get_query_string(new_params, remove)
+
+    @property
+    def kursor_rejimi(self):
+        return (
+            not self.show_all
+            # get_ordering() standart tartibni takrorlashi mumkin: ('-ariza_sanasi', '-ariza_sanasi', '-pk')
+            and tuple(dict.fromkeys(self.queryset.query.order_by)) == self.KURSOR_TARTIBI
+        )
+
+    def get_results(self, request):
+        if self.kursor_rejimi:
+            self._kursor_natijalari(request)
+        else:
+            super().get_results(request)
+            self.birinchi_url = self.oldingi_url = self.keyingi_url = None
+
+    def _kursor_natijalari(self, request):
+        paginator = self.model_admin.get_paginator(request, self.queryset, self.list_per_page)
+        n = self.list_per_page
+        keyingi = request.GET.get(KEYINGI_VAR)
+        oldingi = request.GET.get(OLDINGI_VAR)
+
+        if oldingi:
+            sana, pk = kursor_ochish(oldingi)
+            qatorlar = list(
+                self.queryset.filter(Q(ariza_sanasi__gte=sana) & (Q(ariza_sanasi__gt=sana) | Q(pk__gt=pk)))
+                .order_by('ariza_sanasi', 'pk')[:n + 1]
+            )
+            oldindan_bor = len(qatorlar) > n
+            natija = qatorlar[:n][::-1]
+            keyin_bor = True
+        else:
+            queryset = self.queryset
+            if keyingi:
+                sana, pk = kursor_ochish(keyingi)
+                queryset = queryset.filter(Q(ariza_sanasi__lte=sana) & (Q(ariza_sanasi__lt=sana) | Q(pk__lt=pk)))
+            qatorlar = list(queryset[:n + 1])
+            keyin_bor = len(qatorlar) > n
+            natija = qatorlar[:n]
+            oldindan_bor = bool(keyingi)
+
+        self.result_count = paginator.count
+        self.show_full_result_count = self.model_admin.show_full_result_count
+        self.full_result_count = self.root_queryset.count() if self.show_full_result_count else None
+        self.show_admin_actions = not self.show_full_result_count or bool(self.full_result_count)
+        self.result_list = natija
+        self.can_show_all = self.result_count <= self.list_max_show_all
+        self.multi_page = oldindan_bor or keyin_bor
+        self.paginator = paginator
+
+        self.birinchi_url = self.get_query_string() if oldindan_bor else None
+        self.oldingi_url = (
+            self.get_query_string({OLDINGI_VAR: kursor_yaratish(natija[0])}) if oldindan_bor and natija else None
+        )
+        self.keyingi_url = (
+            self.get_query_string({KEYINGI_VAR: kursor_yaratish(natija[-1])}) if keyin_bor and natija else None
+        )
@@ -0,0 +1,97 @@
+import threading
+import time
+import uuid
+
+from django import forms
+from django.core.cache import cache
+from django.db import transaction
+from django.forms.models import ModelChoiceIterator
+
+from .models import Fakultet, Kurs, Viloyat
+
+
+# Kam o'zgaradigan ma'lumotnoma jadvallari
+MALUMOTNOMA_MODELLARI = (Fakultet, Kurs, Viloyat)
+
+# Versiya umumiy keshda saqlanadi - o'zgarganda barcha jarayonlar qayta yuklaydi
+VERSIYA_KESH_KALITI = 'dormitory:malumotnoma-versiyasi'
+
+# Versiya kaliti o'qilmay qolsa ham (kesh ishlamasa), ma'lumot shu muddatdan eskirmaydi
+MAHALLIY_KESH_MUDDATI = 300
+
+_kesh = {}
+_kesh_versiyasi = None
+_yuklangan_vaqt = 0.0
+_kesh_qulfi = threading.Lock()
+
+
+def _joriy_versiya():
+    return cache.get_or_set(VERSIYA_KESH_KALITI, lambda: uuid.uuid4().hex, None)
+
+
+def malumotnoma(model):
+    """
+    Ma'lumotnoma jadvali jarayon xotirasidan: (obyektlar ro'yxati, pk bo'yicha lug'at).
+    Versiya o'zgarganda yoki muddat o'tganda barcha jadvallar qayta yuklanadi.
+    """
+    global _kesh, _kesh_versiyasi, _yuklangan_vaqt
+    versiya = _joriy_versiya()
+    with _kesh_qulfi:
+        if versiya != _kesh_versiyasi or time.monotonic() - _yuklangan_vaqt > MAHALLIY_KESH_MUDDATI:
+            yangi = {}
+            for m in MALUMOTNOMA_MODELLARI:
+                obyektlar = list(m.objects.all())
+                yangi[m] = (obyektlar, {str(obj.pk): obj for obj in obyektlar})
+            _kesh = yangi
+            _kesh_versiyasi = versiya
+            _yuklangan_vaqt = time.monotonic()
+        return _kesh[model]
+
+
+def malumotnoma_versiyasini_yangilash():
+    """Tranzaksiya yakunida yangi versiya - barcha jarayonlardagi nusxa eskiradi"""
+    transaction.on_commit(lambda: cache.set(VERSIYA_KESH_KALITI, uuid.uuid4().hex, None))
+
+
+def birinchi_kurs():
+    """1-kurs (yangi talabalar uchun default)"""
+    obyektlar, _ = malumotnoma(Kurs)
+    return next((kurs for kurs in obyektlar if kurs.raqam == 1), None)
+
+
+class KeshlanganChoiceIterator(ModelChoiceIterator):
+    """Tanlovlar bazadan emas, ma'lumotnoma keshidan"""
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        for obj in self.field.keshdagi_obyektlar()[0]:
+            yield self.choice(obj)
+
+    def __len__(self):
+        return len(self.field.keshdagi_obyektlar()[0]) + (self.field.empty_label is not None)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(self.field.keshdagi_obyektlar()[0])
+
+
+class KeshlanganModelChoiceField(forms.ModelChoiceField):
+    """Tanlovlari va tekshiruvi ma'lumotnoma keshidan olinadigan ModelChoiceField"""
+    iterator = KeshlanganChoiceIterator
+
+    def keshdagi_obyektlar(self):
+        return malumotnoma(self.queryset.model)
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        if isinstance(value, self.queryset.model):
+            value = value.pk
+        obj = self.keshdagi_obyektlar()[1].get(str(value))
+        if obj is None:
+            raise forms.ValidationError(
+                self.error_messages['invalid_choice'],
+                code='invalid_choice',
+                params={'value': value},
+            )
+        return obj
@@ -0,0 +1,163 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+
+# O'zbek kirill -> lotin (qidiruv uchun; tutuq belgilari keyin olib tashlanadi)
+_KIRILL_LOTIN = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'ғ': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo',
+    'ж': 'j', 'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'қ': 'q', 'л': 'l', 'м': 'm',
+    'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u', 'ў': 'o',
+    'ф': 'f', 'х': 'x', 'ҳ': 'h', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'sh', 'ъ': '',
+    'ь': '', 'ы': 'i', 'э': 'e', 'ю': 'yu', 'я': 'ya',
+}
+_TRANSLIT = str.maketrans(_KIRILL_LOTIN)
+
+# Tutuq belgilarining barcha ko'rinishlari (o', g', ʼ) - olib tashlanadi
+_TUTUQLAR = re.compile(r"['`ʻʼ‘’]")
+_HARF_RAQAM_EMAS = re.compile(r'[^a-z0-9]+')
+
+# FTS5 (SQLite) - jadval va uni yangilovchi triggerlar
+FTS_JADVALI = 'dormitory_ariza_fts'
+ARIZA_JADVALI = 'dormitory_app_yotoqxonaariza'
+
+# Maxsus qidiruvlar - B-tree indeksdagi prefiks bo'yicha
+# Kamida bitta raqam - aks holda ikki harfli ism ("Li") pasport deb olinadi
+PASPORT_REGEX = re.compile(r'^[A-Za-z]{2}\d{1,7}$')
+ARIZA_RAQAMI_REGEX = re.compile(r'^YA-[\d-]*$', re.IGNORECASE)
+
+
+def normallashtirish(matn):
+    """Qidiruv uchun matn: kichik harf, lotin yozuvi, tutuq va tinish belgilarisiz"""
+    matn = _TUTUQLAR.sub('', (matn or '').lower().translate(_TRANSLIT))
+    return _HARF_RAQAM_EMAS.sub(' ', matn).strip()
+
+
+def telefon_raqamlari(telefon):
+    """Telefonning mahalliy 9 raqami (+998 siz) - prefiks bo'yicha qidirish uchun"""
+    raqamlar = re.sub(r'\D', '', telefon or '')
+    if len(raqamlar) == 12 and raqamlar.startswith('998'):
+        return raqamlar[3:]
+    return raqamlar
+
+
+def _prefiks_qidiruvi(soz):
+    """
+    Raqam, pasport yoki ariza raqami ko'rinishidagi so'z: (maydon, prefiks), aks holda None.
+    Telefon prefiksi - mahalliy raqamlar (+998 siz).
+    """
+    raqamlar = re.sub(r'[\s()+-]', '', soz)
+    if raqamlar.isdigit() and len(raqamlar) >= 3:
+        # "+99890..." yoki to'liq raqam - davlat kodi olib tashlanadi
+        if raqamlar.startswith('998') and (soz.startswith('+') or len(raqamlar) > 9):
+            raqamlar = raqamlar[3:]
+        return 'telefon', raqamlar
+    if PASPORT_REGEX.match(soz):
+        return 'pasport', soz.upper()
+    if ARIZA_RAQAMI_REGEX.match(soz):
+        return 'ariza_raqami', soz.upper()
+    return None
+
+
+def arizalarni_qidirish(queryset, soz):
+    """
+    Admin qidiruvi:
+    - raqamlar - telefon prefiksi, pasport (AA123...) va ariza raqami (YA-...) prefiksi - B-tree;
+    - qolgani - F.I.SH bo'yicha (lotin/kirill farqsiz) har bir so'z qism-satr sifatida:
+      PostgreSQL'da pg_trgm GIN indeksi, SQLite'da FTS5 trigram jadvali.
+    Prefikslar katta-kichik harfga sezgir startswith (LIKE 'abc%') - PostgreSQL'da
+    varchar_pattern_ops indekslari bilan (unique ariza_raqami uchun Django o'zi *_like indeks yaratadi).
+    """
+    soz = (soz or '').strip()
+    if not soz:
+        return queryset
+
+    prefiks = _prefiks_qidiruvi(soz)
+    if prefiks:
+        maydon, qiymat = prefiks
+        if maydon == 'telefon':
+            maydon = 'telefon_qidiruv'
+        return queryset.filter(**{f'{maydon}__startswith': qiymat})
+
+    for qism in normallashtirish(soz).split():
+        queryset = queryset.filter(_fish_sharti(qism))
+    return queryset
+
+
+def arxivni_qidirish(queryset, soz):
+    """
+    Arxiv admin qidiruvi: telefon (to'liq +998... ko'rinishida saqlanadi), pasport va ariza raqami -
+    prefiks bo'yicha (varchar_pattern_ops indekslari), qolgani - F.I.SH ichidan.
+    """
+    soz = (soz or '').strip()
+    if not soz:
+        return queryset
+
+    prefiks = _prefiks_qidiruvi(soz)
+    if prefiks:
+        maydon, qiymat = prefiks
+        if maydon == 'telefon':
+            qiymat = '+998' + qiymat
+        return queryset.filter(**{f'{maydon}__startswith': qiymat})
+    return queryset.filter(fish__icontains=soz)
+
+
+def _fish_sharti(qism):
+    if connection.vendor == 'sqlite' and len(qism) >= 3:
+        # Trigram tokenizer qism-satrni indeks orqali topadi
+        return Q(pk__in=RawSQL(
+            f'SELECT rowid FROM {FTS_JADVALI} WHERE {FTS_JADVALI} MATCH %s',
+            ['fish_qidiruv:"' + qism + '"'],
+        ))
+    # PostgreSQL: LIKE '%qism%' gin_trgm_ops indeksidan foydalanadi
+    return Q(fish_qidiruv__contains=qism)
+
+
+# ================== SQLITE FTS5 ==================
+def sqlite_fts_ornatish(using='default', qayta_qurish=False):
+    """
+    FTS5 jadvali va triggerlarini (yo'q bo'lsa) yaratish. SQLite ALTER paytida jadvalni
+    qayta yaratib triggerlarni yo'qotadi - shuning uchun har migratsiyadan keyin chaqiriladi.
+    """
+    from django.db import connections
+
+    ulanish = connections[using]
+    if ulanish.vendor != 'sqlite':
+        return
+    with ulanish.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE name IN (%s, %s, %s, %s)",
+            [FTS_JADVALI, f'{FTS_JADVALI}_ai', f'{FTS_JADVALI}_ad', f'{FTS_JADVALI}_au'],
+        )
+        mavjud = {qator[0] for qator in cursor.fetchall()}
+        cursor.execute(
+            "SELECT 1 FROM pragma_table_info(%s) WHERE name = 'fish_qidiruv'", [ARIZA_JADVALI]
+        )
+        if not cursor.fetchone():
+            # Ustun hali qo'shilmagan (oldingi migratsiyalar)
+            return
+        if len(mavjud) == 4 and not qayta_qurish:
+            return
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_JADVALI} USING fts5("
+            f"fish_qidiruv, content='{ARIZA_JADVALI}', content_rowid='id', tokenize='trigram')"
+        )
+        cursor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {FTS_JADVALI}_ai AFTER INSERT ON {ARIZA_JADVALI} BEGIN "
+            f"INSERT INTO {FTS_JADVALI}(rowid, fish_qidiruv) VALUES (new.id, new.fish_qidiruv); END"
+        )
+        cursor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {FTS_JADVALI}_ad AFTER DELETE ON {ARIZA_JADVALI} BEGIN "
+            f"INSERT INTO {FTS_JADVALI}({FTS_JADVALI}, rowid, fish_qidiruv) "
+            f"VALUES ('delete', old.id, old.fish_qidiruv); END"
+        )
+        cursor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {FTS_JADVALI}_au AFTER UPDATE OF fish_qidiruv ON {ARIZA_JADVALI} BEGIN "
+            f"INSERT INTO {FTS_JADVALI}({FTS_JADVALI}, rowid, fish_qidiruv) "
+            f"VALUES ('delete', old.id, old.fish_qidiruv); "
+            f"INSERT INTO {FTS_JADVALI}(rowid, fish_qidiruv) VALUES (new.id, new.fish_qidiruv); END"
+        )
+        # Triggerlar yo'qolgan paytdagi o'zgarishlar ham indeksga tushadi
+        cursor.execute(f"INSERT INTO {FTS_JADVALI}({FTS_JADVALI}) VALUES ('rebuild')")
@@ -0,0 +1,72 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import (
+    ArizaHisoblagichi, BinoXulosasi, Fakultet, Kurs, NavbatYozuvi, UstuvorlikMezoni, Viloyat, Xona,
+    YotoqxonaAriza, YotoqxonaBino, ariza_holati_keshini_tozalash
+)
+from .references import malumotnoma_versiyasini_yangilash
+from .search import sqlite_fts_ornatish
+
+
+@receiver(post_save, sender=Fakultet)
+@receiver(post_delete, sender=Fakultet)
+@receiver(post_save, sender=Kurs)
+@receiver(post_delete, sender=Kurs)
+@receiver(post_save, sender=Viloyat)
+@receiver(post_delete, sender=Viloyat)
+def malumotnoma_ozgardi(sender, **kwargs):
+    """Fakultet, kurs yoki viloyat o'zgarsa - forma tanlovlari keshini eskirtirish"""
+    malumotnoma_versiyasini_yangilash()
+    if sender is not Fakultet:
+        # Ustuvorlik qoidalari kurs raqami / viloyat nomi bo'yicha yozilgan
+        UstuvorlikMezoni.qoidalar_ozgardi()
+
+
+@receiver(post_save, sender=UstuvorlikMezoni)
+@receiver(post_delete, sender=UstuvorlikMezoni)
+def ustuvorlik_mezoni_ozgardi(sender, **kwargs):
+    """Qoida qo'shilsa, o'zgarsa yoki o'chirilsa - barcha arizalar bali qayta hisoblanadi"""
+    UstuvorlikMezoni.qoidalar_ozgardi()
+
+
+@receiver(post_save, sender=YotoqxonaBino)
+def bino_saqlandi(sender, instance, created, **kwargs):
+    """Bino xulosasini (yangi bino uchun - bo'sh) va xonalardagi bino turi nusxasini yangilash"""
+    if not created:
+        instance.xonalar.exclude(bino_turi=instance.turi).update(bino_turi=instance.turi)
+    BinoXulosasi.yangilash(bino_ids=[instance.pk])
+
+
+@receiver(post_save, sender=Xona)
+@receiver(post_delete, sender=Xona)
+def xona_ozgardi(sender, instance, **kwargs):
+    """Xona qo'shilsa, o'zgarsa yoki o'chirilsa - bino xulosasini yangilash"""
+    BinoXulosasi.yangilash(bino_ids=[instance.bino_id])
+
+
+@receiver(post_delete, sender=YotoqxonaAriza)
+def ariza_ochirildi(sender, instance, origin=None, **kwargs):
+    """
+    O'chirilgan ariza hisoblagichdan ayiriladi, band qilgan o'rni bo'shatiladi,
+    hujjat fayllari havolasi kamaytiriladi (oxirgi havola bo'lsa fayl o'chadi).
+    Arxivga ko'chirishda (ArxivAriza.arxivlash) hech narsa qilinmaydi: hisoblagichlar arxivni
+    ham sanaydi, o'rinlar va holat keshi bo'lak bo'yicha ommaviy yangilangan, hujjatlarga endi
+    arxiv yozuvi havola qiladi (hujjat_fayllarini_tozalash ham arxivni sanaydi).
+    """
+    if getattr(origin, 'arxivga_kochirish', False):
+        return
+    ArizaHisoblagichi.ozgartirish(instance.oquv_yili, instance.holat, -1)
+    ariza_holati_keshini_tozalash([instance.ariza_raqami])
+    if instance.holat == 'tasdiqlandi' and instance.tayinlangan_xona_id:
+        if Xona.orin_bosatish(instance.tayinlangan_xona_id):
+            NavbatYozuvi.orinlarni_toldirish([instance.tayinlangan_xona_id], sabab='ochirildi')
+    for fayl in (instance.imtiyoz_hujjat, instance.imtiyoz_miniatyura):
+        if fayl:
+            transaction.on_commit(lambda storage=fayl.storage, nom=fayl.name: storage.delete(nom))
+
+
+def qidiruv_indeksini_tekshirish(sender, using='default', **kwargs):
+    """SQLite: jadval qayta yaratilganda yo'qolgan FTS triggerlarini tiklash (dev)"""
+    sqlite_fts_ornatish(using)
@@ -0,0 +1,71 @@
+from collections import Counter, defaultdict
+
+from django.db.models import Count, Q
+
+from .models import YotoqxonaAriza
+
+
+# GROUP BY o'lchamlari
+OLCHAMLAR = ['fakultet__nomi', 'holat', 'jinsi', 'kurs__raqam', 'viloyat__nomi']
+
+
+def statistika_hisoblash(queryset):
+    """
+    Arizalar statistikasi bitta shartli agregatsiya so'rovida.
+
+    Fakultet × holat × jins × kurs × viloyat bo'yicha guruhlanadi, imtiyozlilar
+    shartli COUNT bilan sanaladi; qolgan kesimlar Python'da yig'iladi.
+    """
+    qatorlar = list(
+        queryset.order_by()
+        .values(*OLCHAMLAR)
+        .annotate(
+            soni=Count('id'),
+            imtiyozli=Count('id', filter=~Q(imtiyoz_turi='yoq')),
+        )
+    )
+
+    holat_nomlari = dict(YotoqxonaAriza.HOLAT_TANLOV)
+    jins_nomlari = dict(YotoqxonaAriza.JINSI)
+
+    fakultetlar = Counter()
+    holatlar = Counter()
+    jinslar = Counter()
+    kurslar = Counter()
+    viloyatlar = Counter()
+    imtiyozlilar = Counter()
+    fakultet_holat = defaultdict(Counter)
+
+    for qator in qatorlar:
+        soni = qator['soni']
+        fakultet = qator['fakultet__nomi']
+        fakultetlar[fakultet] += soni
+        holatlar[qator['holat']] += soni
+        jinslar[qator['jinsi']] += soni
+        kurslar[qator['kurs__raqam']] += soni
+        viloyatlar[qator['viloyat__nomi']] += soni
+        imtiyozlilar[fakultet] += qator['imtiyozli']
+        fakultet_holat[fakultet][qator['holat']] += soni
+
+    holat_kodlari = [kod for kod, _ in YotoqxonaAriza.HOLAT_TANLOV]
+
+    return {
+        'jami': sum(fakultetlar.values()),
+        'erkak': jinslar['erkak'],
+        'ayol': jinslar['ayol'],
+        'imtiyozli': sum(imtiyozlilar.values()),
+        'holatlar': [(holat_nomlari[kod], holatlar[kod]) for kod in holat_kodlari],
+        'jinslar': [(jins_nomlari.get(kod, kod), soni) for kod, soni in sorted(jinslar.items())],
+        'kurslar': [(f"{raqam}-kurs", soni) for raqam, soni in sorted(kurslar.items())],
+        'viloyatlar': viloyatlar.most_common(),
+        'fakultetlar': [
+            {
+                'nomi': nomi,
+                'jami': soni,
+                'imtiyozli': imtiyozlilar[nomi],
+                'holatlar': [fakultet_holat[nomi][kod] for kod in holat_kodlari],
+            }
+            for nomi, soni in sorted(fakultetlar.items())
+        ],
+        'holat_sarlavhalari': [holat_nomlari[kod] for kod in holat_kodlari],
+    }
@@ -0,0 +1,66 @@
+import hashlib
+
+from django.core.cache import cache
+
+from .models import ArxivAriza, YotoqxonaAriza, ariza_holati_kesh_kaliti
+
+
+# Kesh muddati (soniya) - holat o'zgarganda kesh darhol tozalanadi
+HOLAT_KESH_MUDDATI = 30
+
+# Faqat shu ustunlar o'qiladi - hammasi ariza_holat_sorovi_idx ichida (index-only scan)
+HOLAT_MAYDONLARI = (
+    'id', 'ariza_raqami', 'telefon', 'holat', 'ariza_sanasi',
+    'tasdiqlangan_sana', 'yangilangan_sana',
+)
+
+# Topilmagan raqamlar ham qisqa muddat keshlanadi
+_TOPILMADI = {}
+
+
+def ariza_holati(ariza_raqami, telefon):
+    """
+    Raqam va telefon bo'yicha ariza holati (keshdan, bo'lmasa indeks bo'yicha).
+    Joriy jadvalda yo'q bo'lsa - o'tgan yillar arxividan; 'arxiv' kaliti qator qaysi
+    jadvaldan olinganini bildiradi ('id' shu jadvalning pk si).
+    """
+    if not ariza_raqami or not telefon:
+        return None
+    kalit = ariza_holati_kesh_kaliti(ariza_raqami)
+    holat = cache.get(kalit)
+    if holat is None:
+        holat = _TOPILMADI
+        for model, arxiv in ((YotoqxonaAriza, False), (ArxivAriza, True)):
+            qator = model.objects.filter(ariza_raqami=ariza_raqami).values(*HOLAT_MAYDONLARI).first()
+            if qator:
+                # Rad sababi (uzun matn) indeksga kiritilmagan - faqat rad etilganda o'qiladi
+                qator['rad_sababi'] = ''
+                if qator['holat'] == 'rad_etildi':
+                    qator['rad_sababi'] = model.objects.filter(pk=qator['id']).values_list(
+                        'rad_sababi', flat=True).first() or ''
+                holat = {**qator, 'arxiv': arxiv}
+                break
+        cache.set(kalit, holat, HOLAT_KESH_MUDDATI)
+    if not holat or holat['telefon'] != telefon:
+        return None
+    return holat
+
+
+def holat_etag(holat):
+    """Ariza holati uchun ETag qiymati"""
+    matn = f"{holat['ariza_raqami']}:{holat['holat']}:{holat['yangilangan_sana'].isoformat()}"
+    return hashlib.md5(matn.encode()).hexdigest()
+
+
+def holat_json(holat):
+    """API javobi uchun ariza holati"""
+    holat_nomlari = dict(YotoqxonaAriza.HOLAT_TANLOV)
+    return {
+        'ariza_raqami': holat['ariza_raqami'],
+        'holat': holat['holat'],
+        'holat_nomi': holat_nomlari.get(holat['holat'], holat['holat']),
+        'ariza_sanasi': holat['ariza_sanasi'],
+        'tasdiqlangan_sana': holat['tasdiqlangan_sana'],
+        'yangilangan_sana': holat['yangilangan_sana'],
+        'rad_sababi': holat['rad_sababi'] if holat['holat'] == 'rad_etildi' else '',
+    }
@@ -0,0 +1,129 @@
+import gzip
+import hashlib
+import os
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.utils.functional import cached_property
+
+try:
+    import brotli
+except ImportError:  # ixtiyoriy - o'rnatilmagan bo'lsa faqat .gz yaratiladi
+    brotli = None
+
+
+# Siqishdan foyda beradigan (matnli) fayllar
+SIQILADIGAN_KENGAYTMALAR = {'.css', '.js', '.json', '.svg', '.html', '.txt', '.xml', '.map', '.ico'}
+
+
+class SiqilganManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Xeshlangan nomlar + har bir matnli fayl yonida oldindan siqilgan .gz va .br variantlar.
+    StatikFayllarMiddleware ularni Accept-Encoding bo'yicha beradi.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        nomlar = set()
+        for asl_nom, xeshlangan_nom, ishlandi in super().post_process(paths, dry_run, **options):
+            if not isinstance(ishlandi, Exception):
+                nomlar.add(asl_nom)
+                if xeshlangan_nom:
+                    nomlar.add(xeshlangan_nom)
+            yield asl_nom, xeshlangan_nom, ishlandi
+        if dry_run:
+            return
+        for nom in sorted(nomlar):
+            if os.path.splitext(nom)[1].lower() in SIQILADIGAN_KENGAYTMALAR:
+                self._siqish(nom)
+
+    def _siqish(self, nom):
+        yol = self.path(nom)
+        with open(yol, 'rb') as fayl:
+            matn = fayl.read()
+        variantlar = [('.gz', gzip.compress(matn, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variantlar.append(('.br', brotli.compress(matn, quality=11)))
+        for kengaytma, siqilgan in variantlar:
+            # Foyda bermasa variant yozilmaydi
+            if len(siqilgan) < len(matn) * 0.95:
+                with open(yol + kengaytma, 'wb') as fayl:
+                    fayl.write(siqilgan)
+            elif os.path.exists(yol + kengaytma):
+                os.remove(yol + kengaytma)
+
+
+class MaxfiyStorage(FileSystemStorage):
+    """
+    MAXFIY_MEDIA_ROOT dagi shaxsiy fayllar: ommaviy URL yo'q, faqat admin ko'rinishlari
+    (ruxsat tekshiruvi bilan) FileResponse orqali beradi.
+    """
+
+    @cached_property
+    def base_location(self):
+        return self._value_or_setting(self._location, settings.MAXFIY_MEDIA_ROOT)
+
+    def _clear_cached_properties(self, setting, **kwargs):
+        super()._clear_cached_properties(setting, **kwargs)
+        if setting == 'MAXFIY_MEDIA_ROOT':
+            self.__dict__.pop('base_location', None)
+            self.__dict__.pop('location', None)
+
+    def url(self, name):
+        # Ommaviy URL yo'q - havolalar admin ko'rinishlariga (reverse) quriladi
+        return None
+
+
+def maxfiy_storage():
+    """Eksport fayllari uchun storage (FileField storage= callable)"""
+    return MaxfiyStorage()
+
+
+# Kontent manzilli nom: imtiyoz/3f/a2/3fa2...e1.webp
+KONTENT_NOMI = re.compile(r'^[^/]+/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}(\.[a-z0-9]+)?$')
+
+
+class KontentManzilliStorage(MaxfiyStorage):
+    """
+    Fayllar SHA-256 xeshi bo'yicha bo'laklangan papkalarda saqlanadi - bir xil hujjat
+    bir marta yoziladi. Havolalar SaqlanganFayl jadvalida sanaladi, delete() oxirgi
+    havolada faylni o'chiradi. FileField API o'zgarmaydi.
+    """
+
+    def kontent_nomi(self, name, content):
+        xesh = hashlib.sha256()
+        for bolak in content.chunks():
+            xesh.update(bolak)
+        hex_xesh = xesh.hexdigest()
+        prefiks = name.split('/', 1)[0] if '/' in name else 'fayllar'
+        kengaytma = os.path.splitext(name)[1].lower()
+        return f"{prefiks}/{hex_xesh[:2]}/{hex_xesh[2:4]}/{hex_xesh}{kengaytma}"
+
+    def _save(self, name, content):
+        from .models import SaqlanganFayl
+
+        nom = self.kontent_nomi(name, content)
+        with transaction.atomic():
+            SaqlanganFayl.havola_qoshish(nom, content.size)
+            if not super().exists(nom):
+                yozildi = super()._save(nom, content)
+                if yozildi != nom:
+                    # Parallel yozuvchi ulgurgan - mazmun bir xil, nusxa kerak emas
+                    super().delete(yozildi)
+        return nom
+
+    def delete(self, name):
+        from .models import SaqlanganFayl
+
+        if not name:
+            raise ValueError("The name must be given to delete().")
+        with transaction.atomic():
+            if SaqlanganFayl.havola_ayirish(name):
+                super().delete(name)
+
+
+def hujjat_storage():
+    """Imtiyoz hujjatlari va miniatyuralari uchun storage (FileField storage= callable)"""
+    return KontentManzilliStorage()
@@ -1,3 +1,1427 @@
-from django.test import TestCase
+import csv
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.admin import helpers
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, OperationalError, connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from PIL import Image
+
+from .allocation import xonalarni_taqsimlash
+from .checks import frontend_fayllarini_tekshirish, shablondagi_build_fayllari
+from .exports import EKSPORT_USTUNLARI, csv_oqimi, vazifani_bajarish, xlsx_yozish
+from .forms import YotoqxonaArizaForm
+from .models import (
+    ArizaHisoblagichi, ArizaIzohi, ArizaRaqamiKetmaKetligi, ArxivAriza, BinoXulosasi, EksportVazifasi,
+    Fakultet, KunlikArizaStatistikasi, Kurs, Viloyat, YotoqxonaBino, NavbatTarixi, NavbatYozuvi,
+    QavatSozlamasi, UstuvorlikMezoni, Xona, YotoqxonaAriza, SaqlanganFayl, USTUVORLIK_KESH_KALITI, _raqam_bloklari,
+    ariza_holati_kesh_kaliti, ariza_raqami_ajratish, ariza_raqamlari_ajratish, joriy_oquv_yili
+)
+from .references import VERSIYA_KESH_KALITI
+from .statistika import statistika_hisoblash
+from .status import ariza_holati
+
+
+# So'rovlar sonini o'lchaydigan testlar uchun: DatabaseCache murojaatlari hisobga kirmasin
+XOTIRA_KESHI = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def ariza_yaratish(n, **kwargs):
+    """Test uchun ariza"""
+    maydonlar = {
+        'fish': f"Aliyev Vali {n}",
+        'jinsi': 'erkak',
+        'tugilgan_sana': date(2005, 1, 1),
+        'pasport': f"AA{n:07d}",
+        'telefon': f"+998{n:09d}",
+        'viloyat': Viloyat.objects.get_or_create(nomi="Toshkent")[0],
+        'tuman': "Chilonzor",
+        'manzil': "Test ko'chasi",
+        'fakultet': Fakultet.objects.get_or_create(nomi="Informatika")[0],
+        'kurs': Kurs.objects.get_or_create(raqam=1)[0],
+        'oila_azolari': 4,
+        'holat': 'korilmoqda',
+    }
+    maydonlar.update(kwargs)
+    return YotoqxonaAriza.objects.create(**maydonlar)
+
+
+def bino_yaratish(raqam=1, turi='erkak', xonalar=1, sig_imi=2):
+    """Test uchun bino va uning xonalari"""
+    bino = YotoqxonaBino.objects.create(
+        raqam=raqam, nomi=f"{raqam}-bino", turi=turi, manzil="Test",
+        qavatlar_soni=1, har_qavatda_xonalar=xonalar
+    )
+    for i in range(xonalar):
+        Xona.objects.create(bino=bino, raqam=str(101 + i), qavat=1, sig_imi=sig_imi)
+    return bino
+
+
+class XonaBandligiTest(TestCase):
+    """band_orinlar faqat tasdiqlandi holatiga kirish/chiqishda o'zgaradi"""
+
+    def setUp(self):
+        self.xona = bino_yaratish(sig_imi=2).xonalar.get()
+        self.ariza = ariza_yaratish(1)
+
+    def test_qayta_saqlash_hisoblagichni_oshirmaydi(self):
+        self.ariza.holat = 'tasdiqlandi'
+        self.ariza.tayinlangan_xona = self.xona
+        self.ariza.save()
+        self.ariza.izoh = "Yangilandi"
+        self.ariza.save()
+        YotoqxonaAriza.objects.get(pk=self.ariza.pk).save()
+
+        self.xona.refresh_from_db()
+        self.assertEqual(self.xona.band_orinlar, 1)
+
+    def test_rad_etish_orinni_bosatadi(self):
+        self.ariza.holat = 'tasdiqlandi'
+        self.ariza.tayinlangan_xona = self.xona
+        self.ariza.save()
+
+        YotoqxonaAriza.objects.filter(pk=self.ariza.pk).holatni_ozgartirish('rad_etildi')
+
+        self.xona.refresh_from_db()
+        self.assertEqual(self.xona.band_orinlar, 0)
+
+    def test_toliq_xonaga_tasdiqlab_bolmaydi(self):
+        Xona.objects.filter(pk=self.xona.pk).update(band_orinlar=2)
+        self.ariza.holat = 'tasdiqlandi'
+        self.ariza.tayinlangan_xona = self.xona
+
+        with self.assertRaises(ValidationError):
+            self.ariza.save()
+        self.assertEqual(YotoqxonaAriza.objects.get(pk=self.ariza.pk).holat, 'korilmoqda')
+
+
+class XonalarniTaqsimlashTest(TestCase):
+    """Ommaviy taqsimlash: jins, sig'im, ustuvorlik tartibi va joy tugashi"""
+
+    def setUp(self):
+        self.erkak_xona = bino_yaratish(raqam=1, turi='erkak', sig_imi=2).xonalar.get()
+        self.ayol_xona = bino_yaratish(raqam=2, turi='ayol', sig_imi=2).xonalar.get()
+
+    def taqsimlash(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return xonalarni_taqsimlash(YotoqxonaAriza.objects.all())
+
+    def test_jins_mos_xonaga(self):
+        erkak = ariza_yaratish(1)
+        ayol = ariza_yaratish(2, jinsi='ayol')
+
+        self.assertEqual(len(self.taqsimlash()), 2)
+        erkak.refresh_from_db()
+        ayol.refresh_from_db()
+        self.assertEqual((erkak.holat, erkak.tayinlangan_xona), ('tasdiqlandi', self.erkak_xona))
+        self.assertEqual((ayol.holat, ayol.tayinlangan_xona), ('tasdiqlandi', self.ayol_xona))
+
+    def test_sig_imdan_oshmaydi_va_ustuvorlik_tartibi(self):
+        arizalar = [ariza_yaratish(n) for n in range(1, 5)]
+        # Keyinroq yuborilgan, lekin bali yuqori arizalar birinchi joylashadi
+        YotoqxonaAriza.objects.filter(pk__in=[arizalar[2].pk, arizalar[3].pk]).update(ustuvorlik_bali=10)
+
+        natija = self.taqsimlash()
+        self.assertEqual([a.pk for a in natija.joylashtirildi], [arizalar[2].pk, arizalar[3].pk])
+        self.assertEqual([a.pk for a in natija.joy_topilmadi], [arizalar[0].pk, arizalar[1].pk])
+        self.erkak_xona.refresh_from_db()
+        self.assertEqual(self.erkak_xona.band_orinlar, self.erkak_xona.sig_imi)
+        self.assertEqual(
+            YotoqxonaAriza.objects.filter(tayinlangan_xona=self.erkak_xona, holat='tasdiqlandi').count(),
+            self.erkak_xona.sig_imi,
+        )
+
+    def test_joy_tugasa_navbatga(self):
+        for n in range(1, 4):
+            ariza_yaratish(n, jinsi='ayol')
+        Xona.objects.filter(pk=self.ayol_xona.pk).update(band_orinlar=1)
+
+        natija = self.taqsimlash()
+        self.assertEqual((len(natija), len(natija.joy_topilmadi)), (1, 2))
+        self.assertEqual(YotoqxonaAriza.objects.filter(holat='navbatda').count(), 2)
+        self.assertEqual(NavbatYozuvi.objects.count(), 2)
+        self.assertEqual(ArizaHisoblagichi.objects.get(holat='tasdiqlandi').soni, 1)
+        # Bo'sh erkaklar xonasi ayollarga berilmaydi
+        self.erkak_xona.refresh_from_db()
+        self.assertEqual(self.erkak_xona.band_orinlar, 0)
+
+        # Joy qolmagan - qayta taqsimlash hech narsa o'zgartirmaydi
+        natija = self.taqsimlash()
+        self.assertEqual((len(natija), len(natija.joy_topilmadi)), (0, 2))
+        self.assertEqual(NavbatYozuvi.objects.count(), 2)
+
+
+class ArizaRaqamiTest(TransactionTestCase):
+    """Ariza raqamlari: yillik ketma-ketlik, yil almashishi va worker bloklari"""
+
+    def setUp(self):
+        # Jarayon ichidagi bloklar testlar orasida o'tmasin
+        _raqam_bloklari.clear()
+        self.addCleanup(_raqam_bloklari.clear)
+
+    def oxirgi(self, yil):
+        return ArizaRaqamiKetmaKetligi.objects.get(yil=yil).oxirgi_raqam
+
+    def test_yillik_ketma_ketlik(self):
+        self.assertEqual(ariza_raqami_ajratish(2025), 'YA-2025-0000001')
+        self.assertEqual(ariza_raqami_ajratish(2025), 'YA-2025-0000002')
+        self.assertEqual(ariza_raqami_ajratish(2026), 'YA-2026-0000001')
+        self.assertEqual(
+            ariza_raqamlari_ajratish(3, 2025), ['YA-2025-0000003', 'YA-2025-0000004', 'YA-2025-0000005']
+        )
+        self.assertEqual((self.oxirgi(2025), self.oxirgi(2026)), (5, 1))
+
+    def test_yil_almashishi(self):
+        yil_oxiri = datetime(2025, 12, 31, 23, 59, tzinfo=dt_timezone.utc)
+        with mock.patch.object(timezone, 'now', return_value=yil_oxiri):
+            self.assertEqual(ariza_raqami_ajratish(), 'YA-2025-0000001')
+        with mock.patch.object(timezone, 'now', return_value=yil_oxiri + timedelta(minutes=2)):
+            self.assertEqual(ariza_raqami_ajratish(), 'YA-2026-0000001')
+            self.assertEqual(ariza_raqamlari_ajratish(2), ['YA-2026-0000002', 'YA-2026-0000003'])
+
+    @override_settings(ARIZA_RAQAM_BLOK_HAJMI=3)
+    def test_blok_bilan_ajratish(self):
+        raqamlar = [ariza_raqami_ajratish(2025) for _ in range(4)]
+        self.assertEqual(raqamlar, [f'YA-2025-{n:07d}' for n in range(1, 5)])
+        # Ikki blok olingan: 1-3 va 4-6
+        self.assertEqual(self.oxirgi(2025), 6)
+
+        # Yangi yil bloki eski yildagi qoldiqqa bog'liq emas
+        self.assertEqual(ariza_raqami_ajratish(2026), 'YA-2026-0000001')
+        self.assertEqual(self.oxirgi(2026), 3)
+
+        # Boshqa worker (blok ro'yxati bo'sh) takroriy raqam olmaydi
+        _raqam_bloklari.clear()
+        self.assertEqual(ariza_raqami_ajratish(2025), 'YA-2025-0000007')
+
+        # Tranzaksiya ichida blok olinmaydi - bekor qilinsa raqamlar yo'qolmasin
+        _raqam_bloklari.clear()
+        with transaction.atomic():
+            self.assertEqual(ariza_raqami_ajratish(2027), 'YA-2027-0000001')
+        self.assertEqual(self.oxirgi(2027), 1)
+
+
+class BinoXulosasiTest(TestCase):
+    """Bino xulosasi xona qo'shilganda/o'chirilganda va o'rin band qilinganda/bo'shatilganda yangilanadi"""
+
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bino = bino_yaratish(sig_imi=2)
+        self.xona = self.bino.xonalar.get()
+
+    def xulosa(self):
+        xulosa = BinoXulosasi.objects.get(bino=self.bino)
+        return (xulosa.xonalar_soni, xulosa.band_xonalar, xulosa.jami_orinlar, xulosa.band_orinlar)
+
+    def test_xona_qoshish_va_ochirish(self):
+        self.assertEqual(self.xulosa(), (1, 0, 2, 0))
+        with self.captureOnCommitCallbacks(execute=True):
+            xona = Xona.objects.create(bino=self.bino, raqam='102', qavat=1, sig_imi=3)
+        self.assertEqual(self.xulosa(), (2, 0, 5, 0))
+        with self.captureOnCommitCallbacks(execute=True):
+            xona.delete()
+        self.assertEqual(self.xulosa(), (1, 0, 2, 0))
+
+    def test_tasdiqlash_va_bosatish(self):
+        ariza = ariza_yaratish(1)
+        ariza.holat = 'tasdiqlandi'
+        ariza.tayinlangan_xona = self.xona
+        with self.captureOnCommitCallbacks(execute=True):
+            ariza.save()
+        self.assertEqual(self.xulosa(), (1, 1, 2, 1))
+        self.assertEqual(BinoXulosasi.objects.get(bino=self.bino).bosh_orinlar, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            YotoqxonaAriza.objects.filter(pk=ariza.pk).holatni_ozgartirish('rad_etildi')
+        self.assertEqual(self.xulosa(), (1, 0, 2, 0))
+
+
+class ParallelTasdiqlashTest(TransactionTestCase):
+    """Bir vaqtda tasdiqlashda xona to'lib ketmasligi"""
+
+    OQIMLAR = 8
+
+    def test_parallel_tasdiqlash_ortiqcha_band_qilmaydi(self):
+        xona = bino_yaratish(sig_imi=3).xonalar.get()
+        arizalar = [ariza_yaratish(i) for i in range(self.OQIMLAR)]
+        tosiq = threading.Barrier(self.OQIMLAR)
+        natijalar = []
+
+        def tasdiqlash(ariza_id):
+            try:
+                ariza = YotoqxonaAriza.objects.get(pk=ariza_id)
+                ariza.holat = 'tasdiqlandi'
+                ariza.tayinlangan_xona_id = xona.pk
+                tosiq.wait()
+                while True:
+                    try:
+                        ariza.save()
+                        natijalar.append(True)
+                        break
+                    except ValidationError:
+                        natijalar.append(False)
+                        break
+                    except OperationalError:
+                        # SQLite jadval qulfi - qayta urinish
+                        continue
+            finally:
+                connection.close()
+
+        oqimlar = [threading.Thread(target=tasdiqlash, args=(a.pk,)) for a in arizalar]
+        for oqim in oqimlar:
+            oqim.start()
+        for oqim in oqimlar:
+            oqim.join()
+
+        xona.refresh_from_db()
+        self.assertEqual(natijalar.count(True), 3)
+        self.assertEqual(xona.band_orinlar, 3)
+        self.assertEqual(
+            YotoqxonaAriza.objects.filter(holat='tasdiqlandi', tayinlangan_xona=xona).count(), 3
+        )
+
+
+@override_settings(CACHES=XOTIRA_KESHI)
+class AdminSorovlarSoniTest(TestCase):
+    """Admin ro'yxat sahifalari so'rovlar soni qatorlar soniga bog'liq emas"""
+
+    # changelist URL nomi -> kutilgan so'rovlar soni
+    SAHIFALAR = {
+        'admin:dormitory_app_fakultet_changelist': 5,
+        'admin:dormitory_app_kurs_changelist': 5,
+        'admin:dormitory_app_viloyat_changelist': 5,
+        'admin:dormitory_app_yotoqxonabino_changelist': 6,
+        'admin:dormitory_app_xona_changelist': 7,
+        'admin:dormitory_app_yotoqxonaariza_changelist': 10,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'parol')
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def malumotlar_qoshish(self, soni):
+        boshi = YotoqxonaBino.objects.count() + 1
+        for i in range(boshi, boshi + soni):
+            bino_yaratish(raqam=i, xonalar=2)
+            Fakultet.objects.create(nomi=f"Fakultet {i}")
+            Viloyat.objects.create(nomi=f"Viloyat {i}")
+            Kurs.objects.get_or_create(raqam=min(i, 5))
+            ariza_yaratish(i, fakultet=Fakultet.objects.get(nomi=f"Fakultet {i}"))
+
+    def sahifalarni_tekshirish(self):
+        for url_nomi, kutilgan in self.SAHIFALAR.items():
+            with self.subTest(url_nomi, qatorlar=YotoqxonaBino.objects.count()):
+                cache.clear()
+                with self.assertNumQueries(kutilgan):
+                    javob = self.client.get(reverse(url_nomi))
+                self.assertEqual(javob.status_code, 200)
+
+    def test_sorovlar_soni_ozgarmas(self):
+        self.malumotlar_qoshish(1)
+        self.sahifalarni_tekshirish()
+        self.malumotlar_qoshish(9)
+        self.sahifalarni_tekshirish()
+
+    def test_statistika_alohida_sanoqlarga_teng(self):
+        self.malumotlar_qoshish(3)
+        ariza_yaratish(10, jinsi='ayol', holat='rad_etildi', imtiyoz_turi='yetim')
+        ariza_yaratish(11, holat='yangi', kurs=Kurs.objects.get(raqam=2))
+        arizalar = YotoqxonaAriza.objects.all()
+
+        stats = statistika_hisoblash(arizalar)
+        self.assertEqual(stats['holatlar'], [
+            (nomi, arizalar.filter(holat=kod).count()) for kod, nomi in YotoqxonaAriza.HOLAT_TANLOV
+        ])
+        self.assertEqual((stats['jami'], stats['erkak'], stats['ayol']), (
+            arizalar.count(), arizalar.filter(jinsi='erkak').count(), arizalar.filter(jinsi='ayol').count()
+        ))
+        self.assertEqual(stats['imtiyozli'], arizalar.exclude(imtiyoz_turi='yoq').count())
+        for fakultet in stats['fakultetlar']:
+            self.assertEqual(fakultet['jami'], arizalar.filter(fakultet__nomi=fakultet['nomi']).count())
+
+    def test_statistika_royxatdan_ochiladi(self):
+        javob = self.client.get(reverse('admin:dormitory_app_yotoqxonaariza_changelist') + '?holat__exact=yangi')
+        self.assertContains(javob, reverse('admin:dormitory_statistika') + '?holat__exact=yangi')
+        javob = self.client.get(reverse('admin:dormitory_statistika') + '?holat__exact=yangi')
+        self.assertEqual(javob.status_code, 200)
+
+
+@override_settings(CACHES=XOTIRA_KESHI)
+class MalumotnomaKeshiTest(TestCase):
+    """Ariza formasi ma'lumotnomalarni keshdan oladi"""
+
+    def setUp(self):
+        cache.delete(VERSIYA_KESH_KALITI)
+        self.viloyat = Viloyat.objects.create(nomi="Toshkent")
+        self.fakultet = Fakultet.objects.create(nomi="Informatika")
+        self.kurs = Kurs.objects.create(raqam=1)
+
+    def forma_malumotlari(self):
+        return {
+            'fish': "Aliyev Vali", 'jinsi': 'erkak', 'tugilgan_sana': '2005-01-01',
+            'pasport': 'AA1234567', 'telefon': '+998901234567',
+            'viloyat': self.viloyat.pk, 'tuman': "Chilonzor", 'manzil': "Test",
+            'fakultet': self.fakultet.pk, 'kurs': self.kurs.pk,
+            'oila_azolari': 4, 'imtiyoz_turi': 'yoq',
+        }
+
+    def test_forma_sorovsiz(self):
+        self.client.get(reverse('dormitory:home'))
+        with self.assertNumQueries(0):
+            self.client.get(reverse('dormitory:home'))
+        with self.assertNumQueries(0):
+            forma = YotoqxonaArizaForm(data=self.forma_malumotlari())
+            self.assertTrue(forma.is_valid(), forma.errors)
+        self.assertEqual(forma.cleaned_data['fakultet'], self.fakultet)
+
+    def test_ozgarish_keshni_yangilaydi(self):
+        YotoqxonaArizaForm(data=self.forma_malumotlari()).is_valid()
+        with self.captureOnCommitCallbacks(execute=True):
+            yangi = Viloyat.objects.create(nomi="Samarqand")
+        forma = YotoqxonaArizaForm(data={**self.forma_malumotlari(), 'viloyat': yangi.pk})
+        self.assertTrue(forma.is_valid(), forma.errors)
+
+
+class StatikFayllarTest(TestCase):
+    """Static/media fayllar middleware orqali: siqilgan variant, 304 va Range"""
+
+    def setUp(self):
+        self.papka = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.papka)
+        os.makedirs(os.path.join(self.papka, 'static', 'css'))
+        self.matn = b'body { color: red; }\n' * 100
+        yol = os.path.join(self.papka, 'static', 'css', 'app.0123456789ab.css')
+        with open(yol, 'wb') as fayl:
+            fayl.write(self.matn)
+        with open(yol + '.gz', 'wb') as fayl:
+            fayl.write(gzip.compress(self.matn))
+        sozlama = override_settings(
+            STATIC_ROOT=os.path.join(self.papka, 'static'), STATIC_URL='/static/',
+            MEDIA_ROOT=os.path.join(self.papka, 'media'), MEDIA_URL='/media/',
+        )
+        sozlama.enable()
+        self.addCleanup(sozlama.disable)
+        self.url = '/static/css/app.0123456789ab.css'
+
+    def test_siqilgan_variant_va_304(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), self.matn)
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_range(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=5-9')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 5-9/{len(self.matn)}')
+        self.assertEqual(b''.join(response.streaming_content), self.matn[5:10])
+
+        response = self.client.get(self.url, HTTP_RANGE=f'bytes={len(self.matn)}-')
+        self.assertEqual(response.status_code, 416)
+
+    async def test_asgi(self):
+        response = await self.async_client.get(self.url, headers={'Range': 'bytes=-4'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join([bolak async for bolak in response.streaming_content]), self.matn[-4:])
+
+    def test_yolni_tark_etib_bolmaydi(self):
+        response = self.client.get('/static/../media/x')
+        self.assertNotEqual(response.status_code, 200)
+
+    def test_faqat_ommaviy_media_papkalari(self):
+        for nom in ('eksport/2026/10/arizalar.csv', 'rasmlar/bino.txt'):
+            yol = os.path.join(self.papka, 'media', nom)
+            os.makedirs(os.path.dirname(yol), exist_ok=True)
+            with open(yol, 'w') as fayl:
+                fayl.write("pasport,telefon")
+
+        self.assertEqual(self.client.get('/media/eksport/2026/10/arizalar.csv').status_code, 404)
+        self.assertEqual(self.client.get('/media/rasmlar/bino.txt').status_code, 404)
+        with override_settings(OMMAVIY_MEDIA_PAPKALARI=['rasmlar']):
+            client = self.client_class()
+            self.assertEqual(client.get('/media/rasmlar/bino.txt').status_code, 200)
+            self.assertEqual(client.get('/media/eksport/2026/10/arizalar.csv').status_code, 404)
+            self.assertEqual(client.get('/media/rasmlar/../eksport/2026/10/arizalar.csv').status_code, 404)
+
+    def test_frontend_build_tekshiruvi(self):
+        manifest = {
+            'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+            'staticfiles': {'BACKEND': 'apps.dormitory_app.storage.SiqilganManifestStaticFilesStorage'},
+        }
+        manba = os.path.join(self.papka, 'manba')
+        with override_settings(STORAGES=manifest, STATICFILES_DIRS=[manba]):
+            os.makedirs(manba)
+            xatolar = frontend_fayllarini_tekshirish(None)
+            self.assertEqual([xato.id for xato in xatolar], ['dormitory_app.E001'])
+            self.assertIn('build/app.css', xatolar[0].msg)
+
+            for nom in shablondagi_build_fayllari():
+                yol = os.path.join(manba, nom)
+                os.makedirs(os.path.dirname(yol), exist_ok=True)
+                open(yol, 'w').close()
+            self.assertEqual(frontend_fayllarini_tekshirish(None), [])
+
+        # Oddiy storage'da yo'q fayl faqat 404 - tekshiruv ishlamaydi
+        self.assertEqual(frontend_fayllarini_tekshirish(None), [])
+
+
+@override_settings(HUJJAT_ISHLOV_OQIMLARI=0)
+class ImtiyozHujjatiTest(TestCase):
+    """Yuklangan rasm EXIF'siz WebP'ga aylanadi va miniatyura yaratiladi"""
+
+    def setUp(self):
+        papka = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, papka)
+        sozlama = override_settings(MEDIA_ROOT=papka, MAXFIY_MEDIA_ROOT=papka)
+        sozlama.enable()
+        self.addCleanup(sozlama.disable)
+
+    def test_rasm_webp_va_miniatyura(self):
+        rasm = Image.new('RGB', (3000, 2000), 'white')
+        exif = Image.Exif()
+        exif[0x0110] = "Telefon modeli"
+        bufer = io.BytesIO()
+        rasm.save(bufer, 'JPEG', exif=exif)
+        hujjat = SimpleUploadedFile('hujjat.jpg', bufer.getvalue(), content_type='image/jpeg')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ariza = ariza_yaratish(1, imtiyoz_turi='yetim', imtiyoz_hujjat=hujjat)
+
+        ariza.refresh_from_db()
+        self.assertEqual(ariza.hujjat_holati, 'tayyor')
+        self.assertTrue(ariza.imtiyoz_hujjat.name.endswith('.webp'))
+        with Image.open(ariza.imtiyoz_hujjat.path) as natija:
+            self.assertEqual(natija.format, 'WEBP')
+            self.assertLessEqual(max(natija.size), 2000)
+            self.assertEqual(len(natija.getexif()), 0)
+        with Image.open(ariza.imtiyoz_miniatyura.path) as miniatyura:
+            self.assertLessEqual(max(miniatyura.size), 240)
+
+    def test_soxta_kengaytma_rad_etiladi(self):
+        forma = YotoqxonaArizaForm(
+            data={'imtiyoz_turi': 'yetim'},
+            files={'imtiyoz_hujjat': SimpleUploadedFile('hujjat.png', b'MZ\x90\x00 exe fayl')},
+        )
+        forma.is_valid()
+        self.assertIn('imtiyoz_hujjat', forma.errors)
+
+
+class KontentManzilliStorageTest(TestCase):
+    """Bir xil hujjat bir marta saqlanadi, oxirgi havola o'chganda fayl o'chadi"""
+
+    def setUp(self):
+        papka = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, papka)
+        self.media = os.path.join(papka, 'media')
+        self.maxfiy = os.path.join(papka, 'maxfiy')
+        sozlama = override_settings(
+            MEDIA_ROOT=self.media, MEDIA_URL='/media/', MAXFIY_MEDIA_ROOT=self.maxfiy, HUJJAT_ISHLOV_OQIMLARI=0
+        )
+        sozlama.enable()
+        self.addCleanup(sozlama.disable)
+
+    def test_takroriy_yuklash(self):
+        matn = b'%PDF-1.4 oila tarkibi haqida ma\'lumotnoma'
+        arizalar = [
+            ariza_yaratish(n, imtiyoz_turi='yetim', imtiyoz_hujjat=SimpleUploadedFile(f'hujjat{n}.pdf', matn))
+            for n in (1, 2)
+        ]
+        nom = arizalar[0].imtiyoz_hujjat.name
+        self.assertEqual(nom, arizalar[1].imtiyoz_hujjat.name)
+        self.assertRegex(nom, r'^imtiyoz/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.pdf$')
+        self.assertEqual(SaqlanganFayl.objects.get(nom=nom).havolalar, 2)
+
+        storage = arizalar[0].imtiyoz_hujjat.storage
+        with self.captureOnCommitCallbacks(execute=True):
+            arizalar[0].delete()
+        self.assertTrue(storage.exists(nom))
+        with self.captureOnCommitCallbacks(execute=True):
+            arizalar[1].delete()
+        self.assertFalse(storage.exists(nom))
+        self.assertFalse(SaqlanganFayl.objects.exists())
+
+    def test_arxivlanganda_havola_arxivga_otadi(self):
+        matn = b'%PDF-1.4 nogironlik guvohnomasi'
+        eski, joriy = [
+            ariza_yaratish(n, oquv_yili=yil, imtiyoz_turi='yetim', imtiyoz_hujjat=SimpleUploadedFile('h.pdf', matn))
+            for n, yil in ((1, '2020-2021'), (2, joriy_oquv_yili()))
+        ]
+        nom = eski.imtiyoz_hujjat.name
+        with self.captureOnCommitCallbacks(execute=True):
+            ArxivAriza.arxivlash(['2020-2021'])
+        # Arxiv yozuvi hujjatga havola qiladi - fayl ham, havolalar soni ham saqlanadi
+        self.assertEqual(ArxivAriza.objects.get().malumotlar['imtiyoz_hujjat'], nom)
+        self.assertEqual(SaqlanganFayl.objects.get(nom=nom).havolalar, 2)
+        # Joriy ariza o'chirilsa - havola oddiy yo'l bilan kamayadi, fayl arxiv uchun qoladi
+        with self.captureOnCommitCallbacks(execute=True):
+            joriy.delete()
+        self.assertEqual(SaqlanganFayl.objects.get(nom=nom).havolalar, 1)
+        self.assertTrue(joriy.imtiyoz_hujjat.storage.exists(nom))
+
+    def test_hujjat_faqat_admin_orqali(self):
+        matn = b'%PDF-1.4 yetimlik guvohnomasi'
+        ariza = ariza_yaratish(1, imtiyoz_turi='yetim', imtiyoz_hujjat=SimpleUploadedFile('hujjat.pdf', matn))
+        nom = ariza.imtiyoz_hujjat.name
+        self.assertTrue(os.path.exists(os.path.join(self.maxfiy, nom)))
+        self.assertFalse(os.path.exists(os.path.join(self.media, nom)))
+        self.assertEqual(self.client.get('/media/' + nom).status_code, 404)
+
+        url = reverse('admin:dormitory_ariza_hujjati', args=[ariza.pk, 'imtiyoz_hujjat'])
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'parol'))
+        javob = self.client.get(url)
+        self.assertEqual(b''.join(javob.streaming_content), matn)
+        self.assertEqual(self.client.get(url.replace('imtiyoz_hujjat', 'pasport')).status_code, 404)
+        javob = self.client.get(reverse('admin:dormitory_app_yotoqxonaariza_change', args=[ariza.pk]))
+        self.assertContains(javob, url)
+
+        # Holat sahifasi hujjatga ommaviy havola bermaydi
+        javob = self.client.post(
+            reverse('dormitory:status'), {'ariza_raqami': ariza.ariza_raqami, 'telefon': ariza.telefon}
+        )
+        self.assertContains(javob, "Imtiyoz hujjati yuklangan")
+        self.assertNotContains(javob, nom)
+
+
+class ArizaQidiruviTest(TestCase):
+    """Admin qidiruvi: F.I.SH lotin/kirill farqsiz, telefon va pasport prefiks bo'yicha"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'parol')
+        cls.gulnoza = ariza_yaratish(1, fish="G'ulomova Gulnoza O'ktamovna", telefon='+998901112233')
+        cls.shoxruh = ariza_yaratish(2, fish="Шоҳруҳ Қўчқоров", telefon='+998935556677', pasport='AB7654321')
+        ariza_yaratish(3, fish="Karimov Anvar")
+        cls.li = ariza_yaratish(4, fish="Li Xua")
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def qidirish(self, soz):
+        javob = self.client.get(reverse('admin:dormitory_app_yotoqxonaariza_changelist'), {'q': soz})
+        self.assertEqual(javob.status_code, 200)
+        return set(javob.context['cl'].result_list)
+
+    def test_fish(self):
+        self.assertEqual(self.qidirish("gulomova"), {self.gulnoza})
+        self.assertEqual(self.qidirish("Ғуломова октам"), {self.gulnoza})
+        self.assertEqual(self.qidirish("shohruh qochqorov"), {self.shoxruh})
+        self.assertEqual(self.qidirish("ruh"), {self.shoxruh})
+        # Ikki harf - pasport emas, ism
+        self.assertEqual(self.qidirish("li"), {self.li})
+
+    def test_telefon_va_pasport(self):
+        self.assertEqual(self.qidirish("+99893 555"), {self.shoxruh})
+        self.assertEqual(self.qidirish("90111"), {self.gulnoza})
+        self.assertEqual(self.qidirish("ab765"), {self.shoxruh})
+        self.assertEqual(self.qidirish(self.gulnoza.ariza_raqami), {self.gulnoza})
+
+    def test_ism_ozgarsa_indeks_yangilanadi(self):
+        self.shoxruh.fish = "Rustamov Jasur"
+        self.shoxruh.save(update_fields=['fish'])
+        self.assertEqual(self.qidirish("qochqorov"), set())
+        self.assertEqual(self.qidirish("jasur"), {self.shoxruh})
+
+    def test_arxiv(self):
+        ArxivAriza.objects.bulk_create([ArxivAriza.nusxa(a) for a in (self.gulnoza, self.shoxruh)])
+        url = reverse('admin:dormitory_app_arxivariza_changelist')
+
+        def raqamlar(soz):
+            javob = self.client.get(url, {'q': soz})
+            return {arxiv.ariza_raqami for arxiv in javob.context['cl'].result_list}
+
+        self.assertEqual(raqamlar("+99893 555"), {self.shoxruh.ariza_raqami})
+        self.assertEqual(raqamlar("90111"), {self.gulnoza.ariza_raqami})
+        self.assertEqual(raqamlar("ab765"), {self.shoxruh.ariza_raqami})
+        self.assertEqual(raqamlar(self.gulnoza.ariza_raqami.lower()), {self.gulnoza.ariza_raqami})
+        self.assertEqual(raqamlar("gulnoza"), {self.gulnoza.ariza_raqami})
+        # Raqam faqat prefiks - o'rtasidagi moslik topilmaydi
+        self.assertEqual(raqamlar("5556677"), set())
+
+
+class KursorliSahifalashTest(TestCase):
+    """Arizalar ro'yxati standart tartibda kursor bilan sahifalanadi"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'parol')
+        cls.arizalar = [ariza_yaratish(n) for n in range(1, 31)]
+        # Bir xil sana - tartibni id hal qiladi
+        YotoqxonaAriza.objects.filter(pk__in=[a.pk for a in cls.arizalar[10:20]]).update(
+            ariza_sanasi=cls.arizalar[10].ariza_sanasi
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+        self.url = reverse('admin:dormitory_app_yotoqxonaariza_changelist')
+
+    def test_keyingi_va_oldingi(self):
+        tartib = list(YotoqxonaAriza.objects.order_by('-ariza_sanasi', '-pk'))
+        cl = self.client.get(self.url).context['cl']
+        self.assertEqual(list(cl.result_list), tartib[:25])
+        self.assertIsNone(cl.oldingi_url)
+
+        cl = self.client.get(self.url + cl.keyingi_url).context['cl']
+        self.assertEqual(list(cl.result_list), tartib[25:])
+        self.assertIsNone(cl.keyingi_url)
+        self.assertEqual(cl.result_count, 30)
+
+        cl = self.client.get(self.url + cl.oldingi_url).context['cl']
+        self.assertEqual(list(cl.result_list), tartib[:25])
+
+    def test_boshqa_tartibda_oddiy_sahifalar(self):
+        javob = self.client.get(self.url, {'o': '3', 'p': '2'})
+        self.assertFalse(javob.context['cl'].kursor_rejimi)
+        self.assertEqual(len(javob.context['cl'].result_list), 5)
+
+    def test_notogri_kursor(self):
+        javob = self.client.get(self.url, {'keyingi': 'abc'})
+        self.assertRedirects(javob, self.url + '?e=1', fetch_redirect_response=False)
+
+
+@override_settings(CACHES=XOTIRA_KESHI)
+class FacetSanoqlariTest(TestCase):
+    """Filtr tanlovlari yonidagi sonlar bitta so'rovda hisoblanadi va keshlanadi"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'parol')
+        ariza_yaratish(1)
+        ariza_yaratish(2, jinsi='ayol')
+        ariza_yaratish(3, jinsi='ayol', holat='yangi')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+        self.url = reverse('admin:dormitory_app_yotoqxonaariza_changelist')
+
+    def tanlovlar(self, javob, sarlavha):
+        filtr = next(f for f in javob.context['cl'].filter_specs if f.title == sarlavha)
+        return [tanlov['display'] for tanlov in filtr.choices(javob.context['cl'])]
+
+    def test_sonlar(self):
+        javob = self.client.get(self.url)
+        self.assertIn("Ayol (2)", self.tanlovlar(javob, "Jinsi"))
+        self.assertIn("📝 Yangi (1)", self.tanlovlar(javob, "Holat"))
+
+        # Faol filtr o'z sonlarini o'zisiz, qolganlari filtrlangan ro'yxat bo'yicha
+        javob = self.client.get(self.url, {'jinsi__exact': 'ayol'})
+        self.assertIn("Erkak (1)", self.tanlovlar(javob, "Jinsi"))
+        self.assertIn("👀 Ko'rib chiqilmoqda (1)", self.tanlovlar(javob, "Holat"))
+
+    def test_kesh(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(AdminSorovlarSoniTest.SAHIFALAR[
+            'admin:dormitory_app_yotoqxonaariza_changelist'
+        ] - 1):
+            self.client.get(self.url)
+
+
+class ImportTest(TestCase):
+    """CSV/XLSX import: forma qoidalari, hisoblagichlar, xatolar hisoboti va davom ettirish"""
+
+    USTUNLAR = [
+        'fish', 'jinsi', 'tugilgan_sana', 'pasport', 'telefon', 'viloyat',
+        'tuman', 'manzil', 'fakultet', 'kurs', 'oila_azolari',
+    ]
+
+    def setUp(self):
+        self.papka = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.papka)
+        Viloyat.objects.create(nomi="Toshkent")
+        Fakultet.objects.create(nomi="Informatika", qisqartma="IT")
+        Kurs.objects.create(raqam=1)
+
+    def csv_fayl(self, qatorlar):
+        yol = os.path.join(self.papka, 'arizalar.csv')
+        with open(yol, 'w', newline='', encoding='utf-8') as fayl:
+            yozuvchi = csv.writer(fayl)
+            yozuvchi.writerow(self.USTUNLAR)
+            yozuvchi.writerows(qatorlar)
+        return yol
+
+    def qator(self, n, **kwargs):
+        qiymatlar = {
+            'fish': f"karimov anvar {n}", 'jinsi': 'erkak', 'tugilgan_sana': '15.03.2006',
+            'pasport': f"ab{n:07d}", 'telefon': f"90{n:07d}", 'viloyat': 'toshkent',
+            'tuman': "Yunusobod", 'manzil': "Uy 5", 'fakultet': 'IT', 'kurs': '1', 'oila_azolari': '5',
+        }
+        qiymatlar.update(kwargs)
+        return [qiymatlar[ustun] for ustun in self.USTUNLAR]
+
+    def test_arizalar(self):
+        yol = self.csv_fayl([self.qator(1), self.qator(2, fish="Anvar"), self.qator(3, viloyat="Xiva")])
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('import_qilish', 'ariza', yol, stdout=io.StringIO())
+
+        ariza = YotoqxonaAriza.objects.get()
+        self.assertEqual(ariza.fish, "Karimov Anvar 1")
+        self.assertEqual((ariza.pasport, ariza.telefon), ('AB0000001', '+998900000001'))
+        self.assertEqual(ariza.tugilgan_sana, date(2006, 3, 15))
+        self.assertRegex(ariza.ariza_raqami, r'^YA-\d{4}-\d{7}$')
+        self.assertEqual((ariza.fish_qidiruv, ariza.telefon_qidiruv), ("karimov anvar 1", '900000001'))
+        self.assertEqual(ArizaHisoblagichi.objects.get(holat='yangi').soni, 1)
+
+        with open(yol + '.xatolar.csv', encoding='utf-8') as fayl:
+            xatolar = list(csv.reader(fayl))
+        self.assertEqual([qator[0] for qator in xatolar[1:]], ['3', '4'])
+        self.assertIn("Xiva", xatolar[2][1])
+        self.assertFalse(os.path.exists(yol + '.nuqta.json'))
+
+    def test_imtiyozli_qator_hujjatsiz(self):
+        self.USTUNLAR = [*self.USTUNLAR, 'imtiyoz_turi']
+        yol = self.csv_fayl([self.qator(1, imtiyoz_turi='yoq'), self.qator(2, imtiyoz_turi='yetim')])
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('import_qilish', 'ariza', yol, stdout=io.StringIO())
+
+        self.assertEqual(YotoqxonaAriza.objects.get().pasport, 'AB0000001')
+        with open(yol + '.xatolar.csv', encoding='utf-8') as fayl:
+            xatolar = list(csv.reader(fayl))
+        self.assertEqual([qator[0] for qator in xatolar[1:]], ['3'])
+        self.assertIn("hujjat yuklash majburiy", xatolar[1][1])
+
+    def test_davom_ettirish(self):
+        yol = self.csv_fayl([self.qator(n) for n in range(1, 6)])
+        with open(yol + '.nuqta.json', 'w') as fayl:
+            json.dump({
+                'turi': 'ariza', 'hajm': os.path.getsize(yol), 'ozgargan': int(os.path.getmtime(yol)),
+                'qator': 4, 'natija': {'yozildi': 3, 'mavjud': 0, 'xato': 0},
+            }, fayl)
+        call_command('import_qilish', 'ariza', yol, '--davom', '--bolak', '1', stdout=io.StringIO())
+        self.assertEqual(
+            sorted(YotoqxonaAriza.objects.values_list('pasport', flat=True)), ['AB0000004', 'AB0000005']
+        )
+
+    def test_qayta_import_takrorlamaydi(self):
+        # Bo'lak yozilgandan keyin nuqta saqlanmay qolgan holat: fayl qayta o'qiladi
+        yol = self.csv_fayl([self.qator(n) for n in range(1, 4)])
+        call_command('import_qilish', 'ariza', yol, '--bolak', '2', stdout=io.StringIO())
+        with open(yol + '.nuqta.json', 'w') as fayl:
+            json.dump({
+                'turi': 'ariza', 'hajm': os.path.getsize(yol), 'ozgargan': int(os.path.getmtime(yol)),
+                'qator': 2, 'natija': {'yozildi': 0, 'mavjud': 0, 'xato': 0},
+            }, fayl)
+        chiqish = io.StringIO()
+        call_command('import_qilish', 'ariza', yol, '--davom', stdout=chiqish)
+        call_command('import_qilish', 'ariza', yol, stdout=chiqish)
+
+        self.assertEqual(YotoqxonaAriza.objects.count(), 3)
+        self.assertEqual(ArizaHisoblagichi.objects.get(holat='yangi').soni, 3)
+
+    def test_xlsx_binolar_va_xonalar(self):
+        binolar = os.path.join(self.papka, 'binolar.xlsx')
+        with open(binolar, 'wb') as fayl:
+            xlsx_yozish(fayl, [
+                ['raqam', 'nomi', 'turi', 'manzil', 'qavatlar_soni', 'har_qavatda_xonalar', 'wifi'],
+                [1, "1-bino", 'erkak', "Test", 2, 2, "yo'q"],
+                [1, "Takror", 'erkak', "Test", 2, 2, 'ha'],
+            ])
+        xonalar = os.path.join(self.papka, 'xonalar.xlsx')
+        with open(xonalar, 'wb') as fayl:
+            xlsx_yozish(fayl, [['bino', 'raqam', 'qavat', 'sig_imi'], [1, '101', 1, 4], [1, '102', 1, 3], [7, '101', 1, 4]])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('import_qilish', 'bino', binolar, stdout=io.StringIO())
+            call_command('import_qilish', 'xona', xonalar, stdout=io.StringIO())
+
+        bino = YotoqxonaBino.objects.get()
+        self.assertEqual((bino.nomi, bino.wifi), ("1-bino", False))
+        self.assertEqual(bino.xulosa.jami_orinlar, 7)
+
+
+class XonalarniYaratishTest(TestCase):
+    """Bino tuzilmasi va qavat sozlamalari bo'yicha xonalar, qayta chaqirish xavfsiz"""
+
+    def setUp(self):
+        self.bino = YotoqxonaBino.objects.create(
+            raqam=3, nomi="3-bino", turi='ayol', manzil="Test",
+            qavatlar_soni=3, har_qavatda_xonalar=12, standart_narxi=200000,
+        )
+        QavatSozlamasi.objects.create(bino=self.bino, qavat=1, sig_imi=2, narxi=350000)
+        Xona.objects.create(bino=self.bino, raqam='101', qavat=1, sig_imi=6)
+
+    def test_yaratish(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.bino.xonalarni_yaratish(), 35)
+            self.assertEqual(self.bino.xonalarni_yaratish(), 0)
+
+        self.assertEqual(Xona.objects.get(raqam='101').sig_imi, 6)
+        xona = Xona.objects.get(raqam='112')
+        self.assertEqual((xona.qavat, xona.sig_imi, xona.narxi), (1, 2, 350000))
+        xona = Xona.objects.get(raqam='312')
+        self.assertEqual((xona.qavat, xona.sig_imi, xona.narxi), (3, 4, 200000))
+
+        bino = YotoqxonaBino.objects.select_related('xulosa').get()
+        self.assertEqual((bino.umumiy_xonalar, bino.rejadagi_xonalar), (36, 36))
+        self.assertEqual(bino.xulosa.jami_orinlar, 6 + 11 * 2 + 24 * 4)
+
+    def test_shablon_tekshiruvi(self):
+        self.bino.xona_raqam_shabloni = 'X{xona}'
+        with self.assertRaisesMessage(ValidationError, "bir xil"):
+            self.bino.full_clean()
+        for shablon in ('{blok}-{xona}', '{qavat.x}{xona}', '{xona[0]}'):
+            self.bino.xona_raqam_shabloni = shablon
+            with self.subTest(shablon), self.assertRaisesMessage(ValidationError, "faqat {bino}"):
+                self.bino.full_clean()
+
+    def test_buyruq(self):
+        chiqish = io.StringIO()
+        call_command('xonalarni_yaratish', '3', '--quruq', stdout=chiqish)
+        self.assertIn("reja 36, mavjud 1, yaratiladi 35", chiqish.getvalue())
+        self.assertEqual(Xona.objects.count(), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('xonalarni_yaratish', stdout=io.StringIO())
+        self.assertEqual(Xona.objects.count(), 36)
+
+
+@override_settings(CACHES=XOTIRA_KESHI)
+class BoshJoylarTest(TestCase):
+    """Bo'sh joylar indeksi: bazada saqlangan bo'sh o'rinlar, bino turi nusxasi va keshlangan API"""
+
+    def setUp(self):
+        cache.clear()
+        self.bino = bino_yaratish(raqam=2, turi='ayol', xonalar=3, sig_imi=4)
+        Xona.objects.filter(raqam='101').update(band_orinlar=4)
+        Xona.objects.filter(raqam='102').update(band_orinlar=1, konditsioner=True, narxi=400000)
+
+    def test_api(self):
+        javob = self.client.get(reverse('dormitory:bosh_joylar_api'), {'turi': 'ayol', 'sig_imi': '4'})
+        self.assertEqual(javob.status_code, 200)
+        self.assertIn('max-age=60', javob['Cache-Control'])
+        malumot = javob.json()
+        self.assertEqual((malumot['jami_orinlar'], malumot['jami_xonalar']), (7, 2))
+        self.assertEqual(
+            [(guruh['konditsioner'], guruh['narx_oraligi'], guruh['orinlar']) for guruh in malumot['guruhlar']],
+            [(False, 'belgilanmagan', 4), (True, 'orta', 3)],
+        )
+
+        # Ikkinchi so'rov bazaga tushmaydi
+        with self.assertNumQueries(0):
+            self.client.get(reverse('dormitory:bosh_joylar_api'), {'konditsioner': 'ha'})
+        javob = self.client.get(reverse('dormitory:bosh_joylar_api'), {'turi': 'erkak'})
+        self.assertEqual(javob.json()['jami_orinlar'], 0)
+        self.assertEqual(self.client.get(reverse('dormitory:bosh_joylar_api'), {'sig_imi': '9'}).status_code, 400)
+
+    def test_band_qilish_keshni_tozalaydi(self):
+        self.client.get(reverse('dormitory:bosh_joylar_api'))
+        xona = Xona.objects.get(raqam='103')
+        with self.captureOnCommitCallbacks(execute=True):
+            Xona.orin_band_qilish(xona.pk)
+        self.assertEqual(Xona.objects.get(pk=xona.pk).bosh_orinlar, 3)
+        self.assertEqual(self.client.get(reverse('dormitory:bosh_joylar_api')).json()['jami_orinlar'], 6)
+
+    def test_bino_turi_nusxasi(self):
+        self.assertEqual(set(Xona.objects.values_list('bino_turi', flat=True)), {'ayol'})
+        self.bino.turi = 'erkak'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bino.save()
+        self.assertEqual(set(Xona.objects.values_list('bino_turi', flat=True)), {'erkak'})
+        self.assertEqual(self.client.get(reverse('dormitory:bosh_joylar_api'), {'turi': 'erkak'}).json()['jami_orinlar'], 7)
+
+
+class BandlikniMoslashtirishTest(TestCase):
+    """band_orinlar tasdiqlangan arizalardan qayta hisoblanadi"""
+
+    def setUp(self):
+        self.bino = bino_yaratish(xonalar=3, sig_imi=2)
+        self.xonalar = list(self.bino.xonalar.order_by('raqam'))
+        for n, xona in enumerate(self.xonalar[:2]):
+            ariza_yaratish(n + 1, holat='tasdiqlandi', tayinlangan_xona=xona)
+        # Qo'lda buzilgan hisoblagichlar: 101 - to'g'ri, 102 - 0, 103 - 2 (arizasi yo'q)
+        Xona.objects.filter(pk=self.xonalar[1].pk).update(band_orinlar=0)
+        Xona.objects.filter(pk=self.xonalar[2].pk).update(band_orinlar=2)
+
+    def test_moslashtirish(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            farqlar = Xona.bandlikni_moslashtirish(bolak=2)
+        self.assertEqual([(xona.raqam, edi, haqiqiy) for xona, edi, haqiqiy in farqlar], [('102', 0, 1), ('103', 2, 0)])
+        self.assertEqual(list(Xona.objects.order_by('raqam').values_list('band_orinlar', flat=True)), [1, 1, 0])
+        self.assertEqual(YotoqxonaBino.objects.get().xulosa.band_orinlar, 2)
+        self.assertEqual(Xona.bandlikni_moslashtirish(), [])
+
+    def test_buyruq_quruq(self):
+        hisobot = os.path.join(tempfile.mkdtemp(), 'farqlar.csv')
+        self.addCleanup(shutil.rmtree, os.path.dirname(hisobot))
+        chiqish = io.StringIO()
+        call_command('bandlikni_moslashtirish', '--quruq', '--hisobot', hisobot, stdout=chiqish)
+        self.assertIn("2 ta xonada farq topildi", chiqish.getvalue())
+        self.assertEqual(Xona.objects.get(raqam='103').band_orinlar, 2)
+        with open(hisobot, encoding='utf-8') as fayl:
+            self.assertEqual(list(csv.reader(fayl))[1:], [['1', '102', '2', '0', '1'], ['1', '103', '2', '2', '0']])
+
+
+class UstuvorlikBaliTest(TestCase):
+    """Ustuvorlik bali: saqlashda hisoblanadi, qoidalar o'zgarsa ommaviy yangilanadi"""
+
+    def setUp(self):
+        cache.clear()
+        # Ma'lumotnoma yozuvlari yaratilganda navbatga qo'yilgan qayta hisoblash shu yerda bajariladi
+        with self.captureOnCommitCallbacks(execute=True):
+            self.oddiy = ariza_yaratish(1, oila_azolari=9)
+            self.yetim = ariza_yaratish(2, imtiyoz_turi='yetim')
+
+    def test_saqlashda_hisoblanadi(self):
+        # Boshlang'ich qoidalar (migratsiya) - faqat imtiyoz turi bo'yicha
+        self.assertEqual((self.oddiy.ustuvorlik_bali, self.yetim.ustuvorlik_bali), (0, 70))
+        self.yetim.imtiyoz_turi = '1_guruh_nogironlik'
+        self.yetim.save(update_fields=['imtiyoz_turi'])
+        self.assertEqual(YotoqxonaAriza.objects.get(pk=self.yetim.pk).ustuvorlik_bali, 100)
+
+    def test_qoidalar_ozgarganda_qayta_hisoblanadi(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            UstuvorlikMezoni.objects.create(mezon='oila_azolari', qiymat='6', ball=40)
+            UstuvorlikMezoni.objects.create(mezon='oila_azolari', qiymat='8', ball=80)
+            UstuvorlikMezoni.objects.create(mezon='viloyat', qiymat='Toshkent', ball=5)
+            UstuvorlikMezoni.objects.filter(mezon='imtiyoz_turi', qiymat='yetim').delete()
+
+        self.assertEqual(
+            list(YotoqxonaAriza.objects.order_by('-ustuvorlik_bali', 'ariza_sanasi', 'id')
+                 .values_list('pk', 'ustuvorlik_bali')),
+            [(self.oddiy.pk, 85), (self.yetim.pk, 5)],
+        )
+        # Yangi ariza shu qoidalar bilan
+        self.assertEqual(ariza_yaratish(3, oila_azolari=7).ustuvorlik_bali, 45)
+
+    def test_saqlashda_qoidalar_sorovsiz(self):
+        UstuvorlikMezoni.joriy_qoidalar()
+        self.yetim.imtiyoz_turi = '1_guruh_nogironlik'
+        with CaptureQueriesContext(connection) as sorovlar:
+            self.yetim.save()
+        self.assertEqual(self.yetim.ustuvorlik_bali, 100)
+        self.assertFalse([q for q in sorovlar.captured_queries if 'ustuvorlikmezoni' in q['sql'].lower()])
+
+    def test_boshqa_worker_keshi_eskiradi(self):
+        # Alohida backend nusxasi - boshqa worker jarayoni o'rnida
+        boshqa_worker = caches.create_connection('default')
+        UstuvorlikMezoni.joriy_qoidalar()
+        self.assertIsNotNone(boshqa_worker.get(USTUVORLIK_KESH_KALITI))
+        with self.captureOnCommitCallbacks(execute=True):
+            UstuvorlikMezoni.objects.filter(mezon='imtiyoz_turi', qiymat='yetim').get().delete()
+        self.assertIsNone(boshqa_worker.get(USTUVORLIK_KESH_KALITI))
+        self.assertEqual(ariza_yaratish(3, imtiyoz_turi='yetim').ustuvorlik_bali, 0)
+
+    def test_tranzaksiyada_bir_marta_hisoblanadi(self):
+        with self.captureOnCommitCallbacks(execute=True) as vazifalar:
+            for chegara in (4, 6, 8):
+                UstuvorlikMezoni.objects.create(mezon='oila_azolari', qiymat=str(chegara), ball=chegara)
+        self.assertEqual(len(vazifalar), 1)
+        self.assertEqual(YotoqxonaAriza.objects.get(pk=self.oddiy.pk).ustuvorlik_bali, 8)
+
+        # Rollback bo'lgan savepoint navbatni o'zi bilan olib ketadi - keyingi o'zgarish yana qo'yiladi
+        with self.captureOnCommitCallbacks() as vazifalar:
+            with self.assertRaises(IntegrityError), transaction.atomic():
+                UstuvorlikMezoni.objects.create(mezon='kurs', qiymat='1', ball=1)
+                UstuvorlikMezoni.objects.create(mezon='kurs', qiymat='1', ball=2)
+            UstuvorlikMezoni.objects.create(mezon='kurs', qiymat='2', ball=2)
+        self.assertEqual(len(vazifalar), 1)
+
+    def test_ozgartirib_qaytarilsa_ballar_tiklanadi(self):
+        mezon = UstuvorlikMezoni.objects.get(mezon='imtiyoz_turi', qiymat='yetim')
+        for ball in (10, 70):
+            mezon.ball = ball
+            with self.captureOnCommitCallbacks(execute=True):
+                mezon.save()
+            self.assertEqual(YotoqxonaAriza.objects.get(pk=self.yetim.pk).ustuvorlik_bali, ball)
+
+    def test_qoida_tekshiruvi(self):
+        mezon = UstuvorlikMezoni(mezon='kurs', qiymat='01', ball=1)
+        mezon.full_clean()
+        self.assertEqual(mezon.qiymat, '1')
+        with self.assertRaises(ValidationError):
+            UstuvorlikMezoni(mezon='viloyat', qiymat="Mavjud emas", ball=1).full_clean()
+        with self.assertRaises(ValidationError):
+            UstuvorlikMezoni(mezon='oila_azolari', qiymat="ko'p", ball=1).full_clean()
+
+
+class KutishNavbatiTest(TestCase):
+    """Joy topilmaganlar navbatga tushadi, bo'shagan o'ringa eng yuqori ballli joylashadi"""
+
+    def setUp(self):
+        self.xona = bino_yaratish(xonalar=1, sig_imi=2).xonalar.get()
+        self.yashovchilar = [ariza_yaratish(1), ariza_yaratish(2)]
+        self.oddiy = ariza_yaratish(3, xona_turi_afzallik=2)
+        self.yetim = ariza_yaratish(4, imtiyoz_turi='yetim')
+        self.boshqa_sig_im = ariza_yaratish(5, imtiyoz_turi='1_guruh_nogironlik', xona_turi_afzallik=4)
+        self.qiz = ariza_yaratish(6, jinsi='ayol', imtiyoz_turi='1_guruh_nogironlik')
+
+    def test_bosagan_orin_navbatdagiga_beriladi(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(len(xonalarni_taqsimlash(YotoqxonaAriza.objects.filter(pk__lte=2))), 2)
+            # Xona to'ldi - qolganlari navbatga
+            natija = xonalarni_taqsimlash(YotoqxonaAriza.objects.all())
+        self.assertEqual((len(natija), len(natija.joy_topilmadi)), (0, 4))
+        self.assertEqual(YotoqxonaAriza.objects.filter(holat='navbatda').count(), 4)
+        self.assertEqual(NavbatYozuvi.objects.count(), 4)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            YotoqxonaAriza.objects.filter(pk=self.yashovchilar[0].pk).holatni_ozgartirish('bekor')
+
+        # Boshqa sig'im va boshqa jins navbatlari hisobga olinmaydi; "istalgan" yetim 2-o'rinlik afzallikdan oldin
+        self.yetim.refresh_from_db()
+        self.assertEqual((self.yetim.holat, self.yetim.tayinlangan_xona_id), ('tasdiqlandi', self.xona.pk))
+        self.assertFalse(NavbatYozuvi.objects.filter(ariza=self.yetim).exists())
+        self.xona.refresh_from_db()
+        self.assertEqual(self.xona.band_orinlar, 2)
+        tarix = NavbatTarixi.objects.get()
+        self.assertEqual((tarix.ariza_id, tarix.xona_id, tarix.sabab), (self.yetim.pk, self.xona.pk, 'bosatildi'))
+
+        # O'chirilgan ariza o'rni navbatdagi keyingisiga
+        with self.captureOnCommitCallbacks(execute=True):
+            self.yetim.delete()
+        self.oddiy.refresh_from_db()
+        self.assertEqual(self.oddiy.holat, 'tasdiqlandi')
+        self.assertEqual(
+            sorted(NavbatYozuvi.objects.values_list('ariza', flat=True)), [self.boshqa_sig_im.pk, self.qiz.pk]
+        )
+        self.assertEqual(ArizaHisoblagichi.objects.get(holat='navbatda').soni, 2)
+
+    def test_xonani_tozalash_navbatdagilarni_joylashtiradi(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            xonalarni_taqsimlash(YotoqxonaAriza.objects.filter(pk__in=[a.pk for a in self.yashovchilar]))
+            xonalarni_taqsimlash(YotoqxonaAriza.objects.filter(pk__in=[self.oddiy.pk, self.yetim.pk]))
+        self.assertEqual(NavbatYozuvi.objects.count(), 2)
+
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'parol')
+        self.client.force_login(admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('admin:dormitory_app_xona_changelist'), {
+                'action': 'xonalarni_tozalash', helpers.ACTION_CHECKBOX_NAME: [self.xona.pk],
+            })
+
+        # Oldingi yashovchilar xonadan chiqdi, navbat boshidagilar joylashdi
+        self.assertEqual(
+            set(YotoqxonaAriza.objects.filter(tayinlangan_xona=self.xona).values_list('pk', flat=True)),
+            {self.oddiy.pk, self.yetim.pk},
+        )
+        for ariza in self.yashovchilar:
+            ariza.refresh_from_db()
+            self.assertEqual((ariza.holat, ariza.tayinlangan_xona), ('tasdiqlandi', None))
+        self.xona.refresh_from_db()
+        self.assertEqual(self.xona.band_orinlar, 2)
+        self.assertEqual(Xona.bandlikni_moslashtirish(quruq=True), [])
+        self.assertEqual(
+            sorted(NavbatTarixi.objects.values_list('ariza', 'sabab')),
+            sorted([(self.oddiy.pk, 'tozalandi'), (self.yetim.pk, 'tozalandi')]),
+        )
+        self.assertFalse(NavbatYozuvi.objects.filter(ariza__in=[self.oddiy.pk, self.yetim.pk]).exists())
+
+
+class OquvYiliniArxivlashTest(TestCase):
+    """Tugagan yil arizalari arxivga ko'chadi, o'rinlari bo'shaydi"""
+
+    def setUp(self):
+        cache.clear()
+        self.xona = bino_yaratish(xonalar=1, sig_imi=2).xonalar.get()
+        self.eskilar = [
+            ariza_yaratish(n, oquv_yili='2020-2021', holat='tasdiqlandi', tayinlangan_xona=self.xona)
+            for n in (1, 2)
+        ]
+        ArizaIzohi.objects.create(ariza=self.eskilar[0], matn="Ko'chib ketdi")
+        ariza_yaratish(3, oquv_yili='2020-2021', holat='rad_etildi')
+        self.navbatdagi = ariza_yaratish(4, holat='navbatda')
+
+    def test_arxivlash(self):
+        chiqish = io.StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('oquv_yilini_arxivlash', '--bolak', '2', stdout=chiqish)
+        self.assertIn("Jami 3 ta ariza arxivga ko'chirildi", chiqish.getvalue())
+
+        self.assertEqual(list(YotoqxonaAriza.objects.values_list('pk', flat=True)), [self.navbatdagi.pk])
+        arxiv = ArxivAriza.objects.get(ariza_raqami=self.eskilar[0].ariza_raqami)
+        self.assertEqual((arxiv.oquv_yili, arxiv.holat, arxiv.xona), ('2020-2021', 'tasdiqlandi', str(self.xona)))
+        self.assertEqual(arxiv.malumotlar['izohlar'][0]['matn'], "Ko'chib ketdi")
+        self.assertEqual(arxiv.malumotlar['fakultet_nomi'], "Informatika")
+
+        # Ikkala o'rin bo'shadi, biri navbatdagiga berildi
+        self.xona.refresh_from_db()
+        self.assertEqual(self.xona.band_orinlar, 1)
+        self.navbatdagi.refresh_from_db()
+        self.assertEqual(self.navbatdagi.holat, 'tasdiqlandi')
+        self.assertEqual(NavbatTarixi.objects.get().sabab, 'arxivlandi')
+
+        # Holat sahifasi arxivdan topadi, hisoblagichlar arxivni ham sanaydi
+        holat = ariza_holati(arxiv.ariza_raqami, arxiv.telefon)
+        self.assertEqual(holat['holat'], 'tasdiqlandi')
+        self.assertEqual(ArizaHisoblagichi.qayta_hisoblash(), 0)
+
+    def test_holat_sahifasi_arxiv_qatorini_korsatadi(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ArxivAriza.arxivlash(['2020-2021'])
+        arxiv = ArxivAriza.objects.get(ariza_raqami=self.eskilar[0].ariza_raqami)
+        # Jonli jadvalda arxiv pk si bilan boshqa ariza
+        begona = ariza_yaratish(9, pk=arxiv.pk)
+
+        response = self.client.post(
+            reverse('dormitory:status'), {'ariza_raqami': arxiv.ariza_raqami, 'telefon': arxiv.telefon}
+        )
+        self.assertTrue(response.context['found'])
+        self.assertTrue(response.context['arxiv'])
+        self.assertEqual(response.context['ariza'], arxiv)
+        self.assertContains(response, arxiv.fish)
+        self.assertNotContains(response, begona.pasport)
+
+        response = self.client.get(
+            reverse('dormitory:status_api'), {'ariza_raqami': arxiv.ariza_raqami},
+            headers={'X-Telefon': arxiv.telefon},
+        )
+        self.assertEqual(response.json()['holat'], 'tasdiqlandi')
+
+    def test_joriy_yil_arxivlanmaydi(self):
+        with self.assertRaises(CommandError):
+            call_command('oquv_yilini_arxivlash', joriy_oquv_yili())
+
+
+@override_settings(CACHES=XOTIRA_KESHI)
+class ArizaHolatiApiTest(TestCase):
+    """Holat API: ETag/Last-Modified, 304 va holat o'zgarganda kesh tozalanishi"""
+
+    def setUp(self):
+        cache.clear()
+        self.ariza = ariza_yaratish(1)
+        self.parametrlar = {'ariza_raqami': self.ariza.ariza_raqami}
+        self.url = reverse('dormitory:status_api')
+        self.client.defaults['HTTP_X_TELEFON'] = self.ariza.telefon
+
+    def test_etag_va_304(self):
+        javob = self.client.get(self.url, self.parametrlar)
+        self.assertEqual(javob.status_code, 200)
+        self.assertEqual(javob.json()['holat'], 'korilmoqda')
+        self.assertEqual(javob['Last-Modified'], http_date(self.ariza.yangilangan_sana.timestamp()))
+        self.assertIn('no-cache', javob['Cache-Control'])
+        self.assertIn('private', javob['Cache-Control'])
+
+        # Takroriy so'rov keshdan - bazaga murojaat yo'q
+        with self.assertNumQueries(0):
+            javob = self.client.get(self.url, self.parametrlar, HTTP_IF_NONE_MATCH=javob['ETag'])
+        self.assertEqual(javob.status_code, 304)
+        javob = self.client.get(self.url, self.parametrlar, HTTP_IF_MODIFIED_SINCE=javob['Last-Modified'])
+        self.assertEqual(javob.status_code, 304)
+
+    def test_notogri_telefon(self):
+        javob = self.client.get(self.url, self.parametrlar, headers={'X-Telefon': '+998000000099'})
+        self.assertEqual(javob.status_code, 404)
+        self.assertFalse(javob.has_header('ETag'))
+
+    def test_telefon_urlda_qabul_qilinmaydi(self):
+        del self.client.defaults['HTTP_X_TELEFON']
+        javob = self.client.get(self.url, {**self.parametrlar, 'telefon': self.ariza.telefon})
+        self.assertEqual(javob.status_code, 404)
+
+    def test_rad_sababi(self):
+        YotoqxonaAriza.objects.filter(pk=self.ariza.pk).update(rad_sababi="Joy yo'q")
+        with self.captureOnCommitCallbacks(execute=True):
+            YotoqxonaAriza.objects.filter(pk=self.ariza.pk).holatni_ozgartirish('rad_etildi')
+        javob = self.client.get(self.url, self.parametrlar)
+        self.assertEqual(javob.json()['rad_sababi'], "Joy yo'q")
+        self.assertIn('X-Telefon', javob['Vary'])
+
+    def test_holat_ozgarsa_kesh_tozalanadi(self):
+        etag = self.client.get(self.url, self.parametrlar)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            YotoqxonaAriza.objects.filter(pk=self.ariza.pk).holatni_ozgartirish('rad_etildi')
+
+        javob = self.client.get(self.url, self.parametrlar, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(javob.status_code, 200)
+        self.assertEqual(javob.json()['holat'], 'rad_etildi')
+        self.assertNotEqual(javob['ETag'], etag)
+
+        # save() orqali o'zgarish ham
+        etag = javob['ETag']
+        ariza = YotoqxonaAriza.objects.get(pk=self.ariza.pk)
+        ariza.holat = 'korilmoqda'
+        with self.captureOnCommitCallbacks(execute=True):
+            ariza.save()
+        javob = self.client.get(self.url, self.parametrlar, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual((javob.status_code, javob.json()['holat']), (200, 'korilmoqda'))
+
+
+class UmumiyKeshTest(TestCase):
+    """Sozlamadagi kesh jarayonlararo umumiy: bir worker o'chirgan kalit boshqasida ham eskiradi"""
+
+    def test_boshqa_jarayon_keshi(self):
+        ariza = ariza_yaratish(1)
+        # Alohida backend nusxasi - boshqa worker jarayoni o'rnida
+        boshqa_worker = caches.create_connection('default')
+        kalit = ariza_holati_kesh_kaliti(ariza.ariza_raqami)
+        self.assertEqual(ariza_holati(ariza.ariza_raqami, ariza.telefon)['holat'], 'korilmoqda')
+        self.assertEqual(boshqa_worker.get(kalit)['holat'], 'korilmoqda')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            YotoqxonaAriza.objects.filter(pk=ariza.pk).holatni_ozgartirish('rad_etildi')
+        self.assertIsNone(boshqa_worker.get(kalit))
+
+
+class CsvEksportTest(TestCase):
+    """Admin CSV eksporti: sarlavha, qator mazmuni va bo'laklab oqim"""
+
+    def setUp(self):
+        self.arizalar = [ariza_yaratish(1), ariza_yaratish(2, jinsi='ayol', imtiyoz_turi='yetim')]
+
+    def test_bolaklab_yuboriladi(self):
+        bolaklar = list(csv_oqimi(YotoqxonaAriza.objects.order_by('pk'), bolak_hajmi=1))
+        # Har bir qatordan keyin bo'lak + oxirgi (bo'sh) qoldiq
+        self.assertEqual(len(bolaklar), 3)
+        self.assertTrue(bolaklar[0].startswith('\ufeff'))
+
+        qatorlar = list(csv.reader(io.StringIO(''.join(bolaklar).removeprefix('\ufeff'))))
+        self.assertEqual(qatorlar[0], EKSPORT_USTUNLARI)
+        ariza = self.arizalar[1]
+        self.assertEqual(qatorlar[2], [
+            ariza.ariza_raqami, "Aliyev Vali 2", 'Ayol', str(ariza.yoshi), ariza.telefon, "Toshkent",
+            "Informatika", '1', 'Yetim', ariza.get_holat_display(),
+            ariza.ariza_sanasi.strftime('%d.%m.%Y'), str(ariza.ustuvorlik_bali),
+        ])
+
+    def test_admin_amali_oqim_qaytaradi(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'parol'))
+        javob = self.client.post(reverse('admin:dormitory_app_yotoqxonaariza_changelist'), {
+            'action': 'export_csv', helpers.ACTION_CHECKBOX_NAME: [a.pk for a in self.arizalar],
+        })
+        self.assertEqual(javob.status_code, 200)
+        self.assertTrue(javob.streaming)
+        self.assertEqual(javob['Content-Disposition'], 'attachment; filename="arizalar.csv"')
+        matn = b''.join(javob.streaming_content).decode('utf-8-sig')
+        qatorlar = list(csv.reader(io.StringIO(matn)))
+        self.assertEqual(len(qatorlar), 3)
+        # Ustuvorlik bali bo'yicha: yetim (70) oldin
+        self.assertEqual([q[0] for q in qatorlar[1:]], [a.ariza_raqami for a in reversed(self.arizalar)])
+        self.assertEqual(qatorlar[0][-1], 'Ball')
+
+
+class EksportVazifasiTest(TestCase):
+    """Fon eksporti: navbatdan olish, bajarish, xato va to'xtab qolgan vazifalarni qaytarish"""
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media)
+        sozlama = override_settings(MEDIA_ROOT=self.media, MAXFIY_MEDIA_ROOT=self.media)
+        sozlama.enable()
+        self.addCleanup(sozlama.disable)
+        ariza_yaratish(1)
+        ariza_yaratish(2, holat='yangi')
+
+    def test_navbatdan_olish(self):
+        birinchi = EksportVazifasi.objects.create()
+        ikkinchi = EksportVazifasi.objects.create(format='xlsx')
+        olindi = EksportVazifasi.navbatdan_olish()
+        self.assertEqual((olindi.pk, olindi.holat, olindi.urinishlar), (birinchi.pk, 'bajarilmoqda', 1))
+        self.assertIsNotNone(olindi.faollik_sana)
+        self.assertEqual(EksportVazifasi.navbatdan_olish().pk, ikkinchi.pk)
+        self.assertIsNone(EksportVazifasi.navbatdan_olish())
+
+    def test_yaratuvchisiz_vazifa_bajariladi(self):
+        # Yaratuvchi o'chirilgan (SET_NULL) - changelist filtrlari baribir qo'llanadi
+        EksportVazifasi.objects.create(filtrlar='holat__exact=korilmoqda', yaratuvchi=None)
+        vazifa = vazifani_bajarish(EksportVazifasi.navbatdan_olish())
+        vazifa.refresh_from_db()
+        self.assertEqual((vazifa.holat, vazifa.jami, vazifa.bajarildi), ('tayyor', 1, 1), vazifa.xato_matni)
+        with vazifa.fayl.open('rb') as fayl:
+            qatorlar = list(csv.reader(io.StringIO(fayl.read().decode('utf-8-sig'))))
+        self.assertEqual(qatorlar[0][:2], ['Ariza №', 'F.I.SH'])
+        self.assertEqual(qatorlar[1][1], "Aliyev Vali 1")
+
+        # Fayl ommaviy media orqali emas, faqat admin yuklash ko'rinishi orqali
+        self.assertEqual(self.client.get('/media/' + vazifa.fayl.name).status_code, 404)
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'parol'))
+        javob = self.client.get(reverse('admin:dormitory_app_eksportvazifasi_change', args=[vazifa.pk]))
+        self.assertContains(javob, reverse('admin:dormitory_eksport_yuklash', args=[vazifa.pk]))
+        javob = self.client.get(reverse('admin:dormitory_eksport_yuklash', args=[vazifa.pk]))
+        self.assertEqual(javob.status_code, 200)
+
+    def test_xato(self):
+        EksportVazifasi.objects.create(filtrlar='mavjud_emas__exact=1')
+        vazifa = vazifani_bajarish(EksportVazifasi.navbatdan_olish())
+        vazifa.refresh_from_db()
+        self.assertEqual(vazifa.holat, 'xato')
+        self.assertTrue(vazifa.xato_matni)
+        self.assertIsNotNone(vazifa.yakunlangan_sana)
+
+    def test_toxtagan_vazifa_qaytariladi(self):
+        EksportVazifasi.objects.create(tanlangan=[])
+        eski = EksportVazifasi.navbatdan_olish()
+        eskirgan = timezone.now() - timedelta(hours=1)
+        EksportVazifasi.objects.filter(pk=eski.pk).update(faollik_sana=eskirgan)
+
+        self.assertEqual(EksportVazifasi.toxtaganlarni_qaytarish(), 1)
+        yangi = EksportVazifasi.navbatdan_olish()
+        self.assertEqual((yangi.pk, yangi.urinishlar), (eski.pk, 2))
+        # O'lgan deb hisoblangan worker natijasi yangi urinishni bosib ketmaydi
+        self.assertFalse(eski.faollikni_yozish(holat='tayyor'))
+        self.assertTrue(yangi.faollikni_yozish(bajarildi=0))
+
+        EksportVazifasi.objects.filter(pk=eski.pk).update(
+            faollik_sana=eskirgan, urinishlar=EksportVazifasi.URINISHLAR_CHEGARASI
+        )
+        EksportVazifasi.toxtaganlarni_qaytarish()
+        self.assertEqual(EksportVazifasi.objects.get(pk=eski.pk).holat, 'xato')
+
+
+class HisoblagichlarTest(TestCase):
+    """Dashboard hisoblagichlari: oshirib borilgan qiymat qayta qurilgani bilan bir xil"""
+
+    def setUp(self):
+        xona = bino_yaratish().xonalar.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tasdiqlangan = ariza_yaratish(1)
+            self.bekor = ariza_yaratish(2)
+            ariza_yaratish(3, holat='yangi')
+            ariza_yaratish(4, oquv_yili='2020-2021', holat='tasdiqlandi', tayinlangan_xona=xona)
+            YotoqxonaAriza.objects.filter(
+                pk__in=[self.tasdiqlangan.pk, self.bekor.pk]
+            ).holatni_ozgartirish('tasdiqlandi')
+            YotoqxonaAriza.objects.filter(pk=self.bekor.pk).holatni_ozgartirish('bekor')
+            ArxivAriza.arxivlash(['2020-2021'])
+
+    def holati(self):
+        return (
+            sorted(ArizaHisoblagichi.objects.filter(soni__gt=0).values_list('oquv_yili', 'holat', 'soni')),
+            list(KunlikArizaStatistikasi.objects.values_list('sana', 'yuborilgan', 'tasdiqlangan')),
+        )
+
+    def test_oshirib_borilgan_qiymatlar(self):
+        hisoblagichlar, kunlar = self.holati()
+        joriy = joriy_oquv_yili()
+        self.assertEqual(hisoblagichlar, [
+            ('2020-2021', 'tasdiqlandi', 1), (joriy, 'bekor', 1), (joriy, 'tasdiqlandi', 1), (joriy, 'yangi', 1),
+        ])
+        self.assertEqual(kunlar, [(timezone.localdate(), 4, 3)])
+
+    def test_qayta_qurish_bir_xil_natija_beradi(self):
+        oldin = self.holati()
+        chiqish = io.StringIO()
+        call_command('hisoblagichlarni_tekshirish', stdout=chiqish)
+        self.assertNotIn("tuzatildi", chiqish.getvalue())
+        self.assertEqual(self.holati(), oldin)
+
+    def test_buzilgan_hisoblagichlar_tuzatiladi(self):
+        oldin = self.holati()
+        buzilgan = ArizaHisoblagichi.objects.update(soni=99)
+        KunlikArizaStatistikasi.objects.update(yuborilgan=0, tasdiqlangan=0)
+        chiqish = io.StringIO()
+        call_command('hisoblagichlarni_tekshirish', stdout=chiqish)
+        self.assertIn(f"{buzilgan} ta hisoblagich tuzatildi", chiqish.getvalue())
+        self.assertEqual(self.holati(), oldin)
@@ -13,6 +13,12 @@ urlpatterns = [
     # Ariza holatini tekshirish
     path('ariza-holati/', views.ariza_status_view, name='status'),
     
+    # Ariza holati - JSON API
+    path('api/ariza-holati/', views.ariza_status_api, name='status_api'),
+    
+    # Bo'sh o'rinlar - JSON API
+    path('api/bosh-joylar/', views.bosh_joylar_api, name='bosh_joylar_api'),
+    
     # Ma'lumot sahifasi
     path('malumot/', views.info_view, name='info'),
 ]
\ No newline at end of file
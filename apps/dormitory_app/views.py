@@ -1,9 +1,13 @@
 from django.shortcuts import render, redirect
 from django.contrib import messages
-from django.utils import timezone
 from django.db import transaction
+from django.http import JsonResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import condition, require_GET
+from .bosh_joylar import NARX_ORALIQLARI, NARXSIZ, bosh_joylar
 from .forms import YotoqxonaArizaForm
-from .models import YotoqxonaAriza
+from .models import ArxivAriza, Xona, YotoqxonaAriza, YotoqxonaBino, ariza_raqami_ajratish, joriy_oquv_yili
+from .status import ariza_holati, holat_etag, holat_json
 
 
 def home_view(request):
@@ -13,16 +17,16 @@ def home_view(request):
         
         if form.is_valid():
             try:
+                # Raqam tranzaksiyadan oldin olinadi - ketma-ketlik qatori so'rov oxirigacha qulflanmaydi
+                ariza_raqami = ariza_raqami_ajratish()
+                
                 with transaction.atomic():
                     # Arizani saqlash
                     ariza = form.save(commit=False)
+                    ariza.ariza_raqami = ariza_raqami
                     
                     # O'quv yilini aniqlash
-                    now = timezone.now()
-                    if now.month >= 9:
-                        ariza.oquv_yili = f"{now.year}-{now.year + 1}"
-                    else:
-                        ariza.oquv_yili = f"{now.year - 1}-{now.year}"
+                    ariza.oquv_yili = joriy_oquv_yili()
                     
                     # Holat yangi
                     ariza.holat = 'yangi'
@@ -59,7 +63,12 @@ def home_view(request):
 def success_view(request, ariza_raqami):
     """Ariza muvaffaqiyatli yuborilgandan keyingi sahifa"""
     try:
-        ariza = YotoqxonaAriza.objects.get(ariza_raqami=ariza_raqami)
+        # Sahifada ko'rsatiladigan ustunlargina o'qiladi
+        ariza = (
+            YotoqxonaAriza.objects.select_related('fakultet')
+            .only('ariza_raqami', 'ariza_sanasi', 'telefon', 'xona_turi_afzallik', 'fakultet__nomi')
+            .get(ariza_raqami=ariza_raqami)
+        )
         context = {
             'ariza_raqami': ariza.ariza_raqami,
             'ariza': ariza
@@ -73,21 +82,30 @@ def success_view(request, ariza_raqami):
 def ariza_status_view(request):
     """Ariza holatini tekshirish"""
     if request.method == 'POST':
-        ariza_raqami = request.POST.get('ariza_raqami')
-        telefon = request.POST.get('telefon')
+        ariza_raqami = request.POST.get('ariza_raqami', '').strip()
+        telefon = request.POST.get('telefon', '').strip()
         
-        try:
-            ariza = YotoqxonaAriza.objects.get(
-                ariza_raqami=ariza_raqami,
-                telefon=telefon
+        # Avval API bilan bir xil tezkor yo'l - topilmagan raqam uchun to'liq qator o'qilmaydi
+        holat = ariza_holati(ariza_raqami, telefon)
+        ariza = None
+        if holat and holat['arxiv']:
+            # O'tgan yil arizasi - pk faqat arxiv jadvalida qidiriladi
+            ariza = ArxivAriza.objects.filter(pk=holat['id']).first()
+        elif holat:
+            ariza = (
+                YotoqxonaAriza.objects.select_related('viloyat', 'fakultet', 'kurs')
+                .filter(pk=holat['id'])
+                .first()
             )
-            
+        
+        if ariza:
             context = {
                 'ariza': ariza,
+                'arxiv': holat['arxiv'],
                 'found': True
             }
             
-        except YotoqxonaAriza.DoesNotExist:
+        else:
             messages.error(
                 request,
                 "Ariza topilmadi. Iltimos, ma'lumotlarni tekshirib qaytadan kiriting."
@@ -99,6 +117,86 @@ def ariza_status_view(request):
     return render(request, 'status.html', context)
 
 
+# Telefon URL da emas, sarlavhada keladi - shaxsiy ma'lumot access log'larga tushmaydi
+TELEFON_SARLAVHASI = 'X-Telefon'
+
+
+def _sorov_holati(request):
+    """Ariza raqami (GET) va telefon (sarlavha) bo'yicha holat (bitta so'rov davomida bir marta olinadi)"""
+    if not hasattr(request, '_ariza_holati'):
+        request._ariza_holati = ariza_holati(
+            request.GET.get('ariza_raqami', '').strip(),
+            request.headers.get(TELEFON_SARLAVHASI, '').strip(),
+        )
+    return request._ariza_holati
+
+
+def _holat_etag(request):
+    holat = _sorov_holati(request)
+    return holat_etag(holat) if holat else None
+
+
+def _holat_oxirgi_ozgarish(request):
+    holat = _sorov_holati(request)
+    return holat['yangilangan_sana'] if holat else None
+
+
+@require_GET
+@condition(etag_func=_holat_etag, last_modified_func=_holat_oxirgi_ozgarish)
+def ariza_status_api(request):
+    """Ariza holati JSON ko'rinishida (ETag/Last-Modified bilan, o'zgarmagan bo'lsa 304)"""
+    holat = _sorov_holati(request)
+    if not holat:
+        return JsonResponse({'xato': "Ariza topilmadi"}, status=404)
+    response = JsonResponse(holat_json(holat))
+    # Brauzer har safar qayta tekshiradi - o'zgarmagan bo'lsa 304 qaytadi
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, [TELEFON_SARLAVHASI])
+    return response
+
+
+# Brauzer va proksi keshi (soniya) - ma'lumot serverda ham keshlanadi
+BOSH_JOYLAR_MAX_AGE = 60
+
+
+def _tanlov_parametri(request, nom, tanlovlar):
+    """GET parametri tanlovlardan biri bo'lishi kerak (bo'sh bo'lsa - None)"""
+    qiymat = request.GET.get(nom, '').strip().lower()
+    if not qiymat:
+        return None
+    if qiymat not in tanlovlar:
+        raise ValueError(f"{nom}: {', '.join(tanlovlar)} dan biri bo'lishi kerak")
+    return tanlovlar[qiymat]
+
+
+@require_GET
+def bosh_joylar_api(request):
+    """Bo'sh o'rinlar: bino turi, sig'im, qulayliklar va narx oralig'i bo'yicha (JSON)"""
+    mantiqiy = {'1': True, 'ha': True, 'true': True, '0': False, "yo'q": False, 'yoq': False, 'false': False}
+    narx_nomlari = {kod: nomi for kod, nomi, _ in NARX_ORALIQLARI}
+    narx_nomlari[NARXSIZ[0]] = NARXSIZ[1]
+    try:
+        guruhlar = bosh_joylar(
+            bino_turi=_tanlov_parametri(request, 'turi', {kod: kod for kod, _ in YotoqxonaBino.BINO_TURI}),
+            sig_imi=_tanlov_parametri(request, 'sig_imi', {str(kod): kod for kod, _ in Xona.XONA_TURI}),
+            konditsioner=_tanlov_parametri(request, 'konditsioner', mantiqiy),
+            muzlatgich=_tanlov_parametri(request, 'muzlatgich', mantiqiy),
+            narx_oraligi=_tanlov_parametri(request, 'narx', {kod: kod for kod in narx_nomlari}),
+        )
+    except ValueError as e:
+        return JsonResponse({'xato': str(e)}, status=400)
+    response = JsonResponse({
+        'jami_orinlar': sum(guruh['orinlar'] for guruh in guruhlar),
+        'jami_xonalar': sum(guruh['xonalar'] for guruh in guruhlar),
+        'guruhlar': [
+            {**guruh, 'narx_oraligi_nomi': narx_nomlari[guruh['narx_oraligi']]}
+            for guruh in guruhlar
+        ],
+    })
+    patch_cache_control(response, public=True, max_age=BOSH_JOYLAR_MAX_AGE)
+    return response
+
+
 def info_view(request):
     """Ma'lumot sahifasi"""
     return render(request, 'info.html')
\ No newline at end of file
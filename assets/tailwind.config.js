@@ -0,0 +1,34 @@
+// Tailwind sozlamalari - `python manage.py frontend_build` orqali yig'iladi
+/** @type {import('tailwindcss').Config} */
+module.exports = {
+    content: {
+        relative: true,
+        files: [
+            '../templates/**/*.html',
+            '../apps/**/forms.py',
+        ],
+    },
+    theme: {
+        extend: {
+            colors: {
+                primary: '#3b82f6',
+                secondary: '#8b5cf6',
+                success: '#10b981',
+                danger: '#ef4444',
+                warning: '#f59e0b',
+                info: '#06b6d4',
+            },
+            fontFamily: {
+                'jakarta': ['Plus Jakarta Sans', 'system-ui', 'sans-serif'],
+                'inter': ['Inter', 'system-ui', 'sans-serif'],
+            },
+            animation: {
+                'float': 'float 6s ease-in-out infinite',
+                'pulse-slow': 'pulse 3s ease-in-out infinite',
+                'slide-up': 'slideUp 0.5s ease-out',
+                'slide-down': 'slideDown 0.3s ease-out',
+                'fade-in': 'fadeIn 0.5s ease-out',
+            }
+        }
+    }
+}
@@ -22,6 +22,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'apps.dormitory_app.middleware.StatikFayllarMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -66,8 +67,36 @@ USE_TZ = True
 
 STATIC_URL = config('STATIC_URL')
 STATIC_ROOT = config('STATIC_ROOT')
+STATICFILES_DIRS = [BASE_DIR / 'static']
+
+# Frontend yig'ish (python manage.py frontend_build)
+TAILWIND_CLI = config('TAILWIND_CLI', default='npx --yes tailwindcss@3.4.17')
 
 MEDIA_URL = config('MEDIA_URL')
 MEDIA_ROOT = config('MEDIA_ROOT')
+# MEDIA_URL ostida hamma uchun ochiq papkalar (MEDIA_ROOT ichida) - qolganlari berilmaydi
+OMMAVIY_MEDIA_PAPKALARI = config('OMMAVIY_MEDIA_PAPKALARI', default='', cast=Csv())
+# Shaxsiy fayllar (imtiyoz hujjatlari, eksportlar): MEDIA_ROOT dan tashqarida, faqat admin orqali
+MAXFIY_MEDIA_ROOT = config('MAXFIY_MEDIA_ROOT', default=str(BASE_DIR / 'maxfiy'))
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Umumiy kesh: barcha worker jarayonlari bitta keshni ko'radi, shuning uchun yozishda o'chirilgan
+# kalit (dashboard, holat, facet, ma'lumotnoma versiyasi) hamma joyda eskiradi. Standart - bazadagi
+# jadval (python manage.py createcachetable); Redis uchun:
+# KESH_BACKEND=django.core.cache.backends.redis.RedisCache KESH_MANZILI=redis://127.0.0.1:6379/1
+CACHES = {
+    'default': {
+        'BACKEND': config('KESH_BACKEND', default='django.core.cache.backends.db.DatabaseCache'),
+        'LOCATION': config('KESH_MANZILI', default='dormitory_kesh'),
+    }
+}
+
+# Ariza raqamlari har bir worker uchun shu hajmdagi bloklarda oldindan olinadi (1 - bloksiz)
+ARIZA_RAQAM_BLOK_HAJMI = config('ARIZA_RAQAM_BLOK_HAJMI', default=1, cast=int)
+
+# Imtiyoz hujjatlarini qayta ishlash oqimlari (0 - so'rov ichida, sinxron)
+HUJJAT_ISHLOV_OQIMLARI = config('HUJJAT_ISHLOV_OQIMLARI', default=2, cast=int)
+
+# Eksport vazifasi shu soniya davomida jarayon yozmasa, worker o'lgan deb navbatga qaytariladi
+EKSPORT_VAZIFA_MUDDATI = config('EKSPORT_VAZIFA_MUDDATI', default=600, cast=int)
@@ -6,3 +6,6 @@ DATABASES = {
         'NAME': BASE_DIR / 'db.sqlite3',
     }
 }
+
+# SQLite INCLUDE ustunlarini qo'llamaydi (qamrovchi indeks faqat PostgreSQL'da) - oddiy indeks qoladi
+SILENCED_SYSTEM_CHECKS = ['models.W040']
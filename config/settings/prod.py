@@ -13,3 +13,10 @@ DATABASES = {
         'PORT': config('POSTGRES_PORT', default=5432),
     }
 }
+
+# Statik fayllar kontent xeshi bilan nomlanadi (app.3f2a9c.css) - uzoq muddat keshlash mumkin,
+# yonida .gz/.br variantlar yaratiladi (brotli paketi o'rnatilgan bo'lsa)
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'apps.dormitory_app.storage.SiqilganManifestStaticFilesStorage'},
+}
@@ -1,15 +1,9 @@
 from django.contrib import admin
 from django.urls import path, include
 
-from django.conf import settings
-from django.conf.urls.static import static
-
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('apps.dormitory_app.urls')),
 ]
 
-# Media and Static
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
+# Static va media fayllar StatikFayllarMiddleware orqali beriladi (DEBUG'dan qat'i nazar)